@@ -0,0 +1,71 @@
+"""Benchmark CRC64-ECMA throughput per backend and the cost of combining parts.
+
+Compares the bytewise reference loop, the pure-Python slice-by-8 loop and
+``crc64`` as shipped (crcmod's compiled extension when importable), then
+times folding per-part CRCs into the object CRC with ``crc64_combine``
+against hashing the whole buffer again.
+
+The pure-Python loops are slow, so they are timed on a smaller sample
+(``--py-size-mb``).
+
+Usage:
+    python benchmarks/bench_crc64.py [--size-mb 256] [--py-size-mb 4] [--part-mb 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cos.crc64 import BACKEND, _crc64_py, _crc64_slice8, crc64, crc64_combine  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def rate(fn, data) -> float:
+    """Return MB/s of ``fn(data)``, best of three runs."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    return len(data) / MB / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--py-size-mb", type=int, default=4)
+    parser.add_argument("--part-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    data = os.urandom(args.size_mb * MB)
+    sample = data[: args.py_size_mb * MB]
+    print(f"backend={BACKEND} size={args.size_mb}MB")
+    print(f"  bytewise     {rate(_crc64_py, sample):10.1f} MB/s")
+    print(f"  slice-by-8   {rate(_crc64_slice8, sample):10.1f} MB/s")
+    print(f"  crc64        {rate(crc64, data):10.1f} MB/s")
+
+    part = args.part_mb * MB
+    view = memoryview(data)
+    crcs = [crc64(view[i:i + part]) for i in range(0, len(data), part)]
+    start = time.perf_counter()
+    crc = 0
+    for i, part_crc in enumerate(crcs):
+        crc = crc64_combine(crc, part_crc, len(view[i * part:(i + 1) * part]))
+    combine = time.perf_counter() - start
+    start = time.perf_counter()
+    whole = crc64(data)
+    rehash = time.perf_counter() - start
+    assert crc == whole
+    print(
+        f"  combine {len(crcs)} parts {combine * 1000:8.2f} ms"
+        f"   vs rehash {rehash * 1000:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark serial versus prefix-partitioned parallel listing.
+
+Lists a synthetic bucket through a stand-in for ``COSClient.list_objects``
+that sorts keys like COS, returns up to 1000 per page and sleeps for a
+fixed round-trip time per request. The serial marker chain pays one round
+trip per page; ``iter_objects_parallel`` pays the discovery requests and
+then overlaps the partitions' round trips.
+
+Usage:
+    python benchmarks/bench_listing.py [--keys 200000] [--dirs 64] [--rtt-ms 30] [--concurrency 1,4,16]
+"""
+
+import argparse
+import bisect
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cos.listing import iter_objects_parallel  # noqa: E402
+
+
+class SimulatedBucket:
+    """Serves ListObjects pages from a sorted key list after a fixed delay."""
+
+    def __init__(self, keys, rtt: float):
+        self.keys = sorted(keys)
+        self.rtt = rtt
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def list_objects(self, prefix="", delimiter="", max_keys=1000, marker="", bucket=None):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.rtt)
+        i = bisect.bisect_right(self.keys, max(prefix, marker)) if marker else bisect.bisect_left(self.keys, prefix)
+        contents, prefixes, last = [], [], ""
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(contents) + len(prefixes) < max_keys:
+            key = self.keys[i]
+            cut = key.find(delimiter, len(prefix)) if delimiter else -1
+            if cut >= 0:
+                common = key[:cut + 1]
+                prefixes.append({"Prefix": common})
+                last = common
+                # Skip the rest of the common prefix in one step
+                i = bisect.bisect_left(self.keys, common[:-1] + chr(ord(common[-1]) + 1))
+                continue
+            contents.append({"Key": key, "Size": 1})
+            last = key
+            i += 1
+        truncated = i < len(self.keys) and self.keys[i].startswith(prefix)
+        response = {"Contents": contents, "CommonPrefixes": prefixes, "IsTruncated": str(truncated).lower()}
+        if truncated:
+            response["NextMarker"] = last
+        return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000)
+    parser.add_argument("--dirs", type=int, default=64)
+    parser.add_argument("--rtt-ms", type=float, default=30.0)
+    parser.add_argument("--concurrency", default="1,4,16")
+    args = parser.parse_args()
+
+    keys = [f"data/{i % args.dirs:04d}/{i:09d}.bin" for i in range(args.keys)]
+    print(f"keys={args.keys} dirs={args.dirs} rtt={args.rtt_ms}ms")
+    print(f"  {'workers':>7} {'ordered':>8} {'requests':>9} {'time':>8} {'keys/s':>10}")
+    for workers in (int(c) for c in args.concurrency.split(",")):
+        for ordered in ((True,) if workers == 1 else (True, False)):
+            bucket = SimulatedBucket(keys, args.rtt_ms / 1000)
+            started = time.perf_counter()
+            count = sum(1 for _ in iter_objects_parallel(bucket, concurrency=workers, ordered=ordered))
+            elapsed = time.perf_counter() - started
+            assert count == args.keys, count
+            print(f"  {workers:>7} {str(ordered):>8} {bucket.requests:>9} {elapsed:7.2f}s {count / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark page-cache residency of transferred files per --cache-policy.
+
+Uploads a file through ``MultipartUploadJob`` to a client that reads and
+discards each part, and downloads the same bytes through
+``RangedDownloadJob`` from an in-memory client. After each transfer the
+share of the local file's pages still in the page cache is measured with
+``mincore(2)``. The source file is dropped from the cache before each
+upload, so the upload figures show what the transfer itself left behind.
+
+Downloaded pages can only leave the cache once written back, so the
+download figure for ``drop`` depends on how fast the disk absorbs writes;
+``--settle`` waits before measuring.
+
+Linux only (``mincore`` via ctypes).
+
+Usage:
+    python benchmarks/bench_page_cache.py [--size-mb 512] [--part-mb 16] [--concurrency 4] [--settle 0]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import io
+import mmap
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cos.constants import CACHE_POLICIES  # noqa: E402
+from cos.transfer import (  # noqa: E402
+    MultipartUploadJob,
+    RangedDownloadJob,
+    TransferScheduler,
+    configure_cache_policy,
+)
+
+MB = 1024 * 1024
+_libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+_libc.mmap.restype = ctypes.c_void_p
+_libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+
+
+def residency(path: Path) -> float:
+    """Return the fraction of ``path``'s pages resident in the page cache."""
+    size = path.stat().st_size
+    if size == 0:
+        return 0.0
+    pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+    vec = (ctypes.c_ubyte * pages)()
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        # Mapping a file does not read it; mincore reports the page cache
+        addr = _libc.mmap(None, ctypes.c_size_t(size), mmap.PROT_READ, mmap.MAP_SHARED, fd, ctypes.c_long(0))
+        if addr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "mmap failed")
+        try:
+            if _libc.mincore(ctypes.c_void_p(addr), ctypes.c_size_t(size), vec) != 0:
+                raise OSError(ctypes.get_errno(), "mincore failed")
+        finally:
+            _libc.munmap(ctypes.c_void_p(addr), ctypes.c_size_t(size))
+    finally:
+        os.close(fd)
+    return sum(b & 1 for b in vec) / pages
+
+
+class DiscardingClient:
+    """Stand-in for CosS3Client: reads each part body and keeps nothing."""
+
+    def __init__(self, data: bytes = b""):
+        self.data = data
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "bench"}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        if hasattr(Body, "read"):
+            while Body.read(MB):
+                pass
+        else:
+            bytes(memoryview(Body)[-1:])
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        return {"ETag": '"done"'}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        return {}
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(x) for x in Range.split("=")[1].split("-"))
+        return {"Body": io.BytesIO(self.data[start:end + 1])}
+
+
+def drop_from_cache(path: Path) -> None:
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--part-mb", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--settle", type=float, default=0.0, help="Seconds to wait before measuring downloads")
+    args = parser.parse_args()
+
+    data = os.urandom(args.size_mb * MB)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.bin"
+        source.write_bytes(data)
+        print(f"file={args.size_mb}MB part={args.part_mb}MB concurrency={args.concurrency}")
+        print(f"  {'policy':<11} {'upload':>8} {'download':>9} {'time':>7}")
+        for policy in CACHE_POLICIES:
+            configure_cache_policy(policy)
+            drop_from_cache(source)
+            started = time.perf_counter()
+            scheduler = TransferScheduler(args.concurrency)
+            scheduler.add(MultipartUploadJob(
+                DiscardingClient(), "b", "k", source, args.part_mb * MB,
+                concurrency=args.concurrency, use_mmap=False,
+            ))
+            dest = Path(tmp) / f"down-{policy}.bin"
+            scheduler.add(RangedDownloadJob(
+                DiscardingClient(data), "b", "k", dest, len(data), args.part_mb * MB,
+                resume=False, concurrency=args.concurrency,
+            ))
+            scheduler.run()
+            elapsed = time.perf_counter() - started
+            if args.settle:
+                time.sleep(args.settle)
+            print(
+                f"  {policy:<11} {residency(source) * 100:7.1f}% {residency(dest) * 100:8.1f}%"
+                f" {elapsed:6.2f}s"
+            )
+            dest.unlink()
+        configure_cache_policy()
+
+
+if __name__ == "__main__":
+    main()
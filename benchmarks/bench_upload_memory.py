@@ -0,0 +1,136 @@
+"""Benchmark peak memory of multipart uploads: mmap views vs. read() copies.
+
+Each mode runs in its own subprocess so the reported peak RSS
+(``ru_maxrss``) belongs to that mode alone. The fake client touches every
+byte of each part, as a real socket send would, but does not keep it.
+
+Peak RSS includes file-backed pages of the mapping, which the kernel can
+reclaim at any time. On Linux the peak of anonymous memory (``RssAnon``,
+sampled every 5 ms) is reported as well; that is the memory the read()
+path allocates and the mmap path avoids.
+
+Usage:
+    python benchmarks/bench_upload_memory.py [--size-mb 512] [--part-mb 64] [--concurrency 8]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class ConsumingClient:
+    """Stand-in for CosS3Client that reads each part body and discards it."""
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "bench"}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        view = memoryview(Body)
+        md5 = hashlib.md5()
+        for i in range(0, len(view), 1024 * 1024):
+            md5.update(view[i:i + 1024 * 1024])
+        return {"ETag": md5.hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        return {}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def anon_rss_mb() -> float:
+    """Current anonymous RSS in MB (Linux only; 0 elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def run_mode(path: str, part_mb: int, concurrency: int, use_mmap: bool) -> dict:
+    from cos.transfer import upload_file_multipart_with_progress
+
+    baseline = peak_rss_mb()
+    anon = {"peak": anon_rss_mb()}
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            anon["peak"] = max(anon["peak"], anon_rss_mb())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    upload_file_multipart_with_progress(
+        ConsumingClient(), "bench", "bench.bin", Path(path),
+        chunk_size=part_mb * 1024 * 1024, progress_update=lambda *_: None,
+        concurrency=concurrency, use_mmap=use_mmap,
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+    return {
+        "mode": "mmap" if use_mmap else "read",
+        "seconds": round(elapsed, 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_anon_mb": round(anon["peak"], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--part-mb", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--child", choices=["mmap", "read"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_mode(args.path, args.part_mb, args.concurrency, args.child == "mmap")
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.bin")
+        with open(path, "wb") as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+        print(f"file={args.size_mb}MB part={args.part_mb}MB concurrency={args.concurrency}")
+        for mode in ("read", "mmap"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--path", path,
+                 "--part-mb", str(args.part_mb), "--concurrency", str(args.concurrency)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out)
+            print(
+                f"{r['mode']:>5}: {r['seconds']:>7.3f}s  peak RSS {r['peak_rss_mb']:>7.1f} MB  "
+                f"peak anon {r['peak_anon_mb']:>7.1f} MB  (baseline RSS {r['baseline_rss_mb']:.1f} MB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
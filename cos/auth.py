@@ -34,7 +34,8 @@ from tencentcloud.sts.v20180813 import sts_client
 from qcloud_cos import CosConfig, CosS3Client
 
 from .config import ConfigManager
-from .constants import DEFAULT_SCHEME, STS_DURATION, STS_ENDPOINT
+from .connections import get_connection_registry
+from .constants import CONNECT_TIMEOUT, DEFAULT_SCHEME, READ_TIMEOUT, STS_DURATION, STS_ENDPOINT
 from .exceptions import AuthenticationError
 
 
@@ -186,6 +187,16 @@ class COSAuthenticator:
             if region is None:
                 region = self.config_manager.get_region()
             
+            # Connections come from the session shared by every client of
+            # this profile and region, sized by configure_connections()
+            registry = get_connection_registry()
+            connection_options = dict(
+                Scheme=DEFAULT_SCHEME,
+                Timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                KeepAlive=True,
+                PoolMaxSize=registry.pool_size,
+            )
+            
             # Branch based on credential source
             if temp_token:
                 # Mode 1 or 2a: Using temporary token (from env or config file)
@@ -195,7 +206,7 @@ class COSAuthenticator:
                     SecretId=secret_id,
                     SecretKey=secret_key,
                     Token=temp_token,
-                    Scheme=DEFAULT_SCHEME,
+                    **connection_options,
                 )
             elif assume_role:
                 # Mode 2b: Use STS with assume_role
@@ -210,7 +221,7 @@ class COSAuthenticator:
                     SecretId=temp_creds["tmp_secret_id"],
                     SecretKey=temp_creds["tmp_secret_key"],
                     Token=temp_creds["token"],
-                    Scheme=DEFAULT_SCHEME,
+                    **connection_options,
                 )
             else:
                 # Mode 3: Use permanent credentials
@@ -218,11 +229,13 @@ class COSAuthenticator:
                     Region=region,
                     SecretId=secret_id,
                     SecretKey=secret_key,
-                    Scheme=DEFAULT_SCHEME,
+                    **connection_options,
                 )
             
-            # Create client
-            self._client = CosS3Client(config)
+            # Create client. RetryPolicy is the only retry layer: the SDK's own
+            # retries sleep without jitter or budget and hide throttling
+            session = registry.session(self.config_manager.profile, region)
+            self._client = CosS3Client(config, retry=0, session=session)
             
             return self._client
             
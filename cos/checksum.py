@@ -0,0 +1,173 @@
+"""Integrity checks computed on the bytes of a transfer as they stream.
+
+Transfers hash each part or range while it is sent or written, so no file
+is read a second time to verify it. Data moved in order (streams) feeds a
+``StreamDigest`` with MD5 and CRC64; parts and ranges moved in parallel
+record their own CRC64 in ``PartChecksums``, which folds them into the
+object's CRC with ``crc64_combine``. The result is compared with the
+``x-cos-hash-crc64ecma`` header COS returns, or with a plain MD5 ETag
+when no CRC64 is available.
+"""
+
+import hashlib
+import re
+import threading
+from collections.abc import Mapping
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .crc64 import CRC64, FAST_CRC64, crc64, crc64_combine
+from .exceptions import ChecksumError
+
+CRC64_HEADER = "x-cos-hash-crc64ecma"
+SSE_HEADER = "x-cos-server-side-encryption"
+_MD5_ETAG = re.compile(r"^[0-9a-f]{32}$")
+
+
+class TransferChecksum(NamedTuple):
+    """Digest of a finished transfer; a field is None when not computed."""
+
+    crc64: Optional[int] = None
+    md5: Optional[str] = None
+
+
+def _header(headers: Optional[Mapping], wanted: str):
+    """Case-insensitive header lookup; None if absent."""
+    if not isinstance(headers, Mapping):
+        return None
+    for name, value in headers.items():
+        if isinstance(name, str) and name.lower() == wanted:
+            return value
+    return None
+
+
+def header_crc64(headers: Optional[Mapping]) -> Optional[int]:
+    """Return the object CRC64 from response headers, or None if absent."""
+    try:
+        value = _header(headers, CRC64_HEADER)
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def etag_md5(headers: Optional[Mapping]) -> Optional[str]:
+    """Return the ETag as an MD5 hex digest, or None if it is not one.
+
+    Multipart ETags (``...-N``) and ETags of server-side encrypted objects
+    are not the MD5 of the content.
+    """
+    etag = _header(headers, "etag")
+    if not isinstance(etag, str) or _header(headers, SSE_HEADER):
+        return None
+    etag = etag.strip('"').lower()
+    return etag if _MD5_ETAG.match(etag) else None
+
+
+def check_crc64(expected: Optional[int], crc: Optional[int], what: str) -> None:
+    """Compare a computed CRC64 with the one COS reported.
+
+    Nothing is checked when either side is unknown.
+
+    Args:
+        expected: CRC64 reported by COS
+        crc: CRC64 computed locally
+        what: Description of the data for the error message
+
+    Raises:
+        ChecksumError: If both are known and differ
+    """
+    if expected is None or crc is None or expected == crc:
+        return
+    raise ChecksumError(f"CRC64 mismatch for {what}: computed {crc}, COS reports {expected}")
+
+
+def verify_crc64(headers: Optional[Mapping], crc: Optional[int], what: str) -> None:
+    """``check_crc64`` against the ``x-cos-hash-crc64ecma`` of response headers."""
+    check_crc64(header_crc64(headers), crc, what)
+
+
+def verify_checksum(headers: Optional[Mapping], checksum: TransferChecksum, what: str) -> None:
+    """Check a single-request transfer against its response headers.
+
+    The CRC64 is compared when both sides have one; otherwise the MD5 is
+    compared with a plain MD5 ETag. Nothing is checked when neither is known.
+
+    Raises:
+        ChecksumError: If the data does not match what COS reports
+    """
+    expected = header_crc64(headers)
+    if expected is not None and checksum.crc64 is not None:
+        check_crc64(expected, checksum.crc64, what)
+        return
+    md5 = etag_md5(headers)
+    if md5 is not None and checksum.md5 is not None and md5 != checksum.md5:
+        raise ChecksumError(f"MD5 mismatch for {what}: computed {checksum.md5}, COS reports ETag {md5}")
+
+
+def inline_crc64(data, crc: Optional[int] = 0) -> Optional[int]:
+    """CRC64 of bytes in flight, continuing from ``crc``.
+
+    Returns None (and keeps returning None once ``crc`` is None) when only
+    the slow pure-Python CRC64 is available, so transfers skip the check
+    instead of running at its speed.
+    """
+    if crc is None or not FAST_CRC64:
+        return None
+    return crc64(data, crc)
+
+
+class StreamDigest:
+    """MD5 and CRC64 of data seen once, in order (CRC64 only when fast)."""
+
+    def __init__(self):
+        self._md5 = hashlib.md5()
+        self._crc = CRC64() if FAST_CRC64 else None
+        self.length = 0
+
+    def update(self, data) -> None:
+        self._md5.update(data)
+        if self._crc is not None:
+            self._crc.update(data)
+        self.length += len(data)
+
+    @property
+    def crc64(self) -> Optional[int]:
+        return self._crc.digest() if self._crc is not None else None
+
+    def result(self) -> TransferChecksum:
+        return TransferChecksum(self.crc64, self._md5.hexdigest())
+
+
+class PartChecksums:
+    """CRC64 of each part or range of one object, recorded in any order.
+
+    Thread-safe; ``combined()`` folds the parts by offset once they cover
+    the object without gaps.
+    """
+
+    def __init__(self, parts: Optional[Dict[int, Tuple[int, int]]] = None):
+        self._lock = threading.Lock()
+        # offset -> (crc, length)
+        self._parts: Dict[int, Tuple[int, int]] = dict(parts or {})
+
+    def add(self, offset: int, crc: int, length: int) -> None:
+        with self._lock:
+            self._parts[offset] = (crc, length)
+
+    def get(self, offset: int) -> Optional[int]:
+        with self._lock:
+            part = self._parts.get(offset)
+        return part[0] if part else None
+
+    def combined(self, total_size: int) -> Optional[int]:
+        """Return the CRC64 of bytes ``[0, total_size)``, or None if a part is missing."""
+        with self._lock:
+            parts = dict(self._parts)
+        crc = 0
+        offset = 0
+        while offset < total_size:
+            part = parts.get(offset)
+            if part is None:
+                return None
+            crc = crc64_combine(crc, part[0], part[1])
+            offset += part[1]
+        return crc if offset == total_size else None
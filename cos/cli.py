@@ -3,7 +3,8 @@
 import click
 
 from .config import ConfigManager
-from .commands import configure, ls, cp, rm, mb, rb, token, mv, presign, sync, lifecycle, policy, cors, versioning
+from .constants import VALID_OUTPUTS
+from .commands import configure, ls, cp, rm, mb, rb, token, mv, presign, sync, lifecycle, policy, cors, versioning, index, du
 from . import __version__
 
 
@@ -11,7 +12,7 @@ from . import __version__
 @click.version_option(version=__version__)
 @click.option("--profile", default="default", help="Use a specific profile")
 @click.option("--region", default=None, help="Override default region")
-@click.option("--output", type=click.Choice(["json", "table", "text"]), help="Output format")
+@click.option("--output", type=click.Choice(VALID_OUTPUTS), help="Output format")
 @click.option("--endpoint-url", default=None, help="Override endpoint URL")
 @click.option("--no-verify-ssl", is_flag=True, help="Disable SSL verification")
 @click.option("--debug", is_flag=True, help="Enable debug mode")
@@ -48,6 +49,7 @@ def cli(ctx, profile, region, output, endpoint_url, no_verify_ssl, debug, quiet)
 # Register commands
 cli.add_command(configure.configure)
 cli.add_command(ls.ls)
+cli.add_command(du.du)
 cli.add_command(cp.cp)
 cli.add_command(mv.mv)
 cli.add_command(rm.rm)
@@ -60,6 +62,7 @@ cli.add_command(lifecycle.lifecycle)
 cli.add_command(policy.policy)
 cli.add_command(cors.cors)
 cli.add_command(versioning.versioning)
+cli.add_command(index.index)
 
 
 def main():
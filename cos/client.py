@@ -1,9 +1,15 @@
 """COS client wrapper with high-level operations"""
 
-from typing import Dict, List, Optional
+import os
+from typing import Dict, Iterator, List, Optional
 from qcloud_cos import CosS3Client
 from qcloud_cos.cos_exception import CosServiceError, CosClientError
 
+from .checksum import StreamDigest, verify_checksum
+from .constants import LIST_PAGE_SIZE, MULTIPART_THRESHOLD
+from .index import get_listing_index, record_copy, record_delete, record_upload
+from .listing import iter_objects
+from .retry import RetryPolicy, default_policy
 from .exceptions import (
     BucketNotFoundError,
     ObjectNotFoundError,
@@ -11,23 +17,40 @@ from .exceptions import (
     COSError,
 )
 
+# Bytes read from a GET body at a time
+BODY_CHUNK_SIZE = 1024 * 1024
+# upload_file arguments that only the SDK's multipart upload takes
+_UPLOAD_FILE_ONLY = ("PartSize", "MAXThread", "EnableMD5", "progress_callback")
+
 
 class COSClient:
     """Wrapper for COS client with error handling"""
     
-    def __init__(self, client: CosS3Client, bucket: Optional[str] = None):
+    def __init__(self, client: CosS3Client, bucket: Optional[str] = None, retry: Optional[RetryPolicy] = None):
         """
         Initialize COS client wrapper.
         
         Args:
             client: Authenticated CosS3Client
             bucket: Default bucket name
+            retry: Retry policy for every request (process-wide default if None)
         """
         self.client = client
         self.bucket = bucket
+        self.retry = retry
+    
+    def _call(self, method, **kwargs):
+        """Call an SDK method under the retry policy"""
+        return (self.retry or default_policy()).call(method, **kwargs)
+    
+    def _call_non_idempotent(self, method, done_codes, **kwargs):
+        """Call an SDK method that must not fail because an earlier attempt succeeded"""
+        return (self.retry or default_policy()).call_non_idempotent(method, done_codes, **kwargs)
     
     def _handle_error(self, error: Exception) -> None:
         """Handle COS errors and raise appropriate exceptions"""
+        if isinstance(error, COSError):
+            raise error
         if isinstance(error, CosServiceError):
             code = error.get_error_code()
             if code == "NoSuchBucket":
@@ -51,7 +74,7 @@ class COSClient:
             List of bucket information dictionaries
         """
         try:
-            response = self.client.list_buckets()
+            response = self._call(self.client.list_buckets)
             buckets = []
             for bucket in response.get("Buckets", {}).get("Bucket", []):
                 buckets.append({
@@ -69,15 +92,17 @@ class COSClient:
         prefix: str = "",
         delimiter: str = "",
         max_keys: int = 1000,
+        marker: str = "",
     ) -> Dict:
         """
-        List objects in bucket.
+        List one page of objects in bucket.
         
         Args:
             bucket: Bucket name (uses default if not provided)
             prefix: Prefix to filter objects
             delimiter: Delimiter for grouping
             max_keys: Maximum number of keys to return
+            marker: List only keys after this one
             
         Returns:
             Response dictionary with objects and common prefixes
@@ -87,16 +112,41 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.list_objects(
+            response = self._call(
+                self.client.list_objects,
                 Bucket=bucket,
                 Prefix=prefix,
                 Delimiter=delimiter,
                 MaxKeys=max_keys,
+                Marker=marker,
             )
             return response
         except Exception as e:
             self._handle_error(e)
     
+    def iter_objects(
+        self,
+        prefix: str = "",
+        delimiter: str = "",
+        page_size: int = LIST_PAGE_SIZE,
+        start_after: str = "",
+        bucket: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over every object under a prefix, following pagination lazily.
+        
+        Args:
+            prefix: Prefix to filter objects
+            delimiter: Delimiter for grouping ("" lists recursively)
+            page_size: Keys requested per page
+            start_after: List only keys after this one
+            bucket: Bucket name (uses default if not provided)
+            
+        Yields:
+            Object dictionaries, and ``{"Prefix": ...}`` for common prefixes
+        """
+        return iter_objects(self, prefix, delimiter, page_size, start_after, bucket)
+    
     def upload_file(
         self,
         local_path: str,
@@ -107,6 +157,10 @@ class COSClient:
         """
         Upload file to COS.
         
+        Files below ``MULTIPART_THRESHOLD`` are sent in one PUT whose bytes
+        are checked against the CRC64 (or MD5 ETag) COS returns; larger
+        files go through the SDK's multipart upload.
+        
         Args:
             local_path: Local file path
             key: Object key in COS
@@ -115,18 +169,28 @@ class COSClient:
             
         Returns:
             Response dictionary
+            
+        Raises:
+            ChecksumError: If a single-request upload does not match what COS stored
         """
         bucket = bucket or self.bucket
         if not bucket:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.upload_file(
-                Bucket=bucket,
-                LocalFilePath=local_path,
-                Key=key,
-                **kwargs
-            )
+            if os.path.isfile(local_path) and os.path.getsize(local_path) < MULTIPART_THRESHOLD:
+                put_kwargs = {k: v for k, v in kwargs.items() if k not in _UPLOAD_FILE_ONLY}
+                response = self._call(self._put_file, bucket=bucket, key=key, local_path=local_path, **put_kwargs)
+            else:
+                response = self._call(
+                    self.client.upload_file,
+                    Bucket=bucket,
+                    LocalFilePath=local_path,
+                    Key=key,
+                    **kwargs
+                )
+            if get_listing_index() is not None:
+                record_upload(bucket, key, os.path.getsize(local_path), (response or {}).get("ETag"))
             return response
         except Exception as e:
             self._handle_error(e)
@@ -141,6 +205,10 @@ class COSClient:
         """
         Download file from COS.
         
+        The object is fetched in one GET and hashed as it is written; the
+        bytes are checked against the CRC64 (or MD5 ETag) COS returns. Large
+        objects go through ``RangedDownloadJob`` instead.
+        
         Args:
             key: Object key in COS
             local_path: Local file path to save
@@ -149,22 +217,50 @@ class COSClient:
             
         Returns:
             Response dictionary
+            
+        Raises:
+            ChecksumError: If the bytes written do not match what COS reports
         """
         bucket = bucket or self.bucket
         if not bucket:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.download_file(
-                Bucket=bucket,
-                Key=key,
-                DestFilePath=local_path,
-                **kwargs
-            )
+            response = self._call(self._get_file, bucket=bucket, key=key, local_path=local_path, **kwargs)
             return response
         except Exception as e:
             self._handle_error(e)
     
+    def _put_file(self, bucket: str, key: str, local_path: str, **kwargs) -> Dict:
+        """PUT a small file in one request and verify the bytes sent."""
+        with open(local_path, "rb") as f:
+            body = f.read()
+        digest = StreamDigest()
+        digest.update(body)
+        response = self.client.put_object(Bucket=bucket, Key=key, Body=body, **kwargs)
+        verify_checksum(response, digest.result(), f"cos://{bucket}/{key}")
+        return response
+    
+    def _get_file(self, bucket: str, key: str, local_path: str, **kwargs) -> Dict:
+        """GET an object into ``local_path`` and verify the bytes written."""
+        response = self.client.get_object(Bucket=bucket, Key=key, **kwargs)
+        body = response.get("Body")
+        digest = StreamDigest()
+        with open(local_path, "wb") as f:
+            if hasattr(body, "read"):
+                while True:
+                    # The SDK's StreamBody returns "" at the end
+                    chunk = body.read(BODY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+            else:
+                digest.update(body or b"")
+                f.write(body or b"")
+        verify_checksum(response, digest.result(), f"cos://{bucket}/{key}")
+        return response
+    
     def delete_object(self, key: str, bucket: Optional[str] = None) -> Dict:
         """
         Delete object from COS.
@@ -181,10 +277,46 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.delete_object(
+            response = self._call(
+                self.client.delete_object,
                 Bucket=bucket,
                 Key=key,
             )
+            record_delete(bucket, [key])
+            return response
+        except Exception as e:
+            self._handle_error(e)
+    
+    def delete_objects(self, keys: List[str], bucket: Optional[str] = None) -> Dict:
+        """
+        Delete up to 1000 objects from COS in one request.
+        
+        Args:
+            keys: Object keys in COS
+            bucket: Bucket name (uses default if not provided)
+            
+        Returns:
+            Response dictionary; keys that could not be deleted are listed
+            under "Error" (quiet mode omits the deleted ones)
+        """
+        bucket = bucket or self.bucket
+        if not bucket:
+            raise COSError("Bucket name is required")
+        
+        try:
+            response = self._call(
+                self.client.delete_objects,
+                Bucket=bucket,
+                Delete={
+                    "Object": [{"Key": key} for key in keys],
+                    "Quiet": "true",
+                },
+            )
+            errors = response.get("Error") if isinstance(response, dict) else None
+            if isinstance(errors, dict):
+                errors = [errors]
+            refused = {error.get("Key") for error in errors or []}
+            record_delete(bucket, [key for key in keys if key not in refused])
             return response
         except Exception as e:
             self._handle_error(e)
@@ -201,7 +333,9 @@ class COSClient:
             Response dictionary
         """
         try:
-            response = self.client.create_bucket(
+            response = self._call_non_idempotent(
+                self.client.create_bucket,
+                {"BucketAlreadyOwnedByYou"},
                 Bucket=bucket,
                 **kwargs
             )
@@ -220,7 +354,7 @@ class COSClient:
             Response dictionary
         """
         try:
-            response = self.client.delete_bucket(Bucket=bucket)
+            response = self._call_non_idempotent(self.client.delete_bucket, {"NoSuchBucket"}, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -241,7 +375,8 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.head_object(
+            response = self._call(
+                self.client.head_object,
                 Bucket=bucket,
                 Key=key,
             )
@@ -276,12 +411,14 @@ class COSClient:
                 "Key": source_key,
                 "Region": self.client._conf._region,
             }
-            response = self.client.copy_object(
+            response = self._call(
+                self.client.copy_object,
                 Bucket=dest_bucket,
                 Key=dest_key,
                 CopySource=copy_source,
                 **kwargs
             )
+            record_copy(source_bucket, source_key, dest_bucket, dest_key, (response or {}).get("ETag"))
             return response
         except Exception as e:
             self._handle_error(e)
@@ -301,7 +438,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.get_bucket_lifecycle(Bucket=bucket)
+            response = self._call(self.client.get_bucket_lifecycle, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -322,7 +459,8 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.put_bucket_lifecycle(
+            response = self._call(
+                self.client.put_bucket_lifecycle,
                 Bucket=bucket,
                 LifecycleConfiguration=lifecycle_config
             )
@@ -345,7 +483,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.delete_bucket_lifecycle(Bucket=bucket)
+            response = self._call(self.client.delete_bucket_lifecycle, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -365,7 +503,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.get_bucket_policy(Bucket=bucket)
+            response = self._call(self.client.get_bucket_policy, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -386,7 +524,8 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.put_bucket_policy(
+            response = self._call(
+                self.client.put_bucket_policy,
                 Bucket=bucket,
                 Policy=policy
             )
@@ -409,7 +548,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.delete_bucket_policy(Bucket=bucket)
+            response = self._call(self.client.delete_bucket_policy, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -429,7 +568,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.get_bucket_cors(Bucket=bucket)
+            response = self._call(self.client.get_bucket_cors, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -450,7 +589,8 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.put_bucket_cors(
+            response = self._call(
+                self.client.put_bucket_cors,
                 Bucket=bucket,
                 CORSConfiguration=cors_config
             )
@@ -473,7 +613,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.delete_bucket_cors(Bucket=bucket)
+            response = self._call(self.client.delete_bucket_cors, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -493,7 +633,7 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.get_bucket_versioning(Bucket=bucket)
+            response = self._call(self.client.get_bucket_versioning, Bucket=bucket)
             return response
         except Exception as e:
             self._handle_error(e)
@@ -514,7 +654,8 @@ class COSClient:
             raise COSError("Bucket name is required")
         
         try:
-            response = self.client.put_bucket_versioning(
+            response = self._call(
+                self.client.put_bucket_versioning,
                 Bucket=bucket,
                 Status=status
             )
@@ -1,5 +1,5 @@
 """Commands package for COS CLI"""
 
-from . import configure, ls, cp, mv, rm, sync, mb, rb, presign, token, lifecycle, policy, cors, versioning
+from . import configure, ls, cp, mv, rm, sync, mb, rb, presign, token, lifecycle, policy, cors, versioning, index, du
 
-__all__ = ['configure', 'ls', 'cp', 'mv', 'rm', 'sync', 'mb', 'rb', 'presign', 'token', 'lifecycle', 'policy', 'cors', 'versioning']
+__all__ = ['configure', 'ls', 'cp', 'mv', 'rm', 'sync', 'mb', 'rb', 'presign', 'token', 'lifecycle', 'policy', 'cors', 'versioning', 'index', 'du']
@@ -4,6 +4,7 @@ import click
 from rich.prompt import Prompt
 
 from ..config import ConfigManager
+from ..constants import VALID_OUTPUTS
 from ..utils import success_message, info_message, output_table
 
 
@@ -69,7 +70,7 @@ def interactive(ctx, profile):
     
     output_format = Prompt.ask(
         "Default output format",
-        choices=["json", "table", "text"],
+        choices=VALID_OUTPUTS,
         default=current_output
     )
     config_manager.set_config_value("output", output_format)
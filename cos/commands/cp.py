@@ -1,7 +1,7 @@
 """Copy command for COS CLI"""
 
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 
 import click
@@ -18,10 +18,32 @@ from rich.progress import (
 from ..auth import COSAuthenticator
 from ..client import COSClient
 from ..config import ConfigManager
+from ..constants import (
+    CACHE_POLICIES,
+    DOWNLOAD_TEMP_SUFFIX,
+    FSYNC_MODES,
+    INDEX_TTL,
+    MULTIPART_COPY_THRESHOLD,
+    MULTIPART_THRESHOLD,
+)
+from ..connections import configure_connections
+from ..progress import object_progress, report_transfer_stats, transfer_progress
+from ..retry import configure_retries
 from ..transfer import (
+    StreamDownloadJob,
+    StreamUploadJob,
+    configure_bandwidth,
+    configure_buffer_pool,
+    configure_cache_policy,
+    configure_fsync,
+    copy_job,
+    copy_objects,
     download_file_with_progress_polling,
-    upload_file_multipart_with_progress,
-    download_file_in_ranges_with_progress,
+    download_job,
+    get_download_committer,
+    resolve_concurrency,
+    run_transfers,
+    upload_job,
 )
 from ..utils import (
     parse_cos_uri,
@@ -29,8 +51,17 @@ from ..utils import (
     success_message,
     error_message,
     should_process_file,
+    parse_size_to_bytes,
+    parse_bandwidth,
+    ResumeTracker,
+    get_content_length,
+    failure_summary,
+    format_size,
+    messages_to_stderr,
 )
 from ..exceptions import COSError, ObjectNotFoundError
+from ..index import confirm_objects, indexed_objects
+from ..listing import iter_objects, iter_objects_parallel
 
 
 @click.command()
@@ -40,14 +71,23 @@ from ..exceptions import COSError, ObjectNotFoundError
 @click.option("--include", multiple=True, help="Include files matching pattern")
 @click.option("--exclude", multiple=True, help="Exclude files matching pattern")
 @click.option("--no-progress", is_flag=True, help="Disable progress bar")
-@click.option("--concurrency", "concurrency", type=int, default=4, help="Number of parallel transfers for bulk operations")
-@click.option("--part-size", type=str, default=None, help="Part size for multipart and ranged transfers (e.g., 8MB, 64MB)")
+@click.option("--concurrency", "concurrency", type=str, default="4", help='Number of parallel transfers for bulk operations, or "auto" to adapt it')
+@click.option("--part-size", type=str, default=None, help="Part size for multipart and ranged transfers (e.g., 8MB, 64MB); planned from object size if omitted")
+@click.option("--max-memory", type=str, default=None, help="Cap on memory for transfer buffers shared by all workers (e.g., 512MB, 2GB)")
+@click.option("--max-bandwidth", type=str, default=None, help="Limit transfer rate shared by all workers (e.g., 10MB for 10MB/s)")
+@click.option("--max-upload-bandwidth", type=str, default=None, help="Upload rate limit; overrides --max-bandwidth for uploads")
+@click.option("--max-download-bandwidth", type=str, default=None, help="Download rate limit; overrides --max-bandwidth for downloads")
 @click.option("--max-retries", type=int, default=3, help="Max retries for part/range operations")
 @click.option("--retry-backoff", type=float, default=0.5, help="Initial backoff seconds between retries")
 @click.option("--retry-backoff-max", type=float, default=5.0, help="Max backoff seconds for retries")
-@click.option("--resume/--no-resume", default=True, help="Resume interrupted ranged downloads")
+@click.option("--cache-policy", type=click.Choice(CACHE_POLICIES), default="normal", help="Page-cache hints for local files: normal, sequential (read ahead), or drop (also evict transferred data)")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight for recursive operations; splits large prefixes into partitions")
+@click.option("--use-index", is_flag=True, help="Plan from the local listing index (see cos index), refreshing it when older than --index-ttl")
+@click.option("--index-ttl", type=click.IntRange(min=0), default=INDEX_TTL, help="Seconds an indexed listing is trusted by --use-index")
+@click.option("--resume/--no-resume", default=True, help="Resume interrupted ranged downloads and multipart uploads")
+@click.option("--fsync", "fsync", type=click.Choice(FSYNC_MODES), default="none", help="Make downloads durable before renaming them into place: none, each file, or in batches")
 @click.pass_context
-def cp(ctx, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max, resume):
+def cp(ctx, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_memory, max_bandwidth, max_upload_bandwidth, max_download_bandwidth, max_retries, retry_backoff, retry_backoff_max, resume, fsync, cache_policy, list_concurrency, use_index, index_ttl):
     """
     Copy files to/from COS.
 
@@ -57,55 +97,100 @@ def cp(ctx, source, destination, recursive, include, exclude, no_progress, concu
       cos cp cos://bucket/file.txt ./local.txt    # Download
       cos cp cos://b1/f cos://b2/f                # Copy between buckets
       cos cp ./dir/ cos://bucket/dir/ -r          # Upload directory
+      pg_dump db | cos cp - cos://bucket/db.sql   # Upload stdin
+      cos cp cos://bucket/db.sql - | psql db      # Download to stdout
     """
+    if destination == "-":
+        # stdout carries the object; messages and progress go to stderr
+        ctx.with_resource(messages_to_stderr())
     try:
         # Get config and auth
         ctx_obj = ctx.obj or {}
         profile = ctx_obj.get("profile", "default")
         region = ctx_obj.get("region")
         
+        # The SDK config takes its pool size from the registry
+        concurrency = resolve_concurrency(concurrency)
+        configure_connections(concurrency, list_concurrency)
         config_manager = ConfigManager(profile)
         authenticator = COSAuthenticator(config_manager)
         cos_client_raw = authenticator.authenticate(region)
+
+        if max_memory:
+            configure_buffer_pool(parse_size_to_bytes(max_memory))
+        configure_bandwidth(
+            upload=parse_bandwidth(max_upload_bandwidth or max_bandwidth),
+            download=parse_bandwidth(max_download_bandwidth or max_bandwidth),
+        )
+        configure_cache_policy(cache_policy)
+        configure_fsync(fsync)
+        configure_retries(max_retries, retry_backoff, retry_backoff_max)
         
         source_is_cos = is_cos_uri(source)
         dest_is_cos = is_cos_uri(destination)
         
         # Detect non-TTY and disable progress unless explicitly enabled
-        auto_no_progress = not sys.stdout.isatty()
+        auto_no_progress = not (sys.stderr if destination == "-" else sys.stdout).isatty()
         if auto_no_progress:
             no_progress = True
 
         # Determine operation type
-        if source_is_cos and not dest_is_cos:
+        if source == "-" or destination == "-":
+            if recursive:
+                raise COSError("--recursive cannot be used with '-' (stdin/stdout)")
+            if source == "-" and dest_is_cos:
+                _upload_stream(
+                    ctx, cos_client_raw, destination, no_progress, concurrency,
+                    part_size, max_retries, retry_backoff, retry_backoff_max
+                )
+            elif destination == "-" and source_is_cos:
+                _download_stream(
+                    ctx, cos_client_raw, source, no_progress, concurrency,
+                    part_size, max_retries, retry_backoff, retry_backoff_max
+                )
+            else:
+                raise COSError("'-' streams stdin to a COS object or a COS object to stdout")
+        elif source_is_cos and not dest_is_cos:
             # Download
             _download_files(
                 ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency,
-                part_size, max_retries, retry_backoff, retry_backoff_max, resume
+                part_size, max_retries, retry_backoff, retry_backoff_max, resume, list_concurrency, use_index, index_ttl
             )
         elif not source_is_cos and dest_is_cos:
             # Upload
             _upload_files(
                 ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency,
-                part_size, max_retries, retry_backoff, retry_backoff_max
+                part_size, max_retries, retry_backoff, retry_backoff_max, resume
             )
         elif source_is_cos and dest_is_cos:
             # Copy between buckets
-            _copy_objects(ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress)
+            _copy_objects(
+                ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency,
+                part_size, max_retries, retry_backoff, retry_backoff_max, list_concurrency, use_index, index_ttl
+            )
         else:
             raise COSError("At least one path must be a COS URI (cos://...)")
+        report_transfer_stats(concurrency, debug=ctx_obj.get("debug"))
     
     except COSError as e:
         error_message(str(e))
         ctx.exit(1)
 
 
-def _upload_files(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max):
+def _upload_files(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max, resume=True):
     """Upload local files to COS"""
     bucket, key = parse_cos_uri(destination)
     cos_client = COSClient(cos_client_raw, bucket)
     
     source_path = Path(source)
+    job_options = dict(
+        part_size=parse_size_to_bytes(part_size) if part_size else None,
+        max_retries=max_retries,
+        retry_backoff=retry_backoff,
+        retry_backoff_max=retry_backoff_max,
+        concurrency=concurrency,
+        resume_tracker=ResumeTracker() if resume else None,
+    )
     
     if source_path.is_file():
         # Single file upload - check patterns
@@ -119,38 +204,9 @@ def _upload_files(_ctx, cos_client_raw, source, destination, recursive, include,
         else:
             target_key = key or source_path.name
         
-        if not no_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TransferSpeedColumn(),
-                TimeRemainingColumn(),
-            ) as progress:
-                file_size = source_path.stat().st_size
-                task = progress.add_task(
-                    f"Uploading {source_path.name}...", total=file_size
-                )
-                # Use multipart upload for streaming progress
-                def on_update(done, _total):
-                    progress.update(task, completed=done)
-                # resolve part size
-                from ..utils import parse_size_to_bytes
-                ps = parse_size_to_bytes(part_size)
-                upload_file_multipart_with_progress(
-                    cos_client_raw,
-                    bucket,
-                    target_key,
-                    source_path,
-                    chunk_size=ps,
-                    progress_update=on_update,
-                    max_retries=max_retries,
-                    retry_backoff=retry_backoff,
-                    retry_backoff_max=retry_backoff_max,
-                )
-        else:
-            cos_client.upload_file(str(source_path), target_key)
+        job = upload_job(cos_client, source_path, target_key, **job_options)
+        with transfer_progress(f"Uploading {source_path.name}...", job.size, not no_progress) as on_advance:
+            run_transfers([job], concurrency, on_advance)
         
         success_message(f"Uploaded {source} to cos://{bucket}/{target_key}")
     
@@ -160,7 +216,8 @@ def _upload_files(_ctx, cos_client_raw, source, destination, recursive, include,
         
         # Directory upload - apply patterns
         files = list(source_path.rglob("*"))
-        files = [f for f in files if f.is_file()]
+        # Skip unfinished downloads
+        files = [f for f in files if f.is_file() and not f.name.endswith(DOWNLOAD_TEMP_SUFFIX)]
         
         # Filter by patterns
         include_patterns = list(include) if include else None
@@ -174,56 +231,73 @@ def _upload_files(_ctx, cos_client_raw, source, destination, recursive, include,
             error_message("No files match the specified patterns")
             return
         
-        # Aggregate total bytes for progress
-        file_sizes = {f: f.stat().st_size for f in filtered_files}
-        total_bytes = sum(file_sizes.values())
-
-        if not no_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TransferSpeedColumn(),
-                TimeRemainingColumn(),
-            ) as progress:
-                task = progress.add_task(f"Uploading {len(filtered_files)} files...", total=total_bytes)
-
-                def do_upload(file_path: Path):
-                    rel_path = file_path.relative_to(source_path)
-                    dest_key = (f"{key.rstrip('/')}/{rel_path}").lstrip("/") if key else str(rel_path)
-                    cos_client.upload_file(str(file_path), dest_key)
-                    progress.update(task, advance=file_sizes[file_path])
-
-                with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
-                    futures = [executor.submit(do_upload, fp) for fp in filtered_files]
-                    for fut in as_completed(futures):
-                        exc = fut.exception()
-                        if exc:
-                            raise exc
-        else:
-            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
-                def do_upload(file_path: Path):
-                    rel_path = file_path.relative_to(source_path)
-                    dest_key = (f"{key.rstrip('/')}/{rel_path}").lstrip("/") if key else str(rel_path)
-                    cos_client.upload_file(str(file_path), dest_key)
-                futures = [executor.submit(do_upload, fp) for fp in filtered_files]
-                for fut in as_completed(futures):
-                    exc = fut.exception()
-                    if exc:
-                        raise exc
+        # One job per file; large files are split into parts on the same workers
+        jobs = []
+        for file_path in filtered_files:
+            rel_path = file_path.relative_to(source_path)
+            dest_key = (f"{key.rstrip('/')}/{rel_path}").lstrip("/") if key else str(rel_path)
+            jobs.append(upload_job(cos_client, file_path, dest_key, **job_options))
+        total = sum(job.size for job in jobs)
+        with transfer_progress(f"Uploading {len(filtered_files)} files...", total, not no_progress) as on_advance:
+            run_transfers(jobs, concurrency, on_advance)
         
         success_message(f"Uploaded {len(filtered_files)} files to cos://{bucket}/{key}")
     else:
         raise COSError(f"Source path does not exist: {source}")
 
 
-def _download_files(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max, resume):
+def _upload_stream(_ctx, cos_client_raw, destination, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max):
+    """Upload stdin to COS as it is read, without knowing its size"""
+    bucket, key = parse_cos_uri(destination)
+    if not key or key.endswith("/"):
+        raise COSError("Uploading stdin needs a full object key, e.g. cos://bucket/path/file")
+
+    job = StreamUploadJob(
+        cos_client_raw, bucket, key, sys.stdin.buffer,
+        parse_size_to_bytes(part_size) if part_size else None, None,
+        max_retries, retry_backoff, retry_backoff_max, concurrency,
+    )
+    with transfer_progress("Uploading stdin...", None, not no_progress) as on_advance:
+        run_transfers([job], concurrency, on_advance)
+
+    success_message(f"Uploaded {format_size(job.size)} from stdin to cos://{bucket}/{key}")
+
+
+def _download_stream(_ctx, cos_client_raw, source, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max):
+    """Download a COS object to stdout, fetching ranges in parallel"""
+    bucket, key = parse_cos_uri(source)
+    if not key or key.endswith("/"):
+        raise COSError("Downloading to stdout needs a single object, e.g. cos://bucket/path/file")
+    cos_client = COSClient(cos_client_raw, bucket)
+    try:
+        size = get_content_length(cos_client.head_object(key))
+    except ObjectNotFoundError:
+        raise COSError(f"Object not found: cos://{bucket}/{key}")
+
+    job = StreamDownloadJob(
+        cos_client_raw, bucket, key, sys.stdout.buffer, size,
+        parse_size_to_bytes(part_size) if part_size else None, None,
+        max_retries, retry_backoff, retry_backoff_max, concurrency,
+    )
+    with transfer_progress(f"Downloading {key}...", size, not no_progress) as on_advance:
+        run_transfers([job], concurrency, on_advance)
+
+
+def _download_files(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency, part_size, max_retries, retry_backoff, retry_backoff_max, resume, list_concurrency=1, use_index=False, index_ttl=INDEX_TTL):
     """Download files from COS to local"""
     bucket, key = parse_cos_uri(source)
     cos_client = COSClient(cos_client_raw, bucket)
     
     dest_path = Path(destination)
+    job_options = dict(
+        part_size=parse_size_to_bytes(part_size) if part_size else None,
+        max_retries=max_retries,
+        retry_backoff=retry_backoff,
+        retry_backoff_max=retry_backoff_max,
+        concurrency=concurrency,
+        resume=resume,
+        resume_tracker=ResumeTracker() if resume else None,
+    )
     
     def _resolve_remote_size() -> int:
         """Resolve object size reliably using HEAD, then list, then ranged GET.
@@ -255,8 +329,8 @@ def _download_files(_ctx, cos_client_raw, source, destination, recursive, includ
 
         # Fallback to ListObjects to locate exact key size
         try:
-            listing = cos_client.list_objects(prefix=key, delimiter="")
-            for obj in listing.get("Contents", []):
+            # The key itself sorts first among keys it prefixes
+            for obj in islice(iter_objects(cos_client, prefix=key, page_size=1), 1):
                 if obj.get("Key") == key:
                     try:
                         size_val = int(obj.get("Size", 0))
@@ -316,9 +390,18 @@ def _download_files(_ctx, cos_client_raw, source, destination, recursive, includ
         except ObjectNotFoundError:
             raise COSError(f"Object not found: cos://{bucket}/{key}")
 
-        if not no_progress:
-            # Note: file_size may be 0 for unknown; progress will handle indeterminate totals
-
+        if no_progress:
+            run_transfers([download_job(cos_client, key, final_path, file_size, **job_options)], concurrency)
+        elif file_size and file_size > 0:
+            try:
+                job = download_job(cos_client, key, final_path, file_size, **job_options)
+                with transfer_progress(f"Downloading {key}...", file_size) as on_advance:
+                    run_transfers([job], concurrency, on_advance)
+            except Exception as _e:
+                # Normalize any SDK error into a CLI error for consistent messaging
+                raise COSError(f"Failed to download cos://{bucket}/{key}: {_e}")
+        else:
+            # Unknown size: poll the local file for an indeterminate bar
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -327,116 +410,75 @@ def _download_files(_ctx, cos_client_raw, source, destination, recursive, includ
                 TransferSpeedColumn(),
                 TimeRemainingColumn(),
             ) as progress:
-                task = progress.add_task(
-                    f"Downloading {key}...", total=file_size or None
-                )
+                task = progress.add_task(f"Downloading {key}...", total=None)
                 def on_update(done, _total):
                     progress.update(task, completed=done)
                 try:
-                    if file_size and file_size > 0:
-                        from ..utils import parse_size_to_bytes, ResumeTracker
-                        ps = parse_size_to_bytes(part_size)
-                        # optional resume tracker
-                        tracker = ResumeTracker() if resume else None
-                        download_file_in_ranges_with_progress(
-                            cos_client_raw,
-                            bucket,
-                            key,
-                            final_path,
-                            total_size=file_size,
-                            chunk_size=ps,
-                            progress_update=on_update,
-                            resume=resume,
-                            resume_tracker=tracker,
-                            max_retries=max_retries,
-                            retry_backoff=retry_backoff,
-                            retry_backoff_max=retry_backoff_max,
-                        )
-                    else:
-                        download_file_with_progress_polling(
-                            cos_client_raw,
-                            bucket,
-                            key,
-                            final_path,
-                            total_size=file_size,
-                            progress_update=on_update,
-                        )
+                    download_file_with_progress_polling(
+                        cos_client_raw,
+                        bucket,
+                        key,
+                        final_path,
+                        total_size=file_size,
+                        progress_update=on_update,
+                    )
                 except Exception as _e:
                     # Normalize any SDK error into a CLI error for consistent messaging
                     raise COSError(f"Failed to download cos://{bucket}/{key}: {_e}")
-        else:
-            cos_client.download_file(key, str(final_path))
+                finally:
+                    get_download_committer().flush()
         
         success_message(f"Downloaded cos://{bucket}/{key} to {str(final_path)}")
     else:
         # Directory download - apply patterns
-        response = cos_client.list_objects(prefix=key, delimiter="")
-        objects = response.get("Contents", [])
-
-        # Filter by patterns
+        # Filter by patterns while the listing is paged in
         include_patterns = list(include) if include else None
         exclude_patterns = list(exclude) if exclude else None
+        if use_index:
+            listing = indexed_objects(cos_client, bucket, key, ttl=index_ttl, list_concurrency=list_concurrency)
+        else:
+            listing = iter_objects_parallel(cos_client, prefix=key, concurrency=list_concurrency, ordered=False)
         filtered_objects = [
-            obj for obj in objects
+            obj for obj in listing
             if should_process_file(obj.get("Key", "").split('/')[-1], include_patterns, exclude_patterns)
         ]
+        if use_index:
+            # Ranged downloads are planned from the size; confirm it where they are used
+            filtered_objects = confirm_objects(cos_client, filtered_objects, MULTIPART_THRESHOLD)
 
         if not filtered_objects:
             error_message("No files match the specified patterns")
             return
 
-        # Aggregate total bytes for progress
-        object_sizes = {obj.get("Key", ""): int(obj.get("Size", 0)) for obj in filtered_objects}
-        total_bytes = sum(object_sizes.values())
-
-        if not no_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TransferSpeedColumn(),
-                TimeRemainingColumn(),
-            ) as progress:
-                task = progress.add_task(f"Downloading {len(filtered_objects)} files...", total=total_bytes)
-
-                def do_download(obj):
-                    obj_key = obj.get("Key", "")
-                    rel_path = obj_key[len(key):].lstrip("/")
-                    local_path = dest_path / rel_path
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    cos_client.download_file(obj_key, str(local_path))
-                    progress.update(task, advance=object_sizes[obj_key])
-
-                with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
-                    futures = [executor.submit(do_download, obj) for obj in filtered_objects]
-                    for fut in as_completed(futures):
-                        exc = fut.exception()
-                        if exc:
-                            raise exc
-        else:
-            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
-                def do_download(obj):
-                    obj_key = obj.get("Key", "")
-                    rel_path = obj_key[len(key):].lstrip("/")
-                    local_path = dest_path / rel_path
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    cos_client.download_file(obj_key, str(local_path))
-                futures = [executor.submit(do_download, obj) for obj in filtered_objects]
-                for fut in as_completed(futures):
-                    exc = fut.exception()
-                    if exc:
-                        raise exc
+        # One job per object; large objects are split into ranges on the same workers
+        jobs = []
+        for obj in filtered_objects:
+            obj_key = obj.get("Key", "")
+            rel_path = obj_key[len(key):].lstrip("/")
+            jobs.append(download_job(
+                cos_client, obj_key, dest_path / rel_path, int(obj.get("Size", 0)), **job_options
+            ))
+        total = sum(job.size for job in jobs)
+        with transfer_progress(f"Downloading {len(filtered_objects)} files...", total, not no_progress) as on_advance:
+            run_transfers(jobs, concurrency, on_advance)
 
         success_message(f"Downloaded {len(filtered_objects)} files to {destination}")
 
 
-def _copy_objects(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress):
+def _copy_objects(_ctx, cos_client_raw, source, destination, recursive, include, exclude, no_progress, concurrency=4, part_size=None, max_retries=3, retry_backoff=0.5, retry_backoff_max=5.0, list_concurrency=1, use_index=False, index_ttl=INDEX_TTL):
     """Copy objects between COS locations"""
     source_bucket, source_key = parse_cos_uri(source)
     dest_bucket, dest_key = parse_cos_uri(destination)
     
     cos_client = COSClient(cos_client_raw)
+    # Large objects are copied server-side in parallel parts
+    job_options = dict(
+        part_size=parse_size_to_bytes(part_size) if part_size else None,
+        max_retries=max_retries,
+        retry_backoff=retry_backoff,
+        retry_backoff_max=retry_backoff_max,
+        concurrency=concurrency,
+    )
     
     if not recursive:
         # Single object copy - check patterns
@@ -445,46 +487,59 @@ def _copy_objects(_ctx, cos_client_raw, source, destination, recursive, include,
             error_message(f"Skipping {source_key} (excluded by pattern)")
             return
         
-        cos_client.copy_object(source_bucket, source_key, dest_bucket, dest_key)
+        try:
+            size = get_content_length(cos_client.head_object(source_key, bucket=source_bucket))
+        except COSError:
+            # Let the copy itself report a missing source
+            size = 0
+        job = copy_job(cos_client, source_bucket, source_key, dest_bucket, dest_key, size, **job_options)
+        with transfer_progress(f"Copying {filename}...", size, not no_progress) as on_advance:
+            run_transfers([job], concurrency, on_advance)
         success_message(f"Copied cos://{source_bucket}/{source_key} to cos://{dest_bucket}/{dest_key}")
     else:
         # Multiple objects copy - apply patterns
         source_cos = COSClient(cos_client_raw, source_bucket)
-        response = source_cos.list_objects(prefix=source_key, delimiter="")
-        objects = response.get("Contents", [])
-        
-        # Filter by patterns
+        # Filter by patterns while the listing is paged in
         include_patterns = list(include) if include else None
         exclude_patterns = list(exclude) if exclude else None
+        if use_index:
+            listing = indexed_objects(
+                source_cos, source_bucket, source_key, ttl=index_ttl, list_concurrency=list_concurrency
+            )
+        else:
+            listing = iter_objects_parallel(source_cos, prefix=source_key, concurrency=list_concurrency, ordered=False)
         filtered_objects = [
-            obj for obj in objects
+            obj for obj in listing
             if should_process_file(obj.get("Key", "").split('/')[-1], include_patterns, exclude_patterns)
         ]
+        if use_index:
+            # Multipart copies are planned from the size; confirm it where they are used
+            filtered_objects = confirm_objects(source_cos, filtered_objects, MULTIPART_COPY_THRESHOLD)
         
         if not filtered_objects:
             error_message("No files match the specified patterns")
             return
         
-        if not no_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-            ) as progress:
-                task = progress.add_task(f"Copying {len(filtered_objects)} objects...", total=len(filtered_objects))
-                
-                for obj in filtered_objects:
-                    obj_key = obj.get("Key", "")
-                    rel_path = obj_key[len(source_key):].lstrip("/")
-                    new_dest_key = f"{dest_key}/{rel_path}".strip("/") if dest_key else rel_path
-                    cos_client.copy_object(source_bucket, obj_key, dest_bucket, new_dest_key)
-                    progress.update(task, advance=1)
-        else:
-            for obj in filtered_objects:
-                obj_key = obj.get("Key", "")
-                rel_path = obj_key[len(source_key):].lstrip("/")
-                new_dest_key = f"{dest_key}/{rel_path}".strip("/") if dest_key else rel_path
-                cos_client.copy_object(source_bucket, obj_key, dest_bucket, new_dest_key)
+        copies = []
+        for obj in filtered_objects:
+            obj_key = obj.get("Key", "")
+            rel_path = obj_key[len(source_key):].lstrip("/")
+            new_dest_key = f"{dest_key}/{rel_path}".strip("/") if dest_key else rel_path
+            copies.append((source_bucket, obj_key, dest_bucket, new_dest_key, int(obj.get("Size", 0) or 0)))
+        total_bytes = sum(copy[4] for copy in copies)
+        
+        # All copies share one pool of workers; a failed copy does not stop the rest
+        with object_progress("Copying", total_bytes, len(copies), not no_progress) as bar:
+            failures = copy_objects(
+                cos_client,
+                copies,
+                on_advance=bar,
+                on_done=(lambda _key, exc: bar.object_done(exc is not None)) if bar else None,
+                **job_options
+            )
+        
+        if failures:
+            failure_summary(failures, "copy")
+            raise COSError(f"{len(failures)} of {len(copies)} objects failed to copy")
         
-        success_message(f"Copied {len(filtered_objects)} objects to cos://{dest_bucket}/{dest_key}")
+        success_message(f"Copied {len(copies)} objects to cos://{dest_bucket}/{dest_key}")
@@ -0,0 +1,121 @@
+"""Disk usage command for COS CLI"""
+
+import sys
+
+import click
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from ..auth import COSAuthenticator
+from ..client import COSClient
+from ..config import ConfigManager
+from ..utils import parse_cos_uri, is_cos_uri, format_size, format_output, error_message
+from ..exceptions import COSError
+from ..constants import DU_TOP, INDEX_TTL
+from ..connections import configure_connections
+from ..index import indexed_objects
+from ..listing import iter_objects_parallel
+from ..usage import PrefixUsage, UsageTree
+
+
+def _row(usage: PrefixUsage, path: str, output_format: str, human_readable: bool) -> dict:
+    """One prefix's totals as a row for ``output_format``."""
+    if output_format in ("json", "ndjson"):
+        return {
+            "Prefix": path,
+            "Objects": usage.objects,
+            "Size": usage.size,
+            "StorageClasses": {
+                name: {"Objects": objects, "Size": size}
+                for name, (size, objects) in sorted(usage.classes.items(), key=lambda c: -c[1][0])
+            },
+        }
+    size_display = format_size(usage.size) if human_readable else str(usage.size)
+    classes = ", ".join(
+        f"{name} {format_size(size) if human_readable else size}"
+        for name, (size, objects) in sorted(usage.classes.items(), key=lambda c: -c[1][0])
+    )
+    return {"Prefix": path, "Objects": usage.objects, "Size": size_display, "Storage Classes": classes}
+
+
+@click.command()
+@click.argument("path")
+@click.option("--depth", "-d", type=click.IntRange(min=0), default=1, show_default=True,
+              help="Break totals down by prefixes up to this many '/' levels below PATH")
+@click.option("--top", type=click.IntRange(min=0), default=DU_TOP, show_default=True,
+              help="Show the largest N prefixes (0 for all)")
+@click.option("--human-readable", "-h", is_flag=True, help="Human-readable sizes")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight; splits large prefixes into partitions")
+@click.option("--use-index", is_flag=True, help="Count from the local listing index (see cos index), refreshing it when older than --index-ttl")
+@click.option("--index-ttl", type=click.IntRange(min=0), default=INDEX_TTL, help="Seconds an indexed listing is trusted by --use-index")
+@click.option("--no-progress", is_flag=True, help="Disable progress display")
+@click.pass_context
+def du(ctx, path, depth, top, human_readable, list_concurrency, use_index, index_ttl, no_progress):
+    """
+    Summarize object count and size under a prefix.
+
+    \b
+    Examples:
+      cos du cos://bucket/                       # Totals per top-level prefix
+      cos du cos://bucket/logs/ -d 2 -h          # Two levels deep, human-readable
+      cos du cos://bucket/ --top 10 --list-concurrency 16
+    """
+    try:
+        if not is_cos_uri(path):
+            raise COSError(f"Invalid COS URI: {path}")
+
+        # Get config and auth
+        profile = ctx.obj.get("profile", "default")
+        region = ctx.obj.get("region")
+        output_format = ctx.obj.get("output")
+
+        config_manager = ConfigManager(profile)
+
+        if output_format is None:
+            output_format = config_manager.get_output_format()
+
+        configure_connections(list_concurrency)
+        authenticator = COSAuthenticator(config_manager)
+        cos_client_raw = authenticator.authenticate(region)
+
+        bucket, prefix = parse_cos_uri(path)
+        cos_client = COSClient(cos_client_raw, bucket)
+
+        # Totals do not depend on key order, so partitions are counted as they arrive
+        if use_index:
+            entries = indexed_objects(cos_client, bucket, prefix, ttl=index_ttl, list_concurrency=list_concurrency)
+        else:
+            entries = iter_objects_parallel(cos_client, prefix=prefix, concurrency=list_concurrency, ordered=False)
+
+        tree = UsageTree(prefix, depth)
+        if no_progress or not sys.stderr.isatty():
+            tree.add_entries(entries)
+        else:
+            # On stderr so json/text output stays parseable
+            with Progress(SpinnerColumn(), TextColumn("{task.description}"), console=Console(stderr=True), transient=True) as progress:
+                task = progress.add_task("Counting objects...", total=None)
+                tree.add_entries(entries, lambda objects, size: progress.update(
+                    task, description=f"Counted {objects} objects, {format_size(size)}"))
+
+        total, prefixes = tree.top(top or None)
+        if output_format == "text":
+            # du-style: size, objects and prefix per line, the total last
+            lines = [f"{u.size}\t{u.objects}\tcos://{bucket}/{prefix}{u.prefix}" for u in prefixes]
+            lines.append(f"{total.size}\t{total.objects}\tcos://{bucket}/{prefix}")
+            format_output(lines, "text")
+            return
+
+        data = [_row(u, f"cos://{bucket}/{prefix}{u.prefix}", output_format, human_readable) for u in prefixes]
+        data.append(_row(total, f"cos://{bucket}/{prefix}", output_format, human_readable))
+        if output_format == "table":
+            data[-1]["Prefix"] = f"Total: {data[-1]['Prefix']}"
+        format_output(data, output_format)
+
+    except COSError as e:
+        error_message(str(e))
+        ctx.exit(1)
+    except Exception as e:
+        if ctx.obj.get("debug"):
+            raise
+        error_message("An unexpected error occurred", e)
+        ctx.exit(1)
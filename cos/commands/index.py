@@ -0,0 +1,154 @@
+"""Listing index commands for COS CLI"""
+
+import time
+from datetime import datetime
+
+import click
+
+from ..auth import COSAuthenticator
+from ..client import COSClient
+from ..config import ConfigManager
+from ..connections import configure_connections
+from ..index import get_listing_index, index_path
+from ..utils import (
+    parse_cos_uri,
+    is_cos_uri,
+    format_size,
+    format_output,
+    success_message,
+    info_message,
+    error_message,
+)
+from ..exceptions import COSError
+
+
+@click.group()
+def index():
+    """Manage the local listing index used by --use-index."""
+    pass
+
+
+@index.command("refresh")
+@click.argument("path")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight; splits large prefixes into partitions")
+@click.pass_context
+def refresh_index(ctx, path, list_concurrency):
+    """
+    List a bucket or prefix and update its index.
+
+    \b
+    Examples:
+      cos index refresh cos://bucket/
+      cos index refresh cos://bucket/logs/ --list-concurrency 16
+    """
+    try:
+        if not is_cos_uri(path):
+            raise COSError(f"Invalid COS URI: {path}")
+        bucket, prefix = parse_cos_uri(path)
+
+        # Get config and auth
+        profile = ctx.obj.get("profile", "default")
+        region = ctx.obj.get("region")
+
+        configure_connections(list_concurrency)
+        config_manager = ConfigManager(profile)
+        authenticator = COSAuthenticator(config_manager)
+        cos_client_raw = authenticator.authenticate(region)
+        cos_client = COSClient(cos_client_raw, bucket)
+
+        started = time.monotonic()
+        count = get_listing_index(create=True).refresh(cos_client, bucket, prefix, list_concurrency)
+        elapsed = time.monotonic() - started
+        success_message(f"Indexed {count} objects under cos://{bucket}/{prefix} in {elapsed:.1f}s")
+
+    except COSError as e:
+        error_message(str(e))
+        ctx.exit(1)
+    except Exception as e:
+        if ctx.obj.get("debug"):
+            raise
+        error_message("An unexpected error occurred", e)
+        ctx.exit(1)
+
+
+@index.command("status")
+@click.argument("path", required=False, default="")
+@click.pass_context
+def index_status(ctx, path):
+    """
+    Show indexed prefixes, their age and what they hold.
+
+    \b
+    Examples:
+      cos index status
+      cos index status cos://bucket
+    """
+    try:
+        bucket = parse_cos_uri(path)[0] if path else None
+        listing_index = get_listing_index()
+        listings = listing_index.listings(bucket) if listing_index is not None else []
+        if not listings:
+            info_message(f"Nothing indexed in {index_path()}")
+            return
+
+        output_format = ctx.obj.get("output") or "table"
+        now = time.time()
+        data = []
+        for listing in listings:
+            data.append({
+                "Prefix": f"cos://{listing.bucket}/{listing.prefix}",
+                "Objects": listing.objects,
+                "Size": format_size(listing.size) if output_format == "table" else listing.size,
+                "Refreshed": (
+                    datetime.fromtimestamp(listing.refreshed).strftime("%Y-%m-%d %H:%M:%S")
+                    if listing.refreshed else "stale"
+                ),
+                "Age": f"{int(now - listing.refreshed)}s" if listing.refreshed else "",
+            })
+        format_output(data, output_format)
+
+    except COSError as e:
+        error_message(str(e))
+        ctx.exit(1)
+    except Exception as e:
+        if ctx.obj.get("debug"):
+            raise
+        error_message("An unexpected error occurred", e)
+        ctx.exit(1)
+
+
+@index.command("clear")
+@click.argument("path", required=False, default="")
+@click.pass_context
+def clear_index(ctx, path):
+    """
+    Forget an indexed bucket or prefix, or the whole index.
+
+    \b
+    Examples:
+      cos index clear cos://bucket/logs/
+      cos index clear
+    """
+    try:
+        if path and not is_cos_uri(path):
+            raise COSError(f"Invalid COS URI: {path}")
+        listing_index = get_listing_index()
+        if listing_index is None:
+            info_message(f"Nothing indexed in {index_path()}")
+            return
+        if path:
+            bucket, prefix = parse_cos_uri(path)
+            listing_index.clear(bucket, prefix)
+            success_message(f"Cleared index of cos://{bucket}/{prefix}")
+        else:
+            listing_index.clear()
+            success_message("Cleared listing index")
+
+    except COSError as e:
+        error_message(str(e))
+        ctx.exit(1)
+    except Exception as e:
+        if ctx.obj.get("debug"):
+            raise
+        error_message("An unexpected error occurred", e)
+        ctx.exit(1)
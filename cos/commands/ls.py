@@ -1,7 +1,9 @@
 """List command for COS CLI"""
 
+import sys
+from pathlib import Path
+
 import click
-from datetime import datetime
 
 from ..auth import COSAuthenticator
 from ..client import COSClient
@@ -10,19 +12,78 @@ from ..utils import (
     parse_cos_uri,
     is_cos_uri,
     format_size,
-    format_datetime,
     format_output,
+    success_message,
     error_message,
+    console,
 )
 from ..exceptions import COSError
+from ..constants import INDEX_TTL, LIST_PAGE_SIZE
+from ..index import indexed_objects
+from ..connections import configure_connections
+from ..listing import decode_token, encode_token, entry_key, iter_objects, iter_objects_parallel
+from ..writers import open_export, stream_writer
+
+# Columns per --output format; ndjson, csv and --export carry the full entry
+EXPORT_FIELDS = ["Key", "Size", "LastModified", "ETag", "StorageClass", "Type"]
+LIST_FIELDS = {
+    "json": ["Key", "Size", "LastModified", "Type"],
+    "text": ["Key"],
+    "table": ["Key", "Size", "Last Modified"],
+}
+
+
+def _display_time(last_modified: str) -> str:
+    """``2024-01-01T12:00:00.000Z`` as ``2024-01-01 12:00:00`` without parsing it."""
+    if len(last_modified) >= 19 and last_modified[10] == "T":
+        return f"{last_modified[:10]} {last_modified[11:19]}"
+    return last_modified
+
+
+def _row(obj: dict, output_format: str, human_readable: bool) -> dict:
+    """One listing entry as a row for ``output_format``."""
+    if "Prefix" in obj:
+        # Common prefix (directory), only when not recursive
+        key, size, last_modified, etag, storage_class, kind = obj["Prefix"], 0, "", "", "", "DIR"
+    else:
+        key = obj.get("Key", "")
+        size = int(obj.get("Size", 0))
+        last_modified = obj.get("LastModified", "")
+        etag = obj.get("ETag", "").strip('"')
+        storage_class = obj.get("StorageClass", "")
+        kind = "FILE"
+    if output_format == "table":
+        if kind == "DIR":
+            size_display = "DIR"
+        else:
+            size_display = format_size(size) if human_readable else str(size)
+        return {"Key": key, "Size": size_display, "Last Modified": _display_time(last_modified)}
+    if output_format in ("json", "text"):
+        return {"Key": key, "Size": size, "LastModified": _display_time(last_modified), "Type": kind}
+    return {
+        "Key": key,
+        "Size": size,
+        "LastModified": last_modified,
+        "ETag": etag,
+        "StorageClass": storage_class,
+        "Type": kind,
+    }
 
 
 @click.command()
 @click.argument("path", required=False, default="")
 @click.option("--recursive", "-r", is_flag=True, help="List recursively")
 @click.option("--human-readable", "-h", is_flag=True, help="Human-readable sizes")
+@click.option("--max-items", type=click.IntRange(min=1), default=None,
+              help="Stop after this many entries and print a NextToken to resume from")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight for -r; splits large prefixes into partitions")
+@click.option("--use-index", is_flag=True, help="With -r, list from the local listing index (see cos index), refreshing it when older than --index-ttl")
+@click.option("--index-ttl", type=click.IntRange(min=0), default=INDEX_TTL, help="Seconds an indexed listing is trusted by --use-index")
+@click.option("--starting-token", default=None, help="Resume a listing from the NextToken of an earlier one")
+@click.option("--export", type=click.Path(dir_okay=False), default=None,
+              help="Write the listing to a .ndjson, .jsonl, .csv or .txt file, gzipped if it ends in .gz")
 @click.pass_context
-def ls(ctx, path, recursive, human_readable):
+def ls(ctx, path, recursive, human_readable, max_items, list_concurrency, use_index, index_ttl, starting_token, export):
     """
     List buckets or objects.
 
@@ -32,6 +93,8 @@ def ls(ctx, path, recursive, human_readable):
       cos ls cos://bucket/          # List objects in bucket
       cos ls cos://bucket/prefix/   # List with prefix
       cos ls cos://bucket/ -r       # Recursive listing
+      cos ls cos://bucket/ -r --max-items 1000 --starting-token <NextToken>
+      cos ls cos://bucket/ -r --export keys.ndjson.gz
     """
     try:
         # Get config and auth
@@ -44,6 +107,7 @@ def ls(ctx, path, recursive, human_readable):
         if output_format is None:
             output_format = config_manager.get_output_format()
         
+        configure_connections(list_concurrency)
         authenticator = COSAuthenticator(config_manager)
         cos_client_raw = authenticator.authenticate(region)
         
@@ -53,8 +117,8 @@ def ls(ctx, path, recursive, human_readable):
             buckets = cos_client.list_buckets()
             
             # Format output
-            if output_format == "json":
-                format_output(buckets, "json")
+            if output_format in ("json", "ndjson", "csv"):
+                format_output(buckets, output_format)
             elif output_format == "text":
                 format_output([b["Name"] for b in buckets], "text")
             else:
@@ -75,68 +139,51 @@ def ls(ctx, path, recursive, human_readable):
         bucket, prefix = parse_cos_uri(path)
         cos_client = COSClient(cos_client_raw, bucket)
         
-        # Get objects
+        # Get objects, one page at a time
         delimiter = "" if recursive else "/"
-        response = cos_client.list_objects(prefix=prefix, delimiter=delimiter)
-        
-        # Extract objects and directories
-        objects = []
+        start_after = decode_token(starting_token) if starting_token else ""
+        page_size = min(max_items + 1, LIST_PAGE_SIZE) if max_items else LIST_PAGE_SIZE
+        if recursive and use_index:
+            entries = indexed_objects(
+                cos_client, bucket, prefix, ttl=index_ttl, list_concurrency=list_concurrency, start_after=start_after
+            )
+        elif recursive:
+            # Partitions are listed concurrently and merged back into key order
+            entries = iter_objects_parallel(
+                cos_client, prefix=prefix, concurrency=list_concurrency, page_size=page_size, start_after=start_after
+            )
+        else:
+            entries = iter_objects(
+                cos_client, prefix=prefix, delimiter=delimiter, page_size=page_size, start_after=start_after
+            )
+        if export:
+            writer = open_export(Path(export), EXPORT_FIELDS)
+            output_format = "ndjson"
+        else:
+            writer = stream_writer(output_format, LIST_FIELDS.get(output_format, EXPORT_FIELDS), sys.stdout, console)
         
-        # Add common prefixes (directories) if not recursive
-        if not recursive:
-            for prefix_info in response.get("CommonPrefixes", []):
-                prefix_name = prefix_info.get("Prefix", "")
-                objects.append({
-                    "Key": prefix_name,
-                    "Size": 0,
-                    "LastModified": "",
-                    "Type": "DIR",
-                })
+        # Rows are written as each page arrives; nothing is buffered beyond a table page
+        next_token = None
+        last_key = None
+        try:
+            for obj in entries:
+                if max_items and writer.rows == max_items:
+                    # One entry past the limit tells the listing goes on
+                    next_token = encode_token(last_key)
+                    break
+                writer.write(_row(obj, output_format, human_readable))
+                last_key = entry_key(obj)
+        finally:
+            writer.close()
         
-        # Add objects
-        for obj in response.get("Contents", []):
-            key = obj.get("Key", "")
-            size = int(obj.get("Size", 0))
-            last_modified = obj.get("LastModified", "")
-            
-            # Parse datetime
-            if last_modified:
-                try:
-                    dt = datetime.strptime(last_modified, "%Y-%m-%dT%H:%M:%S.%fZ")
-                    last_modified = format_datetime(dt)
-                except:
-                    pass
-            
-            objects.append({
-                "Key": key,
-                "Size": size,
-                "LastModified": last_modified,
-                "Type": "FILE",
-            })
+        if export:
+            success_message(f"Exported {writer.rows} entries to {export}")
+        elif not writer.rows and output_format == "table":
+            click.echo(f"No objects found in cos://{bucket}/{prefix}")
         
-        # Format output
-        if output_format == "json":
-            format_output(objects, "json")
-        elif output_format == "text":
-            format_output([obj["Key"] for obj in objects], "text")
-        else:
-            # Table format
-            data = []
-            for obj in objects:
-                size_display = format_size(obj["Size"]) if human_readable else str(obj["Size"])
-                if obj["Type"] == "DIR":
-                    size_display = "DIR"
-                
-                data.append({
-                    "Key": obj["Key"],
-                    "Size": size_display,
-                    "Last Modified": obj["LastModified"],
-                })
-            
-            if data:
-                format_output(data, "table")
-            else:
-                click.echo(f"No objects found in cos://{bucket}/{prefix}")
+        if next_token:
+            # On stderr so json/text output stays parseable
+            click.echo(f"NextToken: {next_token}", err=True)
     
     except COSError as e:
         error_message(str(e))
@@ -6,6 +6,7 @@ from pathlib import Path
 from ..auth import COSAuthenticator
 from ..client import COSClient
 from ..config import ConfigManager
+from ..constants import CACHE_POLICIES
 from ..utils import (
     parse_cos_uri,
     is_cos_uri,
@@ -14,6 +15,7 @@ from ..utils import (
     info_message,
 )
 from ..exceptions import COSError
+from ..listing import iter_objects
 
 
 @click.command()
@@ -22,12 +24,18 @@ from ..exceptions import COSError
 @click.option("--recursive", "-r", is_flag=True, help="Move recursively")
 @click.option("--force", "-f", is_flag=True, help="Force overwrite")
 @click.option("--no-progress", is_flag=True, help="Disable progress bar")
-@click.option("--part-size", type=str, default=None, help="Part size for multipart upload (e.g., 8MB, 64MB)")
+@click.option("--concurrency", "concurrency", type=str, default="4", help='Number of objects and parts transferred in parallel, or "auto" to adapt it')
+@click.option("--part-size", type=str, default=None, help="Part size for multipart upload (e.g., 8MB, 64MB); planned from file size if omitted")
+@click.option("--max-memory", type=str, default=None, help="Cap on memory for transfer buffers shared by all workers (e.g., 512MB, 2GB)")
+@click.option("--max-bandwidth", type=str, default=None, help="Limit transfer rate shared by all workers (e.g., 10MB for 10MB/s)")
+@click.option("--max-upload-bandwidth", type=str, default=None, help="Upload rate limit; overrides --max-bandwidth for uploads")
+@click.option("--max-download-bandwidth", type=str, default=None, help="Download rate limit; overrides --max-bandwidth for downloads")
 @click.option("--max-retries", type=int, default=3, help="Max retries for part operations")
 @click.option("--retry-backoff", type=float, default=0.5, help="Initial backoff seconds between retries")
 @click.option("--retry-backoff-max", type=float, default=5.0, help="Max backoff seconds for retries")
+@click.option("--cache-policy", type=click.Choice(CACHE_POLICIES), default="normal", help="Page-cache hints for local files: normal, sequential (read ahead), or drop (also evict transferred data)")
 @click.pass_context
-def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_retries, retry_backoff, retry_backoff_max):
+def mv(ctx, source, destination, recursive, force, no_progress, concurrency, part_size, max_memory, max_bandwidth, max_upload_bandwidth, max_download_bandwidth, max_retries, retry_backoff, retry_backoff_max, cache_policy):
     """
     Move or rename objects.
 
@@ -48,10 +56,29 @@ def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_r
         ctx_obj = ctx.obj or {}
         profile = ctx_obj.get("profile", "default")
         region = ctx_obj.get("region")
+        from ..connections import configure_connections
+        from ..transfer import configure_bandwidth, configure_cache_policy, resolve_concurrency
+        # The SDK config takes its pool size from the registry
+        concurrency = resolve_concurrency(concurrency)
+        configure_connections(concurrency)
         config_manager = ConfigManager(profile)
         authenticator = COSAuthenticator(config_manager)
         cos_client_raw = authenticator.authenticate(region)
 
+        if max_memory:
+            from ..transfer import configure_buffer_pool
+            from ..utils import parse_size_to_bytes
+            configure_buffer_pool(parse_size_to_bytes(max_memory))
+        from ..progress import report_transfer_stats
+        from ..retry import configure_retries
+        from ..utils import parse_bandwidth
+        configure_retries(max_retries, retry_backoff, retry_backoff_max)
+        configure_bandwidth(
+            upload=parse_bandwidth(max_upload_bandwidth or max_bandwidth),
+            download=parse_bandwidth(max_download_bandwidth or max_bandwidth),
+        )
+        configure_cache_policy(cache_policy)
+
         if not src_is_cos:
             # Local -> COS
             src_path = Path(source)
@@ -61,41 +88,25 @@ def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_r
             if not dst_key:
                 raise COSError("Destination key cannot be empty")
             client = COSClient(cos_client_raw, dst_bucket)
-            if no_progress:
-                client.upload_file(str(src_path), dst_key)
-            else:
-                from rich.progress import (
-                    Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TransferSpeedColumn, TimeRemainingColumn
-                )
-                from ..transfer import upload_file_multipart_with_progress
-                from ..utils import parse_size_to_bytes
-                ps = parse_size_to_bytes(part_size)
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    TransferSpeedColumn(),
-                    TimeRemainingColumn(),
-                ) as progress:
-                    file_size = src_path.stat().st_size
-                    task = progress.add_task(f"Uploading {src_path.name}...", total=file_size)
-                    def on_update(done, _total):
-                        progress.update(task, completed=done)
-                    upload_file_multipart_with_progress(
-                        cos_client_raw,
-                        dst_bucket,
-                        dst_key,
-                        src_path,
-                        chunk_size=ps,
-                        progress_update=on_update,
-                        max_retries=max_retries,
-                        retry_backoff=retry_backoff,
-                        retry_backoff_max=retry_backoff_max,
-                    )
+            from ..progress import transfer_progress
+            from ..transfer import run_transfers, upload_job
+            from ..utils import parse_size_to_bytes
+            job = upload_job(
+                client,
+                src_path,
+                dst_key,
+                part_size=parse_size_to_bytes(part_size) if part_size else None,
+                max_retries=max_retries,
+                retry_backoff=retry_backoff,
+                retry_backoff_max=retry_backoff_max,
+                concurrency=concurrency,
+            )
+            with transfer_progress(f"Uploading {src_path.name}...", job.size, not no_progress) as on_advance:
+                run_transfers([job], concurrency, on_advance)
             # Delete local file after successful upload
             src_path.unlink()
             success_message(f"Moved local {source} -> cos://{dst_bucket}/{dst_key}")
+            report_transfer_stats(concurrency, debug=ctx_obj.get("debug"))
             return
 
         # COS -> COS path
@@ -106,44 +117,70 @@ def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_r
         if not dst_key:
             raise COSError("Destination key cannot be empty")
         
+        from ..progress import object_progress, transfer_progress
+        from ..transfer import BatchDeleter, copy_job, copy_objects, run_transfers
+        from ..utils import failure_summary, get_content_length, parse_size_to_bytes
+        # Large objects are copied server-side in parallel parts
+        job_options = dict(
+            part_size=parse_size_to_bytes(part_size) if part_size else None,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            retry_backoff_max=retry_backoff_max,
+            concurrency=concurrency,
+        )
+        
         # Handle recursive move
         if recursive:
             # List all objects with prefix
             src_client = COSClient(cos_client_raw, src_bucket)
-            objects = src_client.list_objects(prefix=src_key, delimiter="")
-            
-            if not objects:
-                info_message(f"No objects found with prefix: {src_key}")
-                return
-            
-            moved_count = 0
-            for obj in objects:
+            copies = []
+            found = False
+            for obj in iter_objects(src_client, prefix=src_key):
+                found = True
                 src_obj_key = obj["Key"]
                 
                 # Calculate destination key
                 relative_key = src_obj_key[len(src_key):].lstrip("/")
                 dst_obj_key = dst_key.rstrip("/") + "/" + relative_key if relative_key else dst_key
+                if (src_bucket, src_obj_key) == (dst_bucket, dst_obj_key):
+                    continue  # Already in place; deleting it would lose it
+                copies.append((src_bucket, src_obj_key, dst_bucket, dst_obj_key, int(obj.get("Size", 0) or 0)))
+            
+            if not found:
+                info_message(f"No objects found with prefix: {src_key}")
+                return
+            
+            # Each source is deleted, in batches, only once its copy is complete
+            deleter = BatchDeleter(src_client, src_bucket)
+            client = COSClient(cos_client_raw)
+            total_bytes = sum(copy[4] for copy in copies)
+            with object_progress("Moving", total_bytes, len(copies), not no_progress) as bar:
+                def on_done(key, exc):
+                    if bar:
+                        bar.object_done(exc is not None)
+                    if exc is None:
+                        deleter.add(key)
                 
-                # Copy to destination
-                if src_bucket == dst_bucket:
-                    client = COSClient(cos_client_raw, src_bucket)
-                else:
-                    dst_client = COSClient(cos_client_raw, dst_bucket)
-                    client = dst_client
-                
-                # Copy
-                copy_source = {'Bucket': src_bucket, 'Key': src_obj_key, 'Region': region or config_manager.get_region()}
-                
-                # Use wrapper for testability
-                client.copy_object(src_bucket, src_obj_key, dst_bucket, dst_obj_key)
-                
-                # Delete source
-                src_client.delete_object(src_obj_key)
-                
-                info_message(f"Moved: {src_obj_key} -> cos://{dst_bucket}/{dst_obj_key}")
-                moved_count += 1
+                try:
+                    failures = copy_objects(
+                        client,
+                        copies,
+                        on_advance=bar,
+                        on_done=on_done,
+                        **job_options
+                    )
+                finally:
+                    deleter.flush()
+            
+            failure_summary(failures, "copy")
+            failure_summary(deleter.failures, "delete")
+            if failures or deleter.failures:
+                raise COSError(
+                    f"{deleter.deleted} of {len(copies)} objects moved; "
+                    f"{len(failures)} copies and {len(deleter.failures)} deletes failed"
+                )
             
-            success_message(f"Successfully moved {moved_count} objects")
+            success_message(f"Successfully moved {deleter.deleted} objects")
         
         else:
             # Single object move
@@ -151,7 +188,7 @@ def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_r
             
             # Check if source exists
             try:
-                src_client.head_object(src_key)
+                head = src_client.head_object(src_key)
             except:
                 raise COSError(f"Source object not found: cos://{src_bucket}/{src_key}")
             
@@ -166,21 +203,19 @@ def mv(ctx, source, destination, recursive, force, no_progress, part_size, max_r
                 except:
                     pass  # Destination doesn't exist, safe to proceed
             
-            # Copy to destination
-            copy_source = {
-                'Bucket': src_bucket,
-                'Key': src_key,
-                'Region': region or config_manager.get_region()
-            }
-            
-            # Use wrapper for testability
+            # Copy to destination (use wrapper for testability)
             client = COSClient(cos_client_raw)
-            client.copy_object(src_bucket, src_key, dst_bucket, dst_key)
+            size = get_content_length(head)
+            job = copy_job(client, src_bucket, src_key, dst_bucket, dst_key, size, **job_options)
+            with transfer_progress(f"Copying {src_key}...", size, not no_progress) as on_advance:
+                run_transfers([job], concurrency, on_advance)
             
             # Delete source
             src_client.delete_object(src_key)
             
             success_message(f"Moved: cos://{src_bucket}/{src_key} -> cos://{dst_bucket}/{dst_key}")
+        
+        report_transfer_stats(concurrency, debug=ctx_obj.get("debug"))
             
     except COSError as e:
         error_message(str(e))
@@ -7,6 +7,7 @@ from ..client import COSClient
 from ..config import ConfigManager
 from ..utils import parse_cos_uri, is_cos_uri, success_message, error_message
 from ..exceptions import COSError
+from ..listing import iter_objects
 
 
 @click.command()
@@ -41,14 +42,13 @@ def rb(ctx, bucket, force):
         
         if force:
             # Delete all objects first
-            response = cos_client.list_objects(prefix="", delimiter="")
-            objects = response.get("Contents", [])
-            
-            if objects:
-                click.echo(f"Deleting {len(objects)} objects...")
-                for obj in objects:
-                    obj_key = obj.get("Key", "")
-                    cos_client.delete_object(obj_key)
+            # Objects are deleted as each listing page arrives
+            deleted = 0
+            for obj in iter_objects(cos_client):
+                cos_client.delete_object(obj.get("Key", ""))
+                deleted += 1
+            if deleted:
+                click.echo(f"Deleted {deleted} objects")
         
         # Delete bucket
         cos_client.delete_bucket(bucket_name)
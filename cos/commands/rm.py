@@ -8,6 +8,8 @@ from ..client import COSClient
 from ..config import ConfigManager
 from ..utils import parse_cos_uri, is_cos_uri, success_message, error_message
 from ..exceptions import COSError
+from ..connections import configure_connections
+from ..listing import iter_objects_parallel
 
 
 @click.command()
@@ -18,8 +20,9 @@ from ..exceptions import COSError
 @click.option("--dryrun", is_flag=True, help="Show what would be deleted")
 @click.option("--force", is_flag=True, help="Force deletion without prompts")
 @click.option("--no-progress", is_flag=True, help="Disable progress bar")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight for -r; splits large prefixes into partitions")
 @click.pass_context
-def rm(ctx, path, recursive, include, exclude, dryrun, force, no_progress):
+def rm(ctx, path, recursive, include, exclude, dryrun, force, no_progress, list_concurrency):
     """
     Remove objects from COS.
 
@@ -38,6 +41,7 @@ def rm(ctx, path, recursive, include, exclude, dryrun, force, no_progress):
         profile = ctx_obj.get("profile", "default")
         region = ctx_obj.get("region")
         
+        configure_connections(list_concurrency)
         config_manager = ConfigManager(profile)
         authenticator = COSAuthenticator(config_manager)
         cos_client_raw = authenticator.authenticate(region)
@@ -55,19 +59,23 @@ def rm(ctx, path, recursive, include, exclude, dryrun, force, no_progress):
                 success_message(f"Deleted cos://{bucket}/{key}")
         else:
             # Multiple objects deletion
-            response = cos_client.list_objects(prefix=key, delimiter="")
-            objects = response.get("Contents", [])
-            
-            if not objects:
-                click.echo(f"No objects found matching: cos://{bucket}/{key}")
-                return
+            # Objects are handled as each listing page arrives; the total is not known up front.
+            # A dry run lists in key order so its preview shows the first keys.
+            objects = iter_objects_parallel(cos_client, prefix=key, concurrency=list_concurrency, ordered=dryrun)
+            count = 0
             
             if dryrun:
-                click.echo(f"Would delete {len(objects)} objects:")
-                for obj in objects[:10]:  # Show first 10
-                    click.echo(f"  - {obj.get('Key', '')}")
-                if len(objects) > 10:
-                    click.echo(f"  ... and {len(objects) - 10} more")
+                shown = []
+                for obj in objects:
+                    count += 1
+                    if count <= 10:  # Show first 10
+                        shown.append(obj.get("Key", ""))
+                if count:
+                    click.echo(f"Would delete {count} objects:")
+                    for obj_key in shown:
+                        click.echo(f"  - {obj_key}")
+                    if count > 10:
+                        click.echo(f"  ... and {count - 10} more")
             else:
                 with Progress(
                     SpinnerColumn(),
@@ -75,14 +83,19 @@ def rm(ctx, path, recursive, include, exclude, dryrun, force, no_progress):
                     BarColumn(),
                     TaskProgressColumn(),
                 ) as progress:
-                    task = progress.add_task(f"Deleting {len(objects)} objects...", total=len(objects))
+                    task = progress.add_task("Deleting objects...", total=None)
                     
                     for obj in objects:
                         obj_key = obj.get("Key", "")
                         cos_client.delete_object(obj_key)
-                        progress.update(task, advance=1)
+                        count += 1
+                        progress.update(task, advance=1, description=f"Deleted {count} objects...")
                 
-                success_message(f"Deleted {len(objects)} objects from cos://{bucket}/{key}")
+                if count:
+                    success_message(f"Deleted {count} objects from cos://{bucket}/{key}")
+            
+            if not count:
+                click.echo(f"No objects found matching: cos://{bucket}/{key}")
     
     except COSError as e:
         error_message(str(e))
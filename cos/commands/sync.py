@@ -6,8 +6,10 @@ from pathlib import Path
 from datetime import datetime
 
 from ..auth import COSAuthenticator
+from ..checksum import header_crc64
 from ..client import COSClient
 from ..config import ConfigManager
+from ..constants import CACHE_POLICIES, DOWNLOAD_TEMP_SUFFIX, FSYNC_MODES, INDEX_TTL, MULTIPART_THRESHOLD
 from ..utils import (
     parse_cos_uri,
     is_cos_uri,
@@ -17,8 +19,26 @@ from ..utils import (
     format_size,
     should_process_file,
     compare_checksums,
+    parse_size_to_bytes,
+    parse_bandwidth,
+    ResumeTracker,
+)
+from ..connections import configure_connections
+from ..progress import report_transfer_stats, transfer_progress
+from ..retry import configure_retries
+from ..transfer import (
+    configure_bandwidth,
+    configure_buffer_pool,
+    configure_cache_policy,
+    configure_fsync,
+    download_job,
+    resolve_concurrency,
+    run_transfers,
+    upload_job,
 )
 from ..exceptions import COSError
+from ..index import confirm_object, indexed_objects
+from ..listing import iter_objects_parallel
 
 
 def get_local_files(directory):
@@ -27,7 +47,8 @@ def get_local_files(directory):
     base_path = Path(directory).resolve()
     
     for file_path in base_path.rglob("*"):
-        if file_path.is_file():
+        # Unfinished downloads are not part of the tree
+        if file_path.is_file() and not file_path.name.endswith(DOWNLOAD_TEMP_SUFFIX):
             relative_path = str(file_path.relative_to(base_path))
             stat = file_path.stat()
             files[relative_path] = {
@@ -39,15 +60,14 @@ def get_local_files(directory):
     return files
 
 
-def get_cos_files(cos_client, prefix=""):
-    """Get list of COS objects with metadata"""
+def get_cos_files(cos_client, prefix="", list_concurrency=1, use_index=False, index_ttl=INDEX_TTL):
+    """Get list of COS objects with metadata, from a listing or the listing index"""
     files = {}
-    response = cos_client.list_objects(prefix=prefix, delimiter="")
-    
-    # Extract objects from response dictionary
-    objects = response.get("Contents", [])
-    
-    for obj in objects:
+    if use_index:
+        listing = indexed_objects(cos_client, cos_client.bucket, prefix, ttl=index_ttl, list_concurrency=list_concurrency)
+    else:
+        listing = iter_objects_parallel(cos_client, prefix=prefix, concurrency=list_concurrency, ordered=False)
+    for obj in listing:
         key = obj["Key"]
         # Remove prefix to get relative path
         relative_key = key[len(prefix):].lstrip("/") if prefix else key
@@ -67,23 +87,45 @@ def get_cos_files(cos_client, prefix=""):
     return files
 
 
+def checksums_match(cos_client, local_path, cos_info):
+    """Compare a local file with an object by MD5 ETag, or CRC64 for multipart objects"""
+    if os.path.getsize(local_path) != int(cos_info.get("size", 0)):
+        return False
+    etag = cos_info.get("etag", "")
+    remote_crc = None
+    if "-" in etag:
+        # Multipart ETags are not an MD5; COS keeps a whole-object CRC64
+        remote_crc = header_crc64(cos_client.head_object(cos_info["key"]))
+    return compare_checksums(local_path, etag, remote_crc)
+
+
 @click.command()
 @click.argument("source")
 @click.argument("destination")
 @click.option("--delete", is_flag=True, help="Delete files in destination not in source")
 @click.option("--dryrun", "-n", is_flag=True, help="Show what would be done without doing it")
 @click.option("--size-only", is_flag=True, help="Skip files with same size (faster)")
-@click.option("--checksum", is_flag=True, help="Use checksums for comparison (slower but accurate)")
+@click.option("--checksum", is_flag=True, help="Compare content: MD5 ETag, or CRC64 for multipart objects (slower but accurate)")
 @click.option("--include", multiple=True, help="Include files matching pattern")
 @click.option("--exclude", multiple=True, help="Exclude files matching pattern")
 @click.option("--no-progress", is_flag=True, help="Disable progress bar")
 @click.pass_context
-@click.option("--part-size", type=str, default=None, help="Part size for multipart/ranged transfers (e.g., 8MB, 64MB)")
+@click.option("--concurrency", "concurrency", type=str, default="4", help='Number of parts or ranges transferred in parallel, or "auto" to adapt it')
+@click.option("--part-size", type=str, default=None, help="Part size for multipart/ranged transfers (e.g., 8MB, 64MB); planned from object size if omitted")
+@click.option("--max-memory", type=str, default=None, help="Cap on memory for transfer buffers shared by all workers (e.g., 512MB, 2GB)")
+@click.option("--max-bandwidth", type=str, default=None, help="Limit transfer rate shared by all workers (e.g., 10MB for 10MB/s)")
+@click.option("--max-upload-bandwidth", type=str, default=None, help="Upload rate limit; overrides --max-bandwidth for uploads")
+@click.option("--max-download-bandwidth", type=str, default=None, help="Download rate limit; overrides --max-bandwidth for downloads")
 @click.option("--max-retries", type=int, default=3, help="Max retries for part/range operations")
 @click.option("--retry-backoff", type=float, default=0.5, help="Initial backoff seconds between retries")
 @click.option("--retry-backoff-max", type=float, default=5.0, help="Max backoff seconds for retries")
-@click.option("--resume/--no-resume", default=True, help="Resume interrupted ranged downloads")
-def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include, exclude, no_progress, part_size, max_retries, retry_backoff, retry_backoff_max, resume):
+@click.option("--cache-policy", type=click.Choice(CACHE_POLICIES), default="normal", help="Page-cache hints for local files: normal, sequential (read ahead), or drop (also evict transferred data)")
+@click.option("--list-concurrency", type=click.IntRange(min=1), default=1, help="Listing requests in flight for listing COS files; splits large prefixes into partitions")
+@click.option("--use-index", is_flag=True, help="Plan from the local listing index (see cos index), refreshing it when older than --index-ttl")
+@click.option("--index-ttl", type=click.IntRange(min=0), default=INDEX_TTL, help="Seconds an indexed listing is trusted by --use-index")
+@click.option("--resume/--no-resume", default=True, help="Resume interrupted ranged downloads and multipart uploads")
+@click.option("--fsync", "fsync", type=click.Choice(FSYNC_MODES), default="none", help="Make downloads durable before renaming them into place: none, each file, or in batches")
+def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include, exclude, no_progress, concurrency, part_size, max_memory, max_bandwidth, max_upload_bandwidth, max_download_bandwidth, max_retries, retry_backoff, retry_backoff_max, resume, fsync, cache_policy, list_concurrency, use_index, index_ttl):
     """
     Synchronize directories between local and COS.
 
@@ -93,7 +135,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
       cos sync cos://bucket/path/ ./local/          # Download COS to local
       cos sync ./local/ cos://bucket/ --delete      # Sync and delete extras
       cos sync ./local/ cos://bucket/ --dryrun      # Preview changes
-      cos sync ./local/ cos://bucket/ --checksum    # Use MD5 checksums
+      cos sync ./local/ cos://bucket/ --checksum    # Compare MD5/CRC64 checksums
       cos sync ./local/ cos://bucket/ --include "*.txt"  # Only .txt files
     """
     try:
@@ -114,9 +156,31 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
         profile = ctx_obj.get("profile", "default")
         region = ctx_obj.get("region")
         
+        # The SDK config takes its pool size from the registry
+        concurrency = resolve_concurrency(concurrency)
+        configure_connections(concurrency, list_concurrency)
         config_manager = ConfigManager(profile)
         authenticator = COSAuthenticator(config_manager)
         cos_client_raw = authenticator.authenticate(region)
+
+        if max_memory:
+            configure_buffer_pool(parse_size_to_bytes(max_memory))
+        configure_bandwidth(
+            upload=parse_bandwidth(max_upload_bandwidth or max_bandwidth),
+            download=parse_bandwidth(max_download_bandwidth or max_bandwidth),
+        )
+        configure_cache_policy(cache_policy)
+        configure_fsync(fsync)
+        configure_retries(max_retries, retry_backoff, retry_backoff_max)
+        
+        job_options = dict(
+            part_size=parse_size_to_bytes(part_size) if part_size else None,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            retry_backoff_max=retry_backoff_max,
+            concurrency=concurrency,
+            resume_tracker=ResumeTracker() if resume else None,
+        )
         
         if dryrun:
             info_message("DRY RUN MODE - No changes will be made")
@@ -129,7 +193,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             
             # Get file lists
             local_files = get_local_files(source)
-            cos_files = get_cos_files(cos_client, prefix)
+            cos_files = get_cos_files(cos_client, prefix, list_concurrency, use_index, index_ttl)
             
             # Apply patterns
             include_patterns = list(include) if include else None
@@ -143,6 +207,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             upload_count = 0
             delete_count = 0
             skip_count = 0
+            jobs = []
             
             # Upload new/modified files
             for rel_path, local_info in local_files.items():
@@ -154,9 +219,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
                     needs_upload = True
                     info_message(f"NEW: {rel_path}")
                 elif checksum:
-                    # Use MD5 checksum comparison
-                    cos_etag = cos_files[rel_path].get("etag", "")
-                    if not compare_checksums(local_info["path"], cos_etag):
+                    if not checksums_match(cos_client, local_info["path"], cos_files[rel_path]):
                         needs_upload = True
                         info_message(f"CHECKSUM DIFF: {rel_path}")
                 elif size_only:
@@ -171,43 +234,17 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
                 
                 if needs_upload:
                     if not dryrun:
-                        if no_progress:
-                            cos_client.upload_file(local_info["path"], cos_key)
-                        else:
-                            # Multipart with progress and retries
-                            from rich.progress import (
-                                Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TransferSpeedColumn, TimeRemainingColumn
-                            )
-                            from ..transfer import upload_file_multipart_with_progress
-                            from ..utils import parse_size_to_bytes
-                            ps = parse_size_to_bytes(part_size)
-                            file_size = local_info["size"]
-                            with Progress(
-                                SpinnerColumn(),
-                                TextColumn("[progress.description]{task.description}"),
-                                BarColumn(),
-                                TaskProgressColumn(),
-                                TransferSpeedColumn(),
-                                TimeRemainingColumn(),
-                            ) as progress:
-                                task = progress.add_task(f"Uploading {rel_path}...", total=file_size)
-                                def on_update(done, _total):
-                                    progress.update(task, completed=done)
-                                upload_file_multipart_with_progress(
-                                    cos_client_raw,
-                                    bucket,
-                                    cos_key,
-                                    Path(local_info["path"]),
-                                    chunk_size=ps,
-                                    progress_update=on_update,
-                                    max_retries=max_retries,
-                                    retry_backoff=retry_backoff,
-                                    retry_backoff_max=retry_backoff_max,
-                                )
+                        jobs.append(upload_job(cos_client, Path(local_info["path"]), cos_key, **job_options))
                     upload_count += 1
                 else:
                     skip_count += 1
             
+            # Transfer everything on one scheduler, largest files first
+            if jobs:
+                total = sum(job.size for job in jobs)
+                with transfer_progress(f"Uploading {len(jobs)} files...", total, not no_progress) as on_advance:
+                    run_transfers(jobs, concurrency, on_advance)
+            
             # Delete files not in source
             if delete:
                 for rel_path, cos_info in cos_files.items():
@@ -228,6 +265,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             click.echo(f"  Skipped:  {skip_count}")
             if delete:
                 click.echo(f"  Deleted:  {delete_count}")
+            report_transfer_stats(concurrency, debug=ctx_obj.get("debug"))
         
         # COS to Local sync
         else:
@@ -235,7 +273,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             cos_client = COSClient(cos_client_raw, bucket)
             
             # Get file lists
-            cos_files = get_cos_files(cos_client, prefix)
+            cos_files = get_cos_files(cos_client, prefix, list_concurrency, use_index, index_ttl)
             local_files = get_local_files(destination)
             
             # Apply patterns
@@ -250,6 +288,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             download_count = 0
             delete_count = 0
             skip_count = 0
+            jobs = []
             
             # Download new/modified files
             for rel_path, cos_info in cos_files.items():
@@ -261,9 +300,8 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
                     needs_download = True
                     info_message(f"NEW: {rel_path}")
                 elif checksum:
-                    # Use MD5 checksum comparison
                     if local_path.exists():
-                        if not compare_checksums(str(local_path), cos_info.get("etag", "")):
+                        if not checksums_match(cos_client, str(local_path), cos_info):
                             needs_download = True
                             info_message(f"CHECKSUM DIFF: {rel_path}")
                     else:
@@ -278,43 +316,39 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
                         needs_download = True
                         info_message(f"MODIFIED: {rel_path}")
                 
+                if needs_download and use_index and int(cos_info.get("size", 0)) >= MULTIPART_THRESHOLD:
+                    # Ranged downloads are planned from the size; confirm it with HEAD
+                    current = confirm_object(cos_client, cos_info["key"])
+                    if current is None:
+                        info_message(f"GONE: {rel_path}")
+                        continue
+                    cos_info = dict(cos_info, size=int(current["Size"]))
+                
                 if needs_download:
                     if not dryrun:
-                        local_path.parent.mkdir(parents=True, exist_ok=True)
-                        if no_progress:
-                            cos_client.download_file(cos_info["key"], str(local_path))
-                        else:
-                            # Use ranged download with retries and optional resume
-                            from ..transfer import download_file_in_ranges_with_progress
-                            from ..utils import parse_size_to_bytes, ResumeTracker
-                            ps = parse_size_to_bytes(part_size)
-                            total_size = int(cos_info.get("size", 0))
-                            tracker = ResumeTracker() if resume else None
-                            # Minimal per-file progress in sync mode (could be aggregated later)
-                            def noop(done, total):
-                                return None
-                            download_file_in_ranges_with_progress(
-                                cos_client_raw,
-                                bucket,
-                                cos_info["key"],
-                                local_path,
-                                total_size=total_size,
-                                chunk_size=ps,
-                                progress_update=noop,
-                                resume=resume,
-                                resume_tracker=tracker,
-                                max_retries=max_retries,
-                                retry_backoff=retry_backoff,
-                                retry_backoff_max=retry_backoff_max,
-                            )
+                        jobs.append(download_job(
+                            cos_client, cos_info["key"], local_path, int(cos_info.get("size", 0)),
+                            resume=resume, **job_options,
+                        ))
                     download_count += 1
                 else:
                     skip_count += 1
             
+            # Transfer everything on one scheduler, largest files first
+            if jobs:
+                total = sum(job.size for job in jobs)
+                with transfer_progress(f"Downloading {len(jobs)} files...", total, not no_progress) as on_advance:
+                    run_transfers(jobs, concurrency, on_advance)
+            
             # Delete local files not in COS
             if delete:
                 for rel_path, local_info in local_files.items():
                     if rel_path not in cos_files:
+                        if use_index:
+                            # Never delete local data on the index's word alone
+                            cos_key = (prefix.rstrip("/") + "/" + rel_path) if prefix else rel_path
+                            if confirm_object(cos_client, cos_key) is not None:
+                                continue
                         info_message(f"DELETE: {rel_path}")
                         if not dryrun:
                             Path(local_info["path"]).unlink()
@@ -331,6 +365,7 @@ def sync(ctx, source, destination, delete, dryrun, size_only, checksum, include,
             click.echo(f"  Skipped:    {skip_count}")
             if delete:
                 click.echo(f"  Deleted:    {delete_count}")
+            report_transfer_stats(concurrency, debug=ctx_obj.get("debug"))
             
     except COSError as e:
         error_message(str(e))
@@ -0,0 +1,173 @@
+"""Process-wide HTTP connection pools for COS clients.
+
+The SDK gives every ``CosS3Client`` one built-in session whose pool is sized
+by the first ``CosConfig`` the process creates (10 connections), whatever
+the transfer concurrency. Workers beyond that either wait or open a TLS
+connection that is dropped again after one request.
+
+Here every client for the same profile and region is bound to one shared
+``requests`` session from ``ConnectionRegistry``. ``configure_connections``
+sizes its pools to the command's worker count (growing them, never
+shrinking), so connections opened by one request are kept alive for the
+next. ``connection_stats`` reports how many requests reused a connection.
+"""
+
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import DEFAULT_POOL_SIZE, POOL_HEADROOM
+from .scheduler import AdaptiveConcurrency
+
+
+class ConnectionStats(NamedTuple):
+    """Connection use summed over the pools of every shared session."""
+
+    requests: int = 0
+    connections: int = 0
+    pool_size: int = DEFAULT_POOL_SIZE
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.connections)
+
+    def summary(self) -> Optional[str]:
+        """One-line report, or None if no request was sent."""
+        if not self.requests:
+            return None
+        rate = self.reused * 100 // self.requests
+        return (
+            f"Connections: {self.requests} request(s) over {self.connections} connection(s), "
+            f"{rate}% reused (pool size {self.pool_size})"
+        )
+
+
+class ConnectionRegistry:
+    """Shared sessions keyed by (profile, region), with resizable pools.
+
+    Thread-safe. Resizing replaces each adapter's pool manager; counters of
+    the replaced pools are carried over so statistics cover the whole run.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, str], requests.Session] = {}
+        self.pool_size = pool_size
+        self._retired_requests = 0
+        self._retired_connections = 0
+
+    def _mount(self, session: requests.Session) -> None:
+        for prefix in ("http://", "https://"):
+            session.mount(prefix, HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=self.pool_size))
+
+    def session(self, profile: str, region: str) -> requests.Session:
+        """Return the session shared by clients of ``profile`` in ``region``."""
+        key = (profile or "", region or "")
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                self._mount(session)
+                self._sessions[key] = session
+            return session
+
+    def resize(self, pool_size: int) -> None:
+        """Grow every pool to hold ``pool_size`` connections per host.
+
+        Args:
+            pool_size: Connections kept alive per host
+        """
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            for session in self._sessions.values():
+                for adapter in set(session.adapters.values()):
+                    requests_, connections = _pool_counters(adapter)
+                    self._retired_requests += requests_
+                    self._retired_connections += connections
+                    adapter.poolmanager.clear()
+                self._mount(session)
+
+    def stats(self) -> ConnectionStats:
+        with self._lock:
+            total_requests = self._retired_requests
+            total_connections = self._retired_connections
+            for session in self._sessions.values():
+                for adapter in set(session.adapters.values()):
+                    requests_, connections = _pool_counters(adapter)
+                    total_requests += requests_
+                    total_connections += connections
+            return ConnectionStats(total_requests, total_connections, self.pool_size)
+
+    def close(self) -> None:
+        """Close every session and forget them."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._retired_requests = self._retired_connections = 0
+
+
+def _pool_counters(adapter) -> Tuple[int, int]:
+    """Sum urllib3's per-host request and connection counters of an adapter."""
+    pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+    if pools is None:
+        return 0, 0
+    total_requests = total_connections = 0
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is not None:
+            total_requests += getattr(pool, "num_requests", 0)
+            total_connections += getattr(pool, "num_connections", 0)
+    return total_requests, total_connections
+
+
+_registry = ConnectionRegistry()
+
+
+def get_connection_registry() -> ConnectionRegistry:
+    """Return the process-wide registry."""
+    return _registry
+
+
+def pool_size_for(concurrency: Union[int, AdaptiveConcurrency, None]) -> int:
+    """Connections per host needed for ``concurrency`` workers.
+
+    Args:
+        concurrency: Worker count, or an ``AdaptiveConcurrency`` (sized for its maximum)
+
+    Returns:
+        The worker count plus headroom for listing and control requests,
+        at least the SDK default
+    """
+    if isinstance(concurrency, AdaptiveConcurrency):
+        workers = concurrency.maximum
+    else:
+        workers = int(concurrency or 0)
+    return max(DEFAULT_POOL_SIZE, workers + POOL_HEADROOM)
+
+
+def configure_connections(*concurrencies: Union[int, AdaptiveConcurrency, None]) -> int:
+    """Size the shared connection pools for a command's concurrency.
+
+    Call it before ``COSAuthenticator.authenticate`` so the SDK config is
+    built with the final pool size.
+
+    Args:
+        *concurrencies: Worker counts or ``AdaptiveConcurrency`` controllers
+            (e.g. transfers and listing); the pool fits the largest
+
+    Returns:
+        The resulting pool size
+    """
+    _registry.resize(max(pool_size_for(c) for c in concurrencies or (None,)))
+    return _registry.pool_size
+
+
+def connection_stats() -> ConnectionStats:
+    """Return connection reuse counters of the process-wide registry."""
+    return _registry.stats()
+
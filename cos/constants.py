@@ -7,6 +7,7 @@ from pathlib import Path
 CONFIG_DIR = Path.home() / ".cos"
 CONFIG_FILE = CONFIG_DIR / "config"
 CREDENTIALS_FILE = CONFIG_DIR / "credentials"
+INDEX_FILE = CONFIG_DIR / "index.db"  # listing index (cos index, --use-index)
 DEFAULT_PROFILE = "default"
 
 # Environment variables
@@ -17,6 +18,7 @@ ENV_ASSUME_ROLE = "COS_ASSUME_ROLE"
 ENV_OUTPUT = "COS_OUTPUT"
 ENV_PROFILE = "COS_PROFILE"
 ENV_ENDPOINT_URL = "COS_ENDPOINT_URL"
+ENV_INDEX_FILE = "COS_INDEX_FILE"
 
 # Defaults
 DEFAULT_REGION = "ap-shanghai"
@@ -24,12 +26,40 @@ DEFAULT_OUTPUT = "table"
 DEFAULT_SCHEME = "https"
 
 # Transfer settings
-MULTIPART_THRESHOLD = 5 * 1024 * 1024  # 5MB
-MULTIPART_CHUNKSIZE = 5 * 1024 * 1024  # 5MB
+MULTIPART_THRESHOLD = 5 * 1024 * 1024  # 5MB; smaller objects go in one part/range
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024  # 8MB; preferred part size for auto planning
+MIN_PART_SIZE = 1024 * 1024  # 1MB service minimum (except the last part)
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024  # 5GB service maximum
+MAX_MULTIPART_PARTS = 10000  # service limit on parts per upload
+MULTIPART_COPY_THRESHOLD = 64 * 1024 * 1024  # 64MB; larger objects copy in parallel parts
+MULTIPART_COPY_CHUNKSIZE = 64 * 1024 * 1024  # 64MB; server-side copy part size
+STREAM_PART_SIZE = 16 * 1024 * 1024  # 16MB; stdin upload part size, up to 160GB
+RESUME_SAVE_PARTS = 256  # multipart upload: finished parts between resume-state writes
+RESUME_SAVE_INTERVAL = 5.0  # multipart upload: or seconds since the last resume-state write
+DELETE_BATCH_SIZE = 1000  # service limit on keys per multi-object delete
 MAX_CONCURRENCY = 10
+AUTO_CONCURRENCY_START = 2  # --concurrency auto: initial worker limit
+AUTO_CONCURRENCY_MAX = 32  # --concurrency auto: highest worker limit
+DEFAULT_MAX_MEMORY = 512 * 1024 * 1024  # 512MB cap on pooled transfer buffers
+DOWNLOAD_TEMP_SUFFIX = ".cos-download"  # sibling temp file a download is written to
+FSYNC_MODES = ("none", "file", "batch")  # --fsync choices for downloads
+FSYNC_BATCH_SIZE = 64  # --fsync batch: files made durable and renamed together
+CACHE_POLICIES = ("normal", "sequential", "drop")  # --cache-policy choices for local file I/O
+LIST_PAGE_SIZE = 1000  # service maximum keys per ListObjects page
+INDEX_TTL = 3600  # seconds an indexed listing is trusted by --use-index
+LIST_PREFETCH_PAGES = 4  # --list-concurrency: pages buffered per partition ahead of the reader
+LIST_PARTITIONS_PER_WORKER = 4  # --list-concurrency: partitions aimed for per listing worker
+DU_TOP = 20  # cos du: prefixes shown, largest first
+DU_PROGRESS_EVERY = 10000  # cos du: objects between progress updates
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2
 
+# HTTP connections
+DEFAULT_POOL_SIZE = 10  # SDK default connections per host
+POOL_HEADROOM = 2  # connections beyond the worker count for listing/control requests
+CONNECT_TIMEOUT = 10  # seconds to establish a connection
+READ_TIMEOUT = 60  # seconds without data on an open connection
+
 # STS settings
 STS_DURATION = 7200  # 2 hours
 STS_ENDPOINT = "sts.tencentcloudapi.com"
@@ -38,7 +68,11 @@ STS_ENDPOINT = "sts.tencentcloudapi.com"
 OUTPUT_JSON = "json"
 OUTPUT_TABLE = "table"
 OUTPUT_TEXT = "text"
-VALID_OUTPUTS = [OUTPUT_JSON, OUTPUT_TABLE, OUTPUT_TEXT]
+OUTPUT_NDJSON = "ndjson"
+OUTPUT_CSV = "csv"
+VALID_OUTPUTS = [OUTPUT_JSON, OUTPUT_TABLE, OUTPUT_TEXT, OUTPUT_NDJSON, OUTPUT_CSV]
+TABLE_PAGE_ROWS = 1000  # streamed tables are rendered this many rows at a time
+EXPORT_GZIP_LEVEL = 6  # ls --export *.gz: fast enough to keep up with listing
 
 # COS URI scheme
 COS_URI_SCHEME = "cos://"
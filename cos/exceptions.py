@@ -41,6 +41,11 @@ class TransferError(COSError):
     pass
 
 
+class ChecksumError(TransferError):
+    """Raised when transferred data does not match the server's checksum"""
+    pass
+
+
 class InvalidURIError(COSError):
     """Raised when COS URI is invalid"""
     pass
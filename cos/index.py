@@ -0,0 +1,490 @@
+"""Persistent listing index.
+
+Listing a prefix of millions of objects can take longer than the transfers
+it plans. ``ListingIndex`` keeps the result in SQLite (``~/.cos/index.db``,
+or ``$COS_INDEX_FILE``): one row per object with its size, ETag, mtime and
+storage class, and one row per indexed (bucket, prefix) with the time it
+was last listed in full.
+
+``cos index refresh`` lists a prefix and updates the rows: every object
+seen is upserted and rows under the prefix that were not seen are swept.
+Commands given ``--use-index`` plan from the rows while the covering
+listing is younger than ``--index-ttl`` and refresh it otherwise. Uploads,
+copies and deletes made by this CLI are written through to the index, so
+it stays current between refreshes; changes made elsewhere show up at the
+next refresh, which is why downloads confirm sizes with HEAD where a stale
+size would matter.
+
+Write-through only touches prefixes that were indexed, and only once the
+index file exists; without it the CLI never opens a database.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .constants import ENV_INDEX_FILE, INDEX_FILE, INDEX_TTL
+from .exceptions import COSError, ObjectNotFoundError
+from .listing import iter_objects_parallel
+from .utils import get_content_length
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    mtime REAL,
+    storage_class TEXT,
+    seen REAL NOT NULL,
+    PRIMARY KEY (bucket, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS listings (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    refreshed REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+) WITHOUT ROWID;
+"""
+
+REFRESH_BATCH = 1000  # rows buffered per insert (and fetched per read) during a refresh
+
+
+class IndexedListing(NamedTuple):
+    """One indexed prefix, as reported by ``cos index status``."""
+
+    bucket: str
+    prefix: str
+    refreshed: float
+    objects: int
+    size: int
+
+
+def _prefix_range(prefix: str) -> Tuple[str, Optional[str]]:
+    """Bounds [low, high) of the keys starting with ``prefix`` (high None if unbounded)."""
+    if not prefix:
+        return "", None
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _parse_mtime(value) -> Optional[float]:
+    """Epoch seconds from a listing ``LastModified`` or a HEAD ``Last-Modified``."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(str(value)).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_mtime(mtime: Optional[float]) -> str:
+    if mtime is None:
+        return ""
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(mtime))
+
+
+def _as_entry(key: str, size: int, etag: Optional[str], mtime: Optional[float], storage_class: Optional[str]) -> Dict:
+    """An index row in the shape ListObjects returns it."""
+    entry = {"Key": key, "Size": size, "ETag": f'"{etag}"' if etag else "", "LastModified": _format_mtime(mtime)}
+    if storage_class:
+        entry["StorageClass"] = storage_class
+    return entry
+
+
+class ListingIndex:
+    """SQLite index of object listings. Thread-safe; one connection per instance.
+
+    Args:
+        path: Database file, created if missing
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL commits without an fsync per write-through
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._prefixes: Optional[Dict[str, List[str]]] = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _indexed_prefixes(self, bucket: str) -> List[str]:
+        # Cached: write-through asks for every object transferred
+        if self._prefixes is None:
+            self._prefixes = {}
+            for b, p in self._db.execute("SELECT bucket, prefix FROM listings"):
+                self._prefixes.setdefault(b, []).append(p)
+        return self._prefixes.get(bucket, [])
+
+    def covers(self, bucket: str, key: str) -> bool:
+        """Whether ``key`` falls under an indexed prefix of ``bucket``."""
+        with self._lock:
+            return any(key.startswith(p) for p in self._indexed_prefixes(bucket))
+
+    def refreshed_at(self, bucket: str, prefix: str = "") -> Optional[float]:
+        """When the most recent full listing covering ``prefix`` was taken, or None."""
+        with self._lock:
+            times = [
+                refreshed
+                for p, refreshed in self._db.execute("SELECT prefix, refreshed FROM listings WHERE bucket = ?", (bucket,))
+                if prefix.startswith(p)
+            ]
+        return max(times) if times else None
+
+    def is_fresh(self, bucket: str, prefix: str = "", ttl: float = INDEX_TTL) -> bool:
+        refreshed = self.refreshed_at(bucket, prefix)
+        return refreshed is not None and refreshed > 0 and time.time() - refreshed <= ttl
+
+    def refresh(self, cos_client, bucket: str, prefix: str = "", list_concurrency: int = 1) -> int:
+        """List ``prefix`` and bring its rows up to date.
+
+        Args:
+            cos_client: COSClient bound to ``bucket``
+            bucket: Bucket name
+            prefix: Key prefix to index ("" for the whole bucket)
+            list_concurrency: Partitions listed at the same time
+
+        Returns:
+            Number of objects listed
+        """
+        stamp = time.time()
+        rows = []
+        count = 0
+        low, high = _prefix_range(prefix)
+
+        def flush():
+            with self._lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO objects (bucket, key, size, etag, mtime, storage_class, seen)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            rows.clear()
+
+        # One transaction for the whole sweep: a listing that fails part way
+        # leaves the previous rows and listing untouched
+        with self._lock:
+            self._db.execute("BEGIN")
+        try:
+            for obj in iter_objects_parallel(cos_client, prefix=prefix, concurrency=list_concurrency, ordered=False):
+                rows.append((
+                    bucket,
+                    obj.get("Key", ""),
+                    int(obj.get("Size", 0) or 0),
+                    str(obj.get("ETag", "")).strip('"') or None,
+                    _parse_mtime(obj.get("LastModified")),
+                    obj.get("StorageClass"),
+                    stamp,
+                ))
+                count += 1
+                if len(rows) >= REFRESH_BATCH:
+                    flush()
+            flush()
+
+            # The listing completed: objects it did not see are gone
+            with self._lock:
+                if high is None:
+                    self._db.execute("DELETE FROM objects WHERE bucket = ? AND key >= ? AND seen < ?", (bucket, low, stamp))
+                else:
+                    self._db.execute(
+                        "DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ? AND seen < ?",
+                        (bucket, low, high, stamp),
+                    )
+                # Narrower listings are superseded by this one
+                self._db.execute(
+                    "DELETE FROM listings WHERE bucket = ? AND substr(prefix, 1, ?) = ?", (bucket, len(prefix), prefix)
+                )
+                self._db.execute("INSERT INTO listings (bucket, prefix, refreshed) VALUES (?, ?, ?)", (bucket, prefix, stamp))
+                self._db.execute("COMMIT")
+                self._prefixes = None
+        except BaseException:
+            with self._lock:
+                self._db.rollback()
+            raise
+        return count
+
+    def iter_objects(self, bucket: str, prefix: str = "", start_after: str = "") -> Iterator[Dict]:
+        """Yield indexed objects under ``prefix`` in key order, shaped like ListObjects entries."""
+        low, high = _prefix_range(prefix)
+        query = "SELECT key, size, etag, mtime, storage_class FROM objects WHERE bucket = ? AND key >= ? AND key > ?"
+        params: list = [bucket, low, start_after]
+        if high is not None:
+            query += " AND key < ?"
+            params.append(high)
+        query += " ORDER BY key"
+        with self._lock:
+            cursor = self._db.execute(query, params)
+            rows = cursor.fetchmany(REFRESH_BATCH)
+        while rows:
+            for row in rows:
+                yield _as_entry(*row)
+            with self._lock:
+                rows = cursor.fetchmany(REFRESH_BATCH)
+
+    def lookup(self, bucket: str, key: str) -> Optional[Dict]:
+        """The indexed entry of one object, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, size, etag, mtime, storage_class FROM objects WHERE bucket = ? AND key = ?", (bucket, key)
+            ).fetchone()
+        return _as_entry(*row) if row else None
+
+    def record_object(
+        self,
+        bucket: str,
+        key: str,
+        size: int,
+        etag: Optional[str] = None,
+        mtime: Optional[float] = None,
+        storage_class: Optional[str] = None,
+    ) -> None:
+        """Write an object this CLI created (or confirmed) through to the index."""
+        if not self.covers(bucket, key):
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO objects (bucket, key, size, etag, mtime, storage_class, seen)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bucket, key, int(size), (etag or "").strip('"') or None, mtime or now, storage_class, now),
+            )
+
+    def record_delete(self, bucket: str, keys: Iterable[str]) -> None:
+        """Remove deleted objects from the index."""
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM objects WHERE bucket = ? AND key = ?", ((bucket, key) for key in keys)
+            )
+
+    def invalidate(self, bucket: str, key: str) -> None:
+        """Mark every listing covering ``key`` stale, e.g. after a change whose result is unknown."""
+        with self._lock:
+            for prefix in self._indexed_prefixes(bucket):
+                if key.startswith(prefix):
+                    self._db.execute(
+                        "UPDATE listings SET refreshed = 0 WHERE bucket = ? AND prefix = ?", (bucket, prefix)
+                    )
+
+    def listings(self, bucket: Optional[str] = None) -> List[IndexedListing]:
+        """Every indexed prefix with its object count and total size."""
+        with self._lock:
+            query = "SELECT bucket, prefix, refreshed FROM listings"
+            params: tuple = ()
+            if bucket:
+                query += " WHERE bucket = ?"
+                params = (bucket,)
+            result = []
+            for b, prefix, refreshed in self._db.execute(query + " ORDER BY bucket, prefix", params).fetchall():
+                low, high = _prefix_range(prefix)
+                where, args = "bucket = ? AND key >= ?", [b, low]
+                if high is not None:
+                    where += " AND key < ?"
+                    args.append(high)
+                objects, size = self._db.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects WHERE {where}", args
+                ).fetchone()
+                result.append(IndexedListing(b, prefix, refreshed, objects, size))
+        return result
+
+    def clear(self, bucket: Optional[str] = None, prefix: str = "") -> None:
+        """Forget a bucket's prefix (and every narrower one), or everything."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            if bucket is None:
+                self._db.execute("DELETE FROM objects")
+                self._db.execute("DELETE FROM listings")
+            else:
+                low, high = _prefix_range(prefix)
+                if high is None:
+                    self._db.execute("DELETE FROM objects WHERE bucket = ? AND key >= ?", (bucket, low))
+                else:
+                    self._db.execute("DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ?", (bucket, low, high))
+                self._db.execute(
+                    "DELETE FROM listings WHERE bucket = ? AND substr(prefix, 1, ?) = ?", (bucket, len(prefix), prefix)
+                )
+            self._db.execute("COMMIT")
+            self._prefixes = None
+
+
+_index: Optional[ListingIndex] = None
+_index_path: Optional[Path] = None
+_index_lock = threading.Lock()
+
+
+def index_path() -> Path:
+    """Where the index lives: the configured path, ``$COS_INDEX_FILE`` or ``~/.cos/index.db``."""
+    if _index_path is not None:
+        return _index_path
+    return Path(os.environ.get(ENV_INDEX_FILE) or INDEX_FILE)
+
+
+def configure_index(path: Optional[Path] = None) -> None:
+    """Use the index at ``path`` from now on (the default location if None)."""
+    global _index, _index_path
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+        _index = None
+        _index_path = Path(path) if path is not None else None
+
+
+def get_listing_index(create: bool = False) -> Optional[ListingIndex]:
+    """Return the process-wide index.
+
+    Args:
+        create: Create the database if it does not exist yet
+
+    Returns:
+        The index, or None if there is none and ``create`` is False
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = index_path()
+            if not create and not path.exists():
+                return None
+            try:
+                _index = ListingIndex(path)
+            except sqlite3.Error as e:
+                if create:
+                    raise COSError(f"Cannot open listing index {path}: {e}")
+                return None
+        return _index
+
+
+def record_upload(bucket: str, key: str, size: int, etag: Optional[str] = None) -> None:
+    """Write an object this CLI just created through to the index, if there is one.
+
+    Never raises: a failed index update must not fail the transfer. The
+    covering listing is marked stale instead so it is listed again.
+    """
+    index = get_listing_index()
+    if index is None:
+        return
+    try:
+        index.record_object(bucket, key, size, etag)
+    except sqlite3.Error:
+        _invalidate_quietly(index, bucket, key)
+
+
+def record_copy(source_bucket: str, source_key: str, dest_bucket: str, dest_key: str, etag: Optional[str] = None) -> None:
+    """Write a server-side copy through to the index, sized from the source's row."""
+    index = get_listing_index()
+    if index is None or not index.covers(dest_bucket, dest_key):
+        return
+    try:
+        source = index.lookup(source_bucket, source_key)
+        if source is None:
+            # The size of the copy is unknown: list the prefix again next time
+            index.invalidate(dest_bucket, dest_key)
+        else:
+            index.record_object(dest_bucket, dest_key, source["Size"], etag or source["ETag"], storage_class=source.get("StorageClass"))
+    except sqlite3.Error:
+        _invalidate_quietly(index, dest_bucket, dest_key)
+
+
+def record_delete(bucket: str, keys: Iterable[str]) -> None:
+    """Remove objects this CLI deleted from the index, if there is one."""
+    index = get_listing_index()
+    if index is None:
+        return
+    keys = list(keys)
+    try:
+        index.record_delete(bucket, keys)
+    except sqlite3.Error:
+        for key in keys:
+            _invalidate_quietly(index, bucket, key)
+
+
+def _invalidate_quietly(index: ListingIndex, bucket: str, key: str) -> None:
+    try:
+        index.invalidate(bucket, key)
+    except sqlite3.Error:
+        pass
+
+
+def indexed_objects(
+    cos_client,
+    bucket: str,
+    prefix: str = "",
+    ttl: float = INDEX_TTL,
+    list_concurrency: int = 1,
+    start_after: str = "",
+) -> Iterator[Dict]:
+    """Objects under ``prefix`` from the index, refreshing it first if stale.
+
+    Args:
+        cos_client: COSClient bound to ``bucket``, used to refresh
+        bucket: Bucket name
+        prefix: Key prefix
+        ttl: Seconds an indexed listing is trusted
+        list_concurrency: Partitions listed at the same time when refreshing
+        start_after: Yield only keys after this one
+
+    Returns:
+        Iterator of ListObjects-shaped entries in key order
+    """
+    index = get_listing_index(create=True)
+    if not index.is_fresh(bucket, prefix, ttl):
+        index.refresh(cos_client, bucket, prefix, list_concurrency)
+    return index.iter_objects(bucket, prefix, start_after)
+
+
+def confirm_object(cos_client, key: str, bucket: Optional[str] = None) -> Optional[Dict]:
+    """HEAD an object planned from the index and update its row.
+
+    Args:
+        cos_client: COSClient bound to the bucket
+        key: Object key
+        bucket: Bucket name (the client's default if None)
+
+    Returns:
+        The object's current entry, or None if it no longer exists
+    """
+    bucket = bucket or cos_client.bucket
+    try:
+        headers = cos_client.head_object(key, bucket=bucket)
+    except ObjectNotFoundError:
+        record_delete(bucket, [key])
+        return None
+    size = get_content_length(headers)
+    etag = str(headers.get("ETag", "") or "").strip('"') or None
+    mtime = _parse_mtime(headers.get("Last-Modified"))
+    storage_class = headers.get("x-cos-storage-class") or "STANDARD"
+    index = get_listing_index()
+    if index is not None:
+        try:
+            index.record_object(bucket, key, size, etag, mtime, storage_class)
+        except sqlite3.Error:
+            pass
+    return _as_entry(key, size, etag, mtime, storage_class)
+
+
+def confirm_objects(cos_client, objects: Iterable[Dict], min_size: int, bucket: Optional[str] = None) -> List[Dict]:
+    """Confirm with HEAD the indexed objects whose size plans a multipart transfer.
+
+    Smaller objects are passed through unchanged; confirmed objects carry
+    their current size, and objects that no longer exist are dropped.
+    """
+    confirmed = []
+    for obj in objects:
+        if int(obj.get("Size", 0) or 0) >= min_size:
+            obj = confirm_object(cos_client, obj.get("Key", ""), bucket)
+            if obj is None:
+                continue
+        confirmed.append(obj)
+    return confirmed
@@ -0,0 +1,358 @@
+"""Paginated object listing.
+
+``ListObjects`` returns at most 1000 keys per request and sets
+``IsTruncated`` when more remain. ``iter_objects`` follows the marker one
+page at a time and yields entries as they arrive, so callers that stream
+(``ls``, ``rm -r``, ``rb --force``) hold one page in memory however many
+objects the prefix holds.
+
+Entries are object dicts as returned by COS (``Key``, ``Size``,
+``LastModified``, ``ETag``, ...) and, when listing with a delimiter,
+``{"Prefix": ...}`` dicts for common prefixes, merged in key order.
+
+``encode_token``/``decode_token`` wrap a marker into the opaque
+``--starting-token`` cursor printed by ``ls --max-items``.
+
+A single marker chain is serial: one round trip per 1000 keys.
+``iter_objects_parallel`` (``--list-concurrency``) first discovers the
+shape of the keyspace with delimiter listings, descending through single
+"directories", and splits it into disjoint partitions: one per common
+prefix, or key ranges between character boundaries where a level is flat
+or has fewer prefixes than workers. Partitions are listed concurrently and
+read back either in key order (each partition buffers a few pages ahead)
+or in whatever order pages arrive.
+"""
+
+import base64
+import heapq
+import json
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .constants import LIST_PAGE_SIZE, LIST_PARTITIONS_PER_WORKER, LIST_PREFETCH_PAGES
+from .exceptions import COSError
+
+# Characters keys most often continue with, in ASCII order; range boundaries
+# are spread over them. Keys with other characters still fall in some range.
+SPLIT_ALPHABET = "-./0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+MAX_DISCOVERY_DEPTH = 4
+
+
+def _as_list(value: Any) -> List[Dict]:
+    """A single XML element is parsed as a dict, several as a list."""
+    if not value:
+        return []
+    if isinstance(value, dict):
+        return [value]
+    return list(value)
+
+
+def _is_truncated(response: Dict) -> bool:
+    return str(response.get("IsTruncated", "")).lower() == "true"
+
+
+def entry_key(entry: Dict) -> str:
+    """Key of an object entry, or the prefix of a common-prefix entry."""
+    return entry.get("Key", entry.get("Prefix", ""))
+
+
+def iter_objects(
+    cos_client,
+    prefix: str = "",
+    delimiter: str = "",
+    page_size: int = LIST_PAGE_SIZE,
+    start_after: str = "",
+    bucket: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Yield every object (and common prefix) under ``prefix``, page by page.
+
+    Args:
+        cos_client: COSClient (or anything with its ``list_objects``)
+        prefix: Key prefix to list
+        delimiter: Group keys by this delimiter ("" lists recursively)
+        page_size: Keys requested per page (service maximum 1000)
+        start_after: List only keys after this one
+        bucket: Bucket to list (the client's default if None)
+
+    Yields:
+        Object dicts, and ``{"Prefix": p}`` for common prefixes, in key order
+    """
+    marker = start_after
+    last = start_after
+    last_prefix = ""
+    while True:
+        kwargs = dict(prefix=prefix, delimiter=delimiter, max_keys=max(1, min(int(page_size), LIST_PAGE_SIZE)))
+        if bucket:
+            kwargs["bucket"] = bucket
+        if marker:
+            kwargs["marker"] = marker
+        response = cos_client.list_objects(**kwargs) or {}
+
+        contents = _as_list(response.get("Contents"))
+        prefixes = [{"Prefix": p.get("Prefix", "")} for p in _as_list(response.get("CommonPrefixes"))]
+        for entry in heapq.merge(contents, prefixes, key=entry_key):
+            key = entry_key(entry)
+            # Entries up to the marker, or under a prefix already yielded, were seen before
+            if (marker and key <= marker) or (last_prefix and key.startswith(last_prefix)):
+                continue
+            last = key
+            last_prefix = key if "Prefix" in entry else ""
+            yield entry
+
+        if not _is_truncated(response):
+            return
+        next_marker = response.get("NextMarker") or last
+        if not next_marker or next_marker == marker:
+            # The service did not advance; stop rather than loop forever
+            return
+        marker = next_marker
+
+
+def encode_token(marker: str) -> str:
+    """Wrap a listing marker into an opaque ``--starting-token``."""
+    payload = json.dumps({"marker": marker}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_token(token: str) -> str:
+    """Return the marker held by a ``--starting-token``.
+
+    Raises:
+        COSError: If the token was not produced by ``encode_token``
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return str(payload["marker"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise COSError(f"Invalid starting token: {token}") from e
+
+
+class ListPartition(NamedTuple):
+    """Keys under ``prefix`` after ``start_after`` and up to ``end`` (inclusive, None for no bound)."""
+
+    prefix: str
+    start_after: str = ""
+    end: Optional[str] = None
+
+
+def split_partition(partition: ListPartition, parts: int) -> List[ListPartition]:
+    """Split a partition into ``parts`` key ranges on the character after its prefix.
+
+    The ranges are disjoint, in key order and together cover the partition.
+    """
+    base = partition.prefix
+    lower, upper = partition.start_after, partition.end
+    boundaries = []
+    for i in range(1, max(1, parts)):
+        boundary = base + SPLIT_ALPHABET[i * len(SPLIT_ALPHABET) // parts]
+        if boundary > lower and (upper is None or boundary < upper) and boundary not in boundaries:
+            boundaries.append(boundary)
+    edges = [lower] + boundaries + [upper]
+    return [ListPartition(base, edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+
+def iter_partition(
+    cos_client,
+    partition: ListPartition,
+    page_size: int = LIST_PAGE_SIZE,
+    bucket: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Yield the objects of one partition, in key order."""
+    entries = iter_objects(
+        cos_client, prefix=partition.prefix, page_size=page_size,
+        start_after=partition.start_after, bucket=bucket,
+    )
+    for entry in entries:
+        if partition.end is not None and entry_key(entry) > partition.end:
+            entries.close()
+            return
+        yield entry
+
+
+def discover_partitions(
+    cos_client,
+    prefix: str = "",
+    want: int = 1,
+    bucket: Optional[str] = None,
+) -> Tuple[List[ListPartition], List[Dict]]:
+    """Split the keys under ``prefix`` into about ``want`` partitions.
+
+    Delimiter listings descend through levels holding a single common
+    prefix. At the first level with several prefixes, each becomes a
+    partition (split further on key characters if there are fewer than
+    ``want``); a level too large for one page is split on key characters.
+
+    Returns:
+        Partitions in key order, and the objects found directly on the
+        levels that were descended through (already listed, in key order)
+    """
+    loose: List[Dict] = []
+    level = prefix
+    for _ in range(MAX_DISCOVERY_DEPTH):
+        kwargs = dict(prefix=level, delimiter="/", max_keys=LIST_PAGE_SIZE)
+        if bucket:
+            kwargs["bucket"] = bucket
+        response = cos_client.list_objects(**kwargs) or {}
+        if _is_truncated(response):
+            break
+        prefixes = sorted(p.get("Prefix", "") for p in _as_list(response.get("CommonPrefixes")))
+        loose.extend(_as_list(response.get("Contents")))
+        if len(prefixes) == 1:
+            level = prefixes[0]
+            continue
+        per_prefix = -(-want // len(prefixes)) if prefixes else 1
+        partitions = []
+        for p in prefixes:
+            partitions.extend(split_partition(ListPartition(p), per_prefix))
+        return partitions, sorted(loose, key=entry_key)
+    # A flat or very wide level: everything under it, in key ranges
+    return split_partition(ListPartition(level), want), sorted(loose, key=entry_key)
+
+
+class _Failure(NamedTuple):
+    error: BaseException
+
+
+_DONE = object()
+
+
+def _list_concurrently(
+    cos_client,
+    partitions: List[ListPartition],
+    concurrency: int,
+    ordered: bool,
+    page_size: int,
+    bucket: Optional[str],
+) -> Iterator[Dict]:
+    """List partitions on ``concurrency`` threads and yield their objects.
+
+    Workers hand over pages through bounded queues, so at most
+    ``LIST_PREFETCH_PAGES`` pages per partition (per worker when unordered)
+    wait to be read. Closing the iterator stops the workers.
+    """
+    stop = threading.Event()
+    pending: "queue.Queue[Tuple[int, ListPartition]]" = queue.Queue()
+    for item in enumerate(partitions):
+        pending.put(item)
+    if ordered:
+        outputs = [queue.Queue(maxsize=LIST_PREFETCH_PAGES) for _ in partitions]
+    else:
+        shared = queue.Queue(maxsize=LIST_PREFETCH_PAGES * concurrency)
+        outputs = [shared] * len(partitions)
+
+    def hand_over(out: queue.Queue, item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker() -> None:
+        # Partitions are taken in order, so the one being read is always in progress
+        while not stop.is_set():
+            try:
+                index, partition = pending.get_nowait()
+            except queue.Empty:
+                return
+            out = outputs[index]
+            try:
+                page: List[Dict] = []
+                for entry in iter_partition(cos_client, partition, page_size, bucket):
+                    page.append(entry)
+                    if len(page) >= page_size:
+                        if not hand_over(out, page):
+                            return
+                        page = []
+                if page and not hand_over(out, page):
+                    return
+                item = _DONE
+            except BaseException as e:  # handed to the reader
+                item = _Failure(e)
+            if not hand_over(out, item):
+                return
+
+    threads = [
+        threading.Thread(target=worker, name=f"cos-list-{i}", daemon=True)
+        for i in range(min(concurrency, len(partitions)))
+    ]
+    for thread in threads:
+        thread.start()
+    def drain(out: queue.Queue, producers: int) -> Iterator[Dict]:
+        finished = 0
+        while finished < producers:
+            item = out.get()
+            if item is _DONE:
+                finished += 1
+            elif isinstance(item, _Failure):
+                raise item.error
+            else:
+                yield from item
+
+    try:
+        if ordered:
+            for out in outputs:
+                yield from drain(out, 1)
+        else:
+            yield from drain(shared, len(partitions))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def iter_objects_parallel(
+    cos_client,
+    prefix: str = "",
+    concurrency: int = 1,
+    ordered: bool = True,
+    page_size: int = LIST_PAGE_SIZE,
+    start_after: str = "",
+    bucket: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Yield every object under ``prefix``, listing partitions concurrently.
+
+    With ``concurrency`` 1 this is ``iter_objects`` (recursive, no delimiter).
+
+    Args:
+        cos_client: COSClient (or anything with its ``list_objects``)
+        prefix: Key prefix to list
+        concurrency: Partitions listed at the same time
+        ordered: Yield in key order; otherwise pages are yielded as they arrive
+        page_size: Keys requested per page
+        start_after: List only keys after this one
+        bucket: Bucket to list (the client's default if None)
+
+    Yields:
+        Object dicts
+    """
+    if concurrency <= 1:
+        yield from iter_objects(cos_client, prefix=prefix, page_size=page_size, start_after=start_after, bucket=bucket)
+        return
+
+    partitions, loose = discover_partitions(cos_client, prefix, concurrency * LIST_PARTITIONS_PER_WORKER, bucket)
+    if start_after:
+        partitions = [p for p in (_after(p, start_after) for p in partitions) if p is not None]
+        loose = [obj for obj in loose if entry_key(obj) > start_after]
+    listed = _list_concurrently(cos_client, partitions, concurrency, ordered, page_size, bucket)
+    if not loose:
+        yield from listed
+    elif ordered:
+        yield from heapq.merge(loose, listed, key=entry_key)
+    else:
+        yield from loose
+        yield from listed
+
+
+def _after(partition: ListPartition, start_after: str) -> Optional[ListPartition]:
+    """The part of ``partition`` after ``start_after``, or None if nothing is left."""
+    if partition.end is not None and partition.end <= start_after:
+        return None
+    if start_after.startswith(partition.prefix):
+        if start_after > partition.start_after:
+            return partition._replace(start_after=start_after)
+        return partition
+    # Every key under the prefix sorts on the same side of start_after
+    return None if start_after > partition.prefix else partition
@@ -0,0 +1,287 @@
+"""Progress display for transfer commands.
+
+Workers report bytes to a ``TransferMonitor`` through plain attribute
+writes on a per-file record, so the transfer hot path never takes a lock
+or touches ``rich``. A single background thread samples those records at
+a capped rate, redraws one aggregate bar plus sub-bars for the largest
+files in flight, and a throughput summary is printed when the batch ends.
+"""
+
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    BarColumn,
+    TaskProgressColumn,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
+
+from .connections import connection_stats
+from .retry import retry_stats
+from .scheduler import AdaptiveConcurrency
+from .transfer import AggregateProgress
+from .utils import console, format_size, info_message
+
+# Redraws per second; sampling cost is independent of transfer rate
+REFRESH_PER_SECOND = 8
+# Largest in-flight files shown with their own bar
+TOP_FILES = 3
+
+
+class _FileState:
+    __slots__ = ("label", "size", "done", "active")
+
+    def __init__(self, label: str, size: int):
+        self.label = label
+        self.size = size
+        self.done = 0
+        self.active = False
+
+
+class TransferMonitor(AggregateProgress):
+    """Byte-accurate progress for a batch of transfers.
+
+    ``callback()`` hands each job a callback that only stores its running
+    total on the job's own record (the first call also registers the
+    record as active). Writes of one file may race harmlessly: the next
+    report or the job's final ``(size, size)`` call corrects them. The
+    sampler folds finished files into a running sum, so each redraw costs
+    time proportional to the files in flight, not the batch size.
+
+    Args:
+        description: Label of the aggregate bar
+        total: Total bytes, or None/0 if unknown
+        total_objects: Number of objects, shown in the label when non-zero
+        top_files: Number of largest in-flight files given their own bar
+        refresh_per_second: Redraw rate cap
+    """
+
+    def __init__(
+        self,
+        description: str,
+        total: Optional[int],
+        total_objects: int = 0,
+        *,
+        top_files: int = TOP_FILES,
+        refresh_per_second: float = REFRESH_PER_SECOND,
+    ):
+        self.description = description
+        self.total = total or 0
+        self.total_objects = total_objects
+        self.completed_objects = 0
+        self.failed_objects = 0
+        self.top_files = max(0, int(top_files))
+        self.interval = 1.0 / max(0.1, refresh_per_second)
+        self.elapsed = 0.0
+        self._tracked = 0
+        self._active: Dict[_FileState, None] = {}
+        self._finished_bytes = 0
+        self._extra = 0
+        self._extra_lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._progress: Optional[Progress] = None
+        self._task = None
+        self._file_tasks: List = []
+        self._slot_files: List[Optional[_FileState]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = time.monotonic()
+
+    # Reporting side
+
+    def callback(self, label: str = "", size: int = 0) -> Callable[[int, int], None]:
+        state = _FileState(label, size)
+        active = self._active
+        self._tracked += 1
+
+        def update(done: int, _total: int) -> None:
+            if done > state.done:
+                state.done = done
+                if not state.active:
+                    state.active = True
+                    active[state] = None
+
+        return update
+
+    def __call__(self, nbytes: int) -> None:
+        """Add a byte increment not tied to a tracked job."""
+        with self._extra_lock:
+            self._extra += nbytes
+
+    def object_done(self, failed: bool = False) -> None:
+        """Count one finished object (called from the scheduling thread)."""
+        self.completed_objects += 1
+        self.failed_objects += int(failed)
+
+    # Sampling side
+
+    def sample(self) -> Tuple[int, List[_FileState]]:
+        """Return bytes transferred so far and the files still in flight."""
+        with self._sample_lock:
+            running = []
+            for state in list(self._active):
+                if state.size and state.done >= state.size:
+                    self._finished_bytes += state.size
+                    del self._active[state]
+                else:
+                    running.append(state)
+            done = self._finished_bytes + sum(state.done for state in running) + self._extra
+        return done, running
+
+    def _label(self) -> str:
+        if not self.total_objects:
+            return self.description
+        label = f"{self.description} {self.completed_objects}/{self.total_objects} objects"
+        if self.failed_objects:
+            label += f" ({self.failed_objects} failed)"
+        return label
+
+    def start(self) -> "TransferMonitor":
+        """Start drawing on the console."""
+        self._started = time.monotonic()
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            auto_refresh=False,
+        )
+        self._progress.start()
+        self._task = self._progress.add_task(self._label(), total=self.total or None)
+        self._file_tasks = [
+            self._progress.add_task("", total=None, visible=False) for _ in range(self.top_files)
+        ]
+        self._slot_files = [None] * len(self._file_tasks)
+        self._thread = threading.Thread(target=self._run, name="cos-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._draw()
+
+    def _draw(self, final: bool = False) -> None:
+        progress = self._progress
+        done, running = self.sample()
+        progress.update(self._task, completed=done, description=self._label())
+        largest: List[_FileState] = []
+        if not final and self._tracked > 1:
+            largest = heapq.nlargest(len(self._file_tasks), running, key=lambda s: s.size)
+        for slot, task in enumerate(self._file_tasks):
+            state = largest[slot] if slot < len(largest) else None
+            if state is None:
+                if self._slot_files[slot] is not None:
+                    progress.update(task, visible=False)
+                    self._slot_files[slot] = None
+                continue
+            if state is not self._slot_files[slot]:
+                # New file in this slot; reset so its speed is its own
+                name = "  " + (state.label.rstrip("/").rsplit("/", 1)[-1] or state.label)
+                progress.reset(
+                    task, total=state.size or None, completed=state.done, description=name, visible=True
+                )
+                self._slot_files[slot] = state
+            else:
+                progress.update(task, completed=state.done)
+        progress.refresh()
+
+    def stop(self) -> None:
+        """Stop drawing, after one final redraw."""
+        self.elapsed = time.monotonic() - self._started
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._progress is not None:
+            self._draw(final=True)
+            self._progress.stop()
+
+    def summary(self) -> str:
+        """Describe bytes, objects and average throughput of the batch."""
+        done, _ = self.sample()
+        elapsed = self.elapsed or (time.monotonic() - self._started)
+        rate = done / elapsed if elapsed > 0 else 0.0
+        text = f"{format_size(done)} in {elapsed:.1f}s ({format_size(rate)}/s)"
+        if self.total_objects:
+            text = f"{self.completed_objects - self.failed_objects} objects, " + text
+        return text
+
+
+@contextmanager
+def transfer_progress(
+    description: str,
+    total: Optional[int],
+    enabled: bool = True,
+) -> Iterator[Optional[TransferMonitor]]:
+    """Show byte-based progress for a batch of transfers.
+
+    Args:
+        description: Bar label
+        total: Total bytes, or None/0 for an indeterminate bar
+        enabled: When False nothing is displayed and None is yielded
+
+    Yields:
+        ``TransferMonitor`` to pass to ``run_transfers`` as ``on_advance``
+        (it also accepts plain byte increments)
+    """
+    with object_progress(description, total or 0, 0, enabled) as monitor:
+        yield monitor
+
+
+@contextmanager
+def object_progress(
+    description: str,
+    total_bytes: int,
+    total_objects: int,
+    enabled: bool = True,
+) -> Iterator[Optional[TransferMonitor]]:
+    """Show byte-based progress that also counts objects for a batch.
+
+    A throughput summary is printed when the batch finishes without error.
+
+    Args:
+        description: Bar label, followed by the object count
+        total_bytes: Total bytes of all objects
+        total_objects: Number of objects in the batch (0 to omit the count)
+        enabled: When False nothing is displayed and None is yielded
+
+    Yields:
+        ``TransferMonitor``; report finished objects with ``object_done()``
+    """
+    if not enabled:
+        yield None
+        return
+    monitor = TransferMonitor(description, total_bytes, total_objects).start()
+    try:
+        yield monitor
+    finally:
+        monitor.stop()
+    info_message(f"Transferred {monitor.summary()}")
+
+
+def report_transfer_stats(concurrency=None, debug: bool = False) -> None:
+    """Print what the command's retries and adaptive concurrency amounted to.
+
+    Args:
+        concurrency: The command's worker count or ``AdaptiveConcurrency``
+        debug: Also print connection pool reuse
+    """
+    if isinstance(concurrency, AdaptiveConcurrency):
+        info_message(concurrency.describe())
+    summary = retry_stats().summary()
+    if summary:
+        info_message(summary)
+    if debug:
+        summary = connection_stats().summary()
+        if summary:
+            info_message(summary)
@@ -0,0 +1,302 @@
+"""Retry policy shared by every COS request.
+
+Errors are classified as throttling, transient or fatal. Fatal errors
+(missing keys, denied access, bad arguments, local file errors) are raised
+at once; the others are retried with full-jitter exponential backoff.
+Every retry is paid for from one process-wide ``RetryBudget``, refilled by
+successful requests and slowly over time, so when an endpoint is failing
+the workers stop retrying together instead of piling onto it. Retries are
+counted in ``RetryStats`` for the command summary.
+"""
+
+import errno
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from qcloud_cos.cos_exception import CosServiceError, CosClientError
+from requests.exceptions import RequestException
+
+from .exceptions import ChecksumError, COSError, NetworkError
+from .scheduler import report_task_error
+
+THROTTLE = "throttle"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+# Service error codes that ask the client to slow down
+THROTTLE_CODES = {"SlowDown", "RequestLimitExceeded", "TooManyRequests"}
+# Service error codes worth another attempt
+TRANSIENT_CODES = {"InternalError", "ServiceUnavailable", "RequestTimeout"}
+# Service error codes a retry cannot fix, whatever their status; a skewed
+# clock signs every retry with the same bad time
+FATAL_CODES = {"RequestTimeTooSkewed"}
+# Local conditions a retry cannot fix
+FATAL_ERRNOS = {errno.ENOSPC, errno.EROFS, errno.EDQUOT, errno.EACCES, errno.EPERM}
+
+T = TypeVar("T")
+
+
+def classify_error(exc: BaseException) -> str:
+    """Classify an error as ``THROTTLE``, ``TRANSIENT`` or ``FATAL``.
+
+    Errors not recognised as fatal are treated as transient, so unexpected
+    network failures are retried. A checksum mismatch is transient: the
+    request that carried the data is sent again.
+
+    Args:
+        exc: Error raised by a request or transfer step
+
+    Returns:
+        One of the module's classification constants
+    """
+    if isinstance(exc, CosServiceError):
+        try:
+            status = int(exc.get_status_code() or 0)
+        except (TypeError, ValueError):
+            status = 0
+        code = str(exc.get_error_code() or "")
+        if code in FATAL_CODES:
+            return FATAL
+        if status in (429, 503) or code in THROTTLE_CODES:
+            return THROTTLE
+        if status >= 500 or status == 408 or code in TRANSIENT_CODES:
+            return TRANSIENT
+        return FATAL
+    if isinstance(exc, (CosClientError, RequestException, NetworkError, ChecksumError)):
+        return TRANSIENT
+    if isinstance(exc, COSError):
+        return FATAL
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return TRANSIENT
+    if isinstance(exc, (FileNotFoundError, FileExistsError, IsADirectoryError, NotADirectoryError, PermissionError)):
+        return FATAL
+    if isinstance(exc, OSError):
+        return FATAL if exc.errno in FATAL_ERRNOS else TRANSIENT
+    if isinstance(exc, (ValueError, TypeError, KeyError, AttributeError, NotImplementedError, AssertionError)):
+        return FATAL
+    return TRANSIENT
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Return True if ``exc`` is the service asking clients to slow down."""
+    return classify_error(exc) == THROTTLE
+
+
+class RetryBudget:
+    """Process-wide allowance of retries shared by all workers.
+
+    Holds up to ``capacity`` tokens and starts full. Each retry costs one
+    token; each successful request earns ``ratio`` of one, and tokens also
+    trickle back at ``per_second``. With the budget empty, failures are
+    raised instead of retried.
+
+    Args:
+        capacity: Most retries that can be banked
+        ratio: Tokens earned per successful request
+        per_second: Tokens regained per second regardless of traffic
+    """
+
+    def __init__(self, capacity: float = 50, ratio: float = 0.1, per_second: float = 1.0):
+        self.capacity = float(capacity)
+        self.ratio = ratio
+        self.per_second = per_second
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        # Caller holds ``_lock``
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.per_second)
+        self._last = now
+
+    def deposit(self) -> None:
+        """Credit one successful request."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryStats:
+    """Thread-safe counters of retries, for the command summary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries: Dict[str, int] = {THROTTLE: 0, TRANSIENT: 0}
+        self.budget_exhausted = 0
+        self.gave_up = 0
+
+    def record_retry(self, kind: str) -> None:
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def record_exhausted(self) -> None:
+        with self._lock:
+            self.budget_exhausted += 1
+
+    def record_gave_up(self) -> None:
+        with self._lock:
+            self.gave_up += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.retries.values())
+
+    def summary(self) -> Optional[str]:
+        """Describe the retries made, or None if there were none."""
+        if not self.total and not self.budget_exhausted and not self.gave_up:
+            return None
+        text = (
+            f"Retried {self.total} request(s): {self.retries.get(THROTTLE, 0)} throttled, "
+            f"{self.retries.get(TRANSIENT, 0)} transient"
+        )
+        if self.gave_up:
+            text += f"; {self.gave_up} gave up after retries"
+        if self.budget_exhausted:
+            text += f"; retry budget exhausted {self.budget_exhausted} time(s)"
+        return text
+
+
+class RetryPolicy:
+    """Run a request, retrying retryable errors with full-jitter backoff.
+
+    Args:
+        max_retries: Retries after the first attempt
+        backoff: Base delay in seconds; attempt ``n`` waits a random time
+            up to ``min(backoff_max, backoff * 2**n)``
+        backoff_max: Cap on the delay
+        budget: Shared retry budget (process-wide if None)
+        stats: Shared retry counters (process-wide if None)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 5.0,
+        *,
+        budget: Optional[RetryBudget] = None,
+        stats: Optional[RetryStats] = None,
+        classify: Callable[[BaseException], str] = classify_error,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._budget = budget
+        self._stats = stats
+        self.classify = classify
+
+    @property
+    def budget(self) -> RetryBudget:
+        return self._budget or _state["budget"]
+
+    @property
+    def stats(self) -> RetryStats:
+        return self._stats or _state["stats"]
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number ``attempt`` (from 0)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call ``fn(*args, **kwargs)``, retrying it as the policy allows.
+
+        ``fn`` must be safe to call again after a failure (e.g. rewind a
+        request body first).
+
+        Raises:
+            The last error once it is fatal, retries are used up, or the
+            retry budget is exhausted
+        """
+        attempt = 0
+        while True:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                kind = self.classify(exc)
+                if kind == FATAL:
+                    raise
+                if attempt >= self.max_retries:
+                    self.stats.record_gave_up()
+                    raise
+                if not self.budget.withdraw():
+                    self.stats.record_exhausted()
+                    raise
+                self.stats.record_retry(kind)
+                report_task_error(exc)
+                time.sleep(self.delay(attempt))
+                attempt += 1
+                continue
+            self.budget.deposit()
+            return result
+
+    def call_non_idempotent(self, fn: Callable[..., T], done_codes, *args, **kwargs) -> Optional[T]:
+        """``call`` for a request that cannot simply be repeated.
+
+        If an attempt succeeds on the server but fails on the client (e.g. a
+        read timeout), the retry fails with an error saying the work is
+        already done: ``BucketAlreadyOwnedByYou`` after ``create_bucket``,
+        ``NoSuchBucket`` after ``delete_bucket``, ``NoSuchUpload`` after
+        ``complete_multipart_upload``. Such an error on a retry returns None
+        instead of failing; on the first attempt it is raised as usual.
+
+        Args:
+            fn: The request
+            done_codes: Service error codes that mean an earlier attempt took effect
+        """
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            try:
+                return fn(*args, **kwargs)
+            except CosServiceError as exc:
+                if attempts > 1 and exc.get_error_code() in done_codes:
+                    return None
+                raise
+
+        return self.call(attempt)
+
+
+# Process-wide defaults, replaced per command by ``configure_retries``
+_state = {"budget": RetryBudget(), "stats": RetryStats(), "policy": None}
+
+
+def configure_retries(max_retries: int = 3, backoff: float = 0.5, backoff_max: float = 5.0) -> RetryPolicy:
+    """Set the default policy and start a fresh retry budget and counters.
+
+    Args:
+        max_retries: Retries after the first attempt
+        backoff: Base backoff delay in seconds
+        backoff_max: Cap on the backoff delay
+
+    Returns:
+        The new default policy
+    """
+    _state["budget"] = RetryBudget()
+    _state["stats"] = RetryStats()
+    _state["policy"] = RetryPolicy(max_retries, backoff, backoff_max)
+    return _state["policy"]
+
+
+def default_policy() -> RetryPolicy:
+    """Return the process-wide default policy."""
+    if _state["policy"] is None:
+        _state["policy"] = RetryPolicy()
+    return _state["policy"]
+
+
+def retry_stats() -> RetryStats:
+    """Return the process-wide retry counters."""
+    return _state["stats"]
@@ -0,0 +1,473 @@
+"""Bounded scheduler for file- and part-level transfer tasks.
+
+Every transfer in a command (uploads, downloads, copies) is added to one
+``TransferScheduler`` as a ``TransferJob``. Jobs are split into part
+tasks that all run on the scheduler's single pool of worker threads, so
+concurrency is bounded by one number instead of multiplying per file.
+Jobs are served largest first: a big file starts early and its parts
+spread over every worker, while small files fill in the gaps, which keeps
+one large file from holding up the tail of a batch.
+
+The number of units running at once is either fixed or set by an
+``AdaptiveConcurrency`` controller, which raises it while throughput keeps
+improving and cuts it when the service throttles or latency climbs.
+"""
+
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+
+class TransferJob:
+    """One file-level transfer, run by a ``TransferScheduler``.
+
+    Subclasses override the hooks they need. ``start()`` runs once on a
+    worker (e.g. to initiate a multipart upload); ``tasks()`` then yields
+    zero-argument callables, one per part, which the scheduler pulls
+    lazily as workers free up, so work planned late can use what earlier
+    parts observed; ``finish()`` runs after every task succeeded and
+    ``abort()`` after a failure, once no task of the job is running.
+
+    Attributes:
+        size: Bytes the job transfers; larger jobs are scheduled first
+        label: Short description used in messages
+        progress_update: Optional callback receiving (bytes_done, size)
+    """
+
+    size = 0
+    label = ""
+    progress_update: Optional[Callable[[int, int], None]] = None
+
+    def start(self) -> None:
+        pass
+
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        return iter(())
+
+    def finish(self) -> None:
+        pass
+
+    def abort(self, exc: BaseException) -> None:
+        _ = exc
+
+
+class CallableJob(TransferJob):
+    """A job done in a single request, e.g. a small file or a server-side copy."""
+
+    def __init__(self, fn: Callable[[], object], size: int = 0, label: str = ""):
+        self.fn = fn
+        self.size = size
+        self.label = label
+
+    def start(self) -> None:
+        self.fn()
+        if self.progress_update is not None:
+            self.progress_update(self.size, self.size)
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for how many tasks a ``TransferScheduler`` runs at once.
+
+    The limit starts at ``initial``. At the end of each measurement window
+    it grows by one if aggregate throughput beat the previous window by
+    ``improvement`` and holds otherwise (additive increase). It is
+    multiplied by ``decrease`` (multiplicative decrease) when a throttling
+    error is reported, at most once per window so one burst of errors
+    counts once, or when the window's median task latency exceeds
+    ``latency_factor`` times the best median seen so far.
+
+    ``int()`` of the controller is its current limit, so it can be passed
+    wherever a fixed concurrency is; ``max_workers`` gives the most tasks
+    it can ever run at once.
+
+    Args:
+        initial: Starting limit
+        minimum: Lowest limit
+        maximum: Highest limit (and number of worker threads)
+        interval: Seconds per measurement window
+        is_throttle: Classifies an error as server throttling
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 32,
+        *,
+        interval: float = 2.0,
+        decrease: float = 0.5,
+        improvement: float = 1.05,
+        latency_factor: float = 2.0,
+        is_throttle: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = min(max(int(initial), self.minimum), self.maximum)
+        self.interval = interval
+        self.decrease = decrease
+        self.improvement = improvement
+        self.latency_factor = latency_factor
+        self.is_throttle = is_throttle or (lambda exc: False)
+        self.peak = self.limit
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._latencies: List[float] = []
+        self._window_start = time.monotonic()
+        self._last_cut = float("-inf")
+        self._last_rate: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        # (time, limit) at every change, for the settled value
+        self._history: List[Tuple[float, int]] = [(self._window_start, self.limit)]
+
+    def __int__(self) -> int:
+        return self.limit
+
+    def add_bytes(self, nbytes: int) -> None:
+        """Count bytes moved, for the throughput signal."""
+        with self._lock:
+            self._bytes += nbytes
+
+    def task_done(self, seconds: float, exc: Optional[BaseException] = None) -> None:
+        """Record one finished task; may close the window and adjust the limit."""
+        with self._lock:
+            now = time.monotonic()
+            if exc is not None and self.is_throttle(exc):
+                self._throttle(now)
+            else:
+                self._latencies.append(seconds)
+            if now - self._window_start >= self.interval:
+                self._evaluate(now)
+
+    def report_error(self, exc: BaseException) -> None:
+        """Record a failed attempt that the task itself is about to retry."""
+        if self.is_throttle(exc):
+            with self._lock:
+                self._throttle(time.monotonic())
+
+    def _set_limit(self, limit: int, now: float) -> None:
+        # Caller holds ``_lock``
+        limit = min(max(limit, self.minimum), self.maximum)
+        if limit != self.limit:
+            self.limit = limit
+            self.peak = max(self.peak, limit)
+            self._history.append((now, limit))
+
+    def _throttle(self, now: float) -> None:
+        self.throttled += 1
+        if now - self._last_cut >= self.interval:
+            self._last_cut = now
+            self._set_limit(int(self.limit * self.decrease), now)
+            # Throughput measured before the cut is not comparable
+            self._last_rate = None
+            self._reset_window(now)
+
+    def _reset_window(self, now: float) -> None:
+        self._bytes = 0
+        self._latencies = []
+        self._window_start = now
+
+    def _evaluate(self, now: float) -> None:
+        rate = self._bytes / max(now - self._window_start, 1e-9)
+        latency = statistics.median(self._latencies) if self._latencies else None
+        if latency is not None and (self._best_latency is None or latency < self._best_latency):
+            self._best_latency = latency
+        if (
+            latency is not None
+            and self._best_latency
+            and latency > self._best_latency * self.latency_factor
+            and now - self._last_cut >= self.interval
+        ):
+            self._last_cut = now
+            self._set_limit(int(self.limit * self.decrease), now)
+            self._last_rate = None
+        elif self._last_rate is None or rate > self._last_rate * self.improvement:
+            if self._latencies:
+                self._set_limit(self.limit + 1, now)
+            self._last_rate = rate
+        self._reset_window(now)
+
+    def settled(self) -> int:
+        """Return the limit held for the longest time so far."""
+        with self._lock:
+            history = self._history + [(time.monotonic(), self.limit)]
+        held: dict = {}
+        for (start, limit), (end, _) in zip(history, history[1:]):
+            held[limit] = held.get(limit, 0.0) + (end - start)
+        return max(held, key=held.get) if held else self.limit
+
+    def describe(self) -> str:
+        """One-line summary for command output."""
+        text = f"Concurrency settled at {self.settled()} (peak {self.peak}, final {self.limit})"
+        if self.throttled:
+            text += f"; {self.throttled} throttled request(s)"
+        return text
+
+
+def max_workers(concurrency: Union[int, AdaptiveConcurrency]) -> int:
+    """The most tasks ``concurrency`` can run at once: a controller's maximum, or the count."""
+    if isinstance(concurrency, AdaptiveConcurrency):
+        return concurrency.maximum
+    return max(1, int(concurrency or 1))
+
+
+_current = threading.local()
+
+
+def report_task_error(exc: BaseException) -> None:
+    """Tell the scheduler running the current task that an attempt failed.
+
+    Retry loops inside tasks call this before retrying, so an adaptive
+    scheduler sees throttling that never surfaces as a task failure.
+    Outside a scheduler worker it does nothing.
+    """
+    controller = getattr(_current, "controller", None)
+    if controller is not None:
+        controller.report_error(exc)
+
+
+class _JobState:
+    __slots__ = ("job", "seq", "phase", "iterator", "inflight", "error")
+
+    def __init__(self, job: TransferJob, seq: int):
+        self.job = job
+        self.seq = seq
+        # pending -> starting -> running -> exhausted -> finishing -> done;
+        # failed -> aborting -> aborted; skipped when never started
+        self.phase = "pending"
+        self.iterator: Optional[Iterator[Callable[[], None]]] = None
+        self.inflight = 0
+        self.error: Optional[BaseException] = None
+
+
+_TERMINAL = ("done", "aborted", "skipped")
+
+
+class TransferScheduler:
+    """Run transfer jobs on one bounded pool of worker threads.
+
+    Args:
+        concurrency: Number of worker threads shared by all jobs, or an
+            ``AdaptiveConcurrency`` that sets how many of its ``maximum``
+            workers may run at once
+    """
+
+    def __init__(self, concurrency: Union[int, AdaptiveConcurrency] = 4):
+        self.controller: Optional[AdaptiveConcurrency] = None
+        if isinstance(concurrency, AdaptiveConcurrency):
+            self.controller = concurrency
+            self.concurrency = concurrency.maximum
+        else:
+            self.concurrency = max(1, int(concurrency or 1))
+        self._running = 0
+        self._states: List[_JobState] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._fail_fast = True
+        self._first_error: Optional[BaseException] = None
+        self._done: "queue.Queue[Tuple[TransferJob, Optional[BaseException]]]" = queue.Queue()
+
+    def add(self, job: TransferJob) -> TransferJob:
+        """Queue a job; returns it for convenience."""
+        with self._cond:
+            self._states.append(_JobState(job, len(self._states)))
+        return job
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def run(
+        self,
+        fail_fast: bool = True,
+        on_done: Optional[Callable[[TransferJob, Optional[BaseException]], None]] = None,
+    ) -> List[Tuple[TransferJob, BaseException]]:
+        """Run every queued job and wait for them.
+
+        Args:
+            fail_fast: Stop starting new work after the first failure and
+                raise that error once running tasks have drained
+            on_done: Called in the calling thread as each job ends, with
+                the job and its error (None on success)
+
+        Returns:
+            (job, error) for every job that failed or was skipped
+        """
+        with self._cond:
+            self._fail_fast = fail_fast
+            # Largest first; ties keep submission order
+            self._states.sort(key=lambda s: (-(s.job.size or 0), s.seq))
+            pending = len(self._states)
+            if self.controller is not None:
+                for state in self._states:
+                    self._count_bytes(state.job)
+        workers = [
+            threading.Thread(target=self._worker, name=f"cos-transfer-{i}", daemon=True)
+            for i in range(self.concurrency if pending else 0)
+        ]
+        for t in workers:
+            t.start()
+        failures: List[Tuple[TransferJob, BaseException]] = []
+        try:
+            while pending:
+                job, exc = self._done.get()
+                pending -= 1
+                if exc is not None:
+                    failures.append((job, exc))
+                if on_done is not None:
+                    on_done(job, exc)
+        except BaseException:
+            # Interrupted (e.g. Ctrl-C): stop dispatching; daemon workers
+            # abort their jobs as running tasks drain
+            with self._cond:
+                self._stopping = True
+                self._cond.notify_all()
+            raise
+        for t in workers:
+            t.join()
+        if fail_fast and self._first_error is not None:
+            raise self._first_error
+        return failures
+
+    def _count_bytes(self, job: TransferJob) -> None:
+        """Feed the job's progress into the controller's throughput signal."""
+        inner = job.progress_update
+        controller = self.controller
+        last = [0]
+
+        def update(done: int, total: int) -> None:
+            delta = done - last[0]
+            if delta > 0:
+                last[0] = done
+                controller.add_bytes(delta)
+            if inner is not None:
+                inner(done, total)
+
+        job.progress_update = update
+
+    # Worker side
+
+    def _report(self, state: _JobState, phase: str, exc: Optional[BaseException]) -> None:
+        # Caller holds ``_cond``
+        state.phase = phase
+        self._done.put((state.job, exc))
+        self._cond.notify_all()
+
+    def _pick(self):
+        """Return the next unit of work as (kind, state, task), or None."""
+        for state in self._states:
+            if state.phase in _TERMINAL:
+                continue
+            if state.phase == "failed" and state.inflight == 0:
+                state.phase = "aborting"
+                return "abort", state, None
+            if self._stopping:
+                if state.phase == "pending":
+                    self._report(state, "skipped", CancelledError())
+                elif state.phase == "running" and state.inflight == 0:
+                    try:
+                        next(state.iterator)
+                    except StopIteration:
+                        state.phase = "exhausted"
+                    except Exception:
+                        pass
+                    if state.phase == "running":
+                        state.error = CancelledError()
+                        state.phase = "aborting"
+                        return "abort", state, None
+                if state.phase == "exhausted" and state.inflight == 0:
+                    # Every part is done; completing beats throwing it away
+                    state.phase = "finishing"
+                    return "finish", state, None
+                continue
+            if state.phase == "pending":
+                state.phase = "starting"
+                return "start", state, None
+            if state.phase == "running":
+                try:
+                    task = next(state.iterator)
+                except StopIteration:
+                    state.phase = "exhausted"
+                except Exception as exc:
+                    self._fail(state, exc)
+                    return self._pick()
+                else:
+                    state.inflight += 1
+                    return "task", state, task
+            if state.phase == "exhausted" and state.inflight == 0:
+                state.phase = "finishing"
+                return "finish", state, None
+        return None
+
+    def _fail(self, state: _JobState, exc: BaseException) -> None:
+        # Caller holds ``_cond``
+        if state.error is None:
+            state.error = exc
+        state.phase = "failed"
+        if self._first_error is None:
+            self._first_error = exc
+        if self._fail_fast:
+            self._stopping = True
+        self._cond.notify_all()
+
+    def _worker(self) -> None:
+        _current.controller = self.controller
+        while True:
+            with self._cond:
+                while True:
+                    picked = None
+                    if self.controller is None or self._running < self.controller.limit:
+                        picked = self._pick()
+                    if picked is not None:
+                        break
+                    if all(s.phase in _TERMINAL for s in self._states):
+                        return
+                    self._cond.wait()
+                self._running += 1
+            try:
+                self._run_unit(*picked)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._cond.notify_all()
+
+    def _run_unit(self, kind: str, state: _JobState, task: Optional[Callable[[], None]]) -> None:
+        job = state.job
+        if kind == "abort":
+            try:
+                job.abort(state.error)
+            except Exception:
+                pass
+            with self._cond:
+                self._report(state, "aborted", state.error)
+            return
+        started = time.monotonic()
+        try:
+            if kind == "start":
+                job.start()
+                iterator = iter(job.tasks())
+            elif kind == "task":
+                task()
+            else:
+                job.finish()
+        except BaseException as exc:
+            if self.controller is not None:
+                self.controller.task_done(time.monotonic() - started, exc)
+            with self._cond:
+                if kind == "task":
+                    state.inflight -= 1
+                self._fail(state, exc)
+            return
+        if self.controller is not None:
+            self.controller.task_done(time.monotonic() - started)
+        with self._cond:
+            if kind == "start":
+                state.iterator = iterator
+                if state.phase == "starting":
+                    state.phase = "running"
+            elif kind == "task":
+                state.inflight -= 1
+            else:
+                self._report(state, "done", None)
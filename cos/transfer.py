@@ -1,18 +1,538 @@
 """Streaming transfer utilities for COS CLI.
 
-Provides per-file progress updates for downloads via file-size polling
-and multipart uploads for large files with byte-level progress updates.
+Provides per-file progress updates for downloads via file-size polling,
+parallel multipart uploads and parallel ranged downloads for large files
+with byte-level progress updates. Transfer buffers are borrowed from a
+process-wide ``BufferPool`` so memory stays under one cap however many
+transfers run at once.
 
 These functions are designed to be used by commands without exposing
 low-level SDK details to the rest of the codebase.
 """
 
+import errno
+import functools
+import mmap
+import os
 import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from qcloud_cos.cos_exception import CosServiceError, CosClientError
-from .utils import ResumeTracker
+from .constants import (
+    AUTO_CONCURRENCY_MAX,
+    AUTO_CONCURRENCY_START,
+    CACHE_POLICIES,
+    DEFAULT_MAX_MEMORY,
+    DELETE_BATCH_SIZE,
+    DOWNLOAD_TEMP_SUFFIX,
+    FSYNC_BATCH_SIZE,
+    FSYNC_MODES,
+    MAX_MULTIPART_PARTS,
+    MAX_PART_SIZE,
+    MIN_PART_SIZE,
+    MULTIPART_CHUNKSIZE,
+    MULTIPART_COPY_CHUNKSIZE,
+    MULTIPART_COPY_THRESHOLD,
+    MULTIPART_THRESHOLD,
+    RESUME_SAVE_INTERVAL,
+    RESUME_SAVE_PARTS,
+    STREAM_PART_SIZE,
+)
+from .checksum import (
+    PartChecksums,
+    StreamDigest,
+    TransferChecksum,
+    check_crc64,
+    header_crc64,
+    inline_crc64,
+    verify_crc64,
+)
+from .exceptions import ChecksumError, COSError
+from .index import record_upload
+from .retry import RetryPolicy, default_policy, is_throttle_error
+from .scheduler import (
+    AdaptiveConcurrency,
+    CallableJob,
+    TransferJob,
+    TransferScheduler,
+    max_workers,
+)
+from .utils import BandwidthThrottle, ResumeTracker
+
+# Size of pooled buffers used to stream part and range bodies
+STREAM_BUFFER_SIZE = 1024 * 1024
+# Target part count for very large objects; fewer, larger requests
+TARGET_PARTS = 1000
+# Per-part durations outside this window make the planner resize parts
+PART_SECONDS_LOW = 2.0
+PART_SECONDS_HIGH = 30.0
+
+
+class BufferPool:
+    """Process-wide pool of reusable fixed-size transfer buffers.
+
+    Buffers are allocated lazily, at most ``max_memory // buffer_size`` of
+    them, and go back on a free list when returned, so buffer memory never
+    exceeds the cap and is not reallocated per part or range. ``acquire()``
+    blocks while every buffer is lent out, which throttles workers instead
+    of growing memory. A worker holds at most one buffer at a time, so
+    waiting for one cannot deadlock.
+    """
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY, buffer_size: int = STREAM_BUFFER_SIZE):
+        self.buffer_size = max(1, int(buffer_size))
+        self.max_memory = max(self.buffer_size, int(max_memory))
+        self.capacity = self.max_memory // self.buffer_size
+        self.allocated = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waits = 0
+        self._free: List[bytearray] = []
+        self._cond = threading.Condition()
+
+    def _available(self) -> bool:
+        return bool(self._free) or self.allocated < self.capacity
+
+    def acquire(self, timeout: Optional[float] = None) -> bytearray:
+        """Borrow a buffer, waiting up to ``timeout`` seconds for one."""
+        with self._cond:
+            if not self._available():
+                self.waits += 1
+                if not self._cond.wait_for(self._available, timeout):
+                    raise TimeoutError("No transfer buffer became available")
+            if self._free:
+                buf = self._free.pop()
+            else:
+                buf = bytearray(self.buffer_size)
+                self.allocated += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            return buf
+
+    def release(self, buf: bytearray) -> None:
+        """Return a buffer obtained from ``acquire()``."""
+        with self._cond:
+            self.in_use -= 1
+            self._free.append(buf)
+            self._cond.notify()
+
+    @contextmanager
+    def borrow(self) -> Iterator[memoryview]:
+        """Borrow a buffer as a ``memoryview`` for the duration of a block."""
+        buf = self.acquire()
+        try:
+            yield memoryview(buf)
+        finally:
+            self.release(buf)
+
+
+_buffer_pool: Optional[BufferPool] = None
+_buffer_pool_lock = threading.Lock()
+
+
+def get_buffer_pool() -> BufferPool:
+    """Return the process-wide buffer pool, creating it with defaults."""
+    global _buffer_pool
+    with _buffer_pool_lock:
+        if _buffer_pool is None:
+            _buffer_pool = BufferPool()
+        return _buffer_pool
+
+
+def configure_buffer_pool(max_memory: Optional[int] = None) -> BufferPool:
+    """Replace the process-wide buffer pool with one capped at ``max_memory``.
+
+    Transfers already running keep the pool they started with.
+
+    Args:
+        max_memory: Cap on buffer memory in bytes (``DEFAULT_MAX_MEMORY`` if None)
+
+    Returns:
+        The new pool
+    """
+    global _buffer_pool
+    with _buffer_pool_lock:
+        _buffer_pool = BufferPool(max_memory or DEFAULT_MAX_MEMORY)
+        return _buffer_pool
+
+
+# Process-wide bandwidth limits shared by every worker; None means unlimited
+_bandwidth: Dict[str, Optional[BandwidthThrottle]] = {"upload": None, "download": None}
+
+
+def configure_bandwidth(upload: Optional[int] = None, download: Optional[int] = None) -> None:
+    """Set the process-wide upload and download rate limits.
+
+    Every transfer started afterwards draws from the same token bucket for
+    its direction, so the limit holds however many workers are running.
+
+    Args:
+        upload: Upload limit in bytes per second (None = unlimited)
+        download: Download limit in bytes per second (None = unlimited)
+    """
+    _bandwidth["upload"] = BandwidthThrottle(upload) if upload else None
+    _bandwidth["download"] = BandwidthThrottle(download) if download else None
+
+
+def get_bandwidth_throttle(direction: str) -> Optional[BandwidthThrottle]:
+    """Return the limiter for "upload" or "download", or None when unlimited."""
+    return _bandwidth.get(direction)
+
+
+# How local file I/O treats the page cache; see configure_cache_policy()
+_cache_policy = "normal"
+
+
+def configure_cache_policy(policy: str = "normal") -> None:
+    """Set the page-cache hints given for local files in transfers.
+
+    - ``normal``: no hints
+    - ``sequential``: upload sources are read ahead (``POSIX_FADV_SEQUENTIAL``,
+      and ``POSIX_FADV_WILLNEED`` for each part as its upload starts)
+    - ``drop``: as ``sequential``, and pages are dropped from the cache
+      (``POSIX_FADV_DONTNEED``) once a part is sent or a range is written,
+      so bulk transfers do not evict other programs' working sets
+
+    Written pages can only be dropped after the kernel writes them back;
+    the hint starts that writeback and a final pass per file drops what
+    has been written by then. Platforms without ``posix_fadvise`` ignore
+    the hints.
+
+    Args:
+        policy: "normal", "sequential" or "drop"
+
+    Raises:
+        COSError: If ``policy`` is not a known policy
+    """
+    global _cache_policy
+    if policy not in CACHE_POLICIES:
+        raise COSError(f"Invalid --cache-policy value: {policy} (expected one of {', '.join(CACHE_POLICIES)})")
+    _cache_policy = policy
+
+
+def get_cache_policy() -> str:
+    """Return the process-wide page-cache policy."""
+    return _cache_policy
+
+
+def _fadvise(fd: int, offset: int, length: int, advice: str) -> None:
+    """``posix_fadvise`` by advice name; a no-op where unsupported."""
+    value = getattr(os, advice, None)
+    if value is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, value)
+    except OSError:
+        pass
+
+
+def _drop_cached(path: Path) -> None:
+    """Drop a whole file's clean pages from the page cache."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fadvise(fd, 0, 0, "POSIX_FADV_DONTNEED")
+    finally:
+        os.close(fd)
+
+
+def download_temp_path(dest_path: Path) -> Path:
+    """Return the hidden sibling file a download of ``dest_path`` is written to."""
+    return dest_path.with_name(f".{dest_path.name}{DOWNLOAD_TEMP_SUFFIX}")
+
+
+def _remove_quietly(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Size ``fd`` to ``size`` bytes and reserve its blocks where supported.
+
+    ``posix_fallocate`` allocates the file in as few extents as the
+    filesystem can manage, so ranges written out of order do not fragment
+    it, and a full disk fails here rather than halfway through. Filesystems
+    without it get a sparse file.
+    """
+    os.ftruncate(fd, size)
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+            raise
+
+
+def _fsync_path(path: Path, directory: bool = False) -> None:
+    flags = (os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)) if directory else os.O_RDONLY
+    try:
+        fd = os.open(str(path), flags)
+    except OSError:
+        if directory:
+            # Directories cannot be opened on some platforms (Windows)
+            return
+        raise
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DownloadCommitter:
+    """Moves finished downloads from their temp file to the destination.
+
+    The rename is atomic, so readers see either the old file or the whole
+    new one. ``mode`` decides what is made durable first:
+
+    - ``none``: rename at once and leave flushing to the OS
+    - ``file``: fsync the file, rename, then fsync its directory
+    - ``batch``: hold finished files until ``batch_size`` are ready (or
+      ``flush()``), fsync them, rename them and fsync each directory once;
+      the files have usually been written back by then, so the syncs are
+      cheap and directory syncs are shared
+
+    Thread-safe.
+    """
+
+    def __init__(self, mode: str = "none", batch_size: int = FSYNC_BATCH_SIZE):
+        if mode not in FSYNC_MODES:
+            raise COSError(f"Invalid --fsync value: {mode} (expected one of {', '.join(FSYNC_MODES)})")
+        self.mode = mode
+        self.batch_size = max(1, int(batch_size))
+        self._pending: List[Tuple[Path, Path]] = []
+        self._lock = threading.Lock()
+
+    def commit(self, temp_path: Path, dest_path: Path) -> None:
+        """Publish a finished download (deferred in ``batch`` mode)."""
+        if self.mode == "batch":
+            with self._lock:
+                self._pending.append((temp_path, dest_path))
+                if len(self._pending) < self.batch_size:
+                    return
+                batch, self._pending = self._pending, []
+            self._publish(batch)
+            return
+        if self.mode == "file":
+            _fsync_path(temp_path)
+        os.replace(temp_path, dest_path)
+        if self.mode == "file":
+            _fsync_path(dest_path.parent, directory=True)
+
+    def flush(self) -> None:
+        """Publish every download still held back by ``batch`` mode."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._publish(batch)
+
+    def _publish(self, batch: List[Tuple[Path, Path]]) -> None:
+        for temp_path, _dest in batch:
+            _fsync_path(temp_path)
+        directories = {}
+        for temp_path, dest_path in batch:
+            os.replace(temp_path, dest_path)
+            directories[str(dest_path.parent)] = dest_path.parent
+        for directory in directories.values():
+            _fsync_path(directory, directory=True)
+
+
+_committer = DownloadCommitter()
+
+
+def configure_fsync(mode: str = "none", batch_size: int = FSYNC_BATCH_SIZE) -> DownloadCommitter:
+    """Set how downloads are made durable before they are renamed into place.
+
+    Files held by the previous committer are published first.
+
+    Args:
+        mode: "none", "file" or "batch"
+        batch_size: Files per batch in "batch" mode
+
+    Returns:
+        The new committer
+
+    Raises:
+        COSError: If ``mode`` is not a known mode
+    """
+    global _committer
+    committer = DownloadCommitter(mode, batch_size)
+    _committer.flush()
+    _committer = committer
+    return committer
+
+
+def get_download_committer() -> DownloadCommitter:
+    """Return the process-wide download committer."""
+    return _committer
+
+
+class ThrottledBody:
+    """Seekable upload body whose reads are paced by a ``BandwidthThrottle``.
+
+    Wraps a part body (a bytes-like view or a file-like reader) so the HTTP
+    stack pulls it in blocks, each taken from the shared token bucket as it
+    is read. Only used when an upload limit is set; unthrottled parts are
+    sent as they are.
+    """
+
+    def __init__(self, body, throttle: BandwidthThrottle):
+        self._body = body
+        self._throttle = throttle
+        self._pos = 0
+        self._length = len(body)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self._length}[whence]
+        self._pos = max(0, min(self._length, base + pos))
+        if hasattr(self._body, "seek"):
+            self._body.seek(self._pos)
+        return self._pos
+
+    def read(self, size: int = -1):
+        if size is None or size < 0:
+            size = self._length - self._pos
+        size = min(size, self._length - self._pos)
+        if size <= 0:
+            return b""
+        if hasattr(self._body, "read"):
+            data = self._body.read(size)
+        else:
+            data = memoryview(self._body)[self._pos: self._pos + size]
+        self._pos += len(data)
+        self._throttle.throttle(len(data))
+        return data
+
+
+def _memory_budget(pool: BufferPool) -> Optional[int]:
+    """Memory the part planner may assume for a transfer using ``pool``.
+
+    The planner keeps in-flight parts within a quarter of this, so capping
+    it at four times the pool limit keeps memory-mapped parts in flight
+    under the same ``--max-memory`` as the pooled buffers.
+    """
+    detected = _available_memory()
+    return min(detected, 4 * pool.max_memory) if detected else 4 * pool.max_memory
+
+
+def _round_mib(size: int) -> int:
+    mib = 1024 * 1024
+    return max(mib, -(-size // mib) * mib)
+
+
+def _available_memory() -> Optional[int]:
+    """Best-effort available physical memory in bytes, or None if unknown."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def plan_part_size(
+    object_size: int,
+    concurrency: int = 4,
+    max_parts: int = MAX_MULTIPART_PARTS,
+    available_memory: Optional[int] = None,
+) -> int:
+    """Choose a part/range size for an object.
+
+    Objects below ``MULTIPART_THRESHOLD`` go in a single part. Otherwise the
+    size starts at ``MULTIPART_CHUNKSIZE``, shrinks (not below 1MB) so every
+    worker has at least two parts, grows so very large objects use about
+    ``TARGET_PARTS`` requests, and is capped so ``2 * concurrency`` parts in
+    flight fit in a quarter of available memory. The service part-count
+    limit always wins over the memory cap.
+
+    Args:
+        object_size: Object size in bytes
+        concurrency: Number of parts transferred in parallel
+        max_parts: Service limit on the number of parts
+        available_memory: Memory budget in bytes (detected when None)
+
+    Returns:
+        Part size in bytes
+    """
+    if object_size < MULTIPART_THRESHOLD:
+        return max(object_size, 1)
+    workers = max(1, int(concurrency or 1))
+    size = min(MULTIPART_CHUNKSIZE, object_size // (2 * workers))
+    size = max(size, -(-object_size // TARGET_PARTS))
+    if available_memory is None:
+        available_memory = _available_memory()
+    if available_memory:
+        size = min(size, available_memory // 4 // (2 * workers))
+    floor = -(-object_size // max_parts)
+    size = max(size, floor, MIN_PART_SIZE)
+    return min(_round_mib(size), MAX_PART_SIZE)
+
+
+class PartSizePlanner:
+    """Hand out part sizes for one multipart transfer, adapting to latency.
+
+    The first size comes from ``plan_part_size`` (or the caller's fixed
+    size). When ``adaptive``, per-part durations fed to ``record()`` double
+    the size while parts finish in under ``PART_SECONDS_LOW`` (request
+    overhead dominates) and halve it when they exceed ``PART_SECONDS_HIGH``.
+    ``next_part_size()`` never returns a size that would leave the rest of
+    the object needing more parts than the service allows.
+    """
+
+    def __init__(
+        self,
+        object_size: int,
+        concurrency: int = 4,
+        part_size: Optional[int] = None,
+        max_parts: int = MAX_MULTIPART_PARTS,
+        available_memory: Optional[int] = None,
+    ):
+        self.adaptive = part_size is None
+        self.max_parts = max_parts
+        workers = max(1, int(concurrency or 1))
+        if available_memory is None:
+            available_memory = _available_memory()
+        self._ceiling = MAX_PART_SIZE
+        if available_memory:
+            self._ceiling = max(MIN_PART_SIZE, min(MAX_PART_SIZE, available_memory // 4 // (2 * workers)))
+        if part_size is None:
+            part_size = plan_part_size(object_size, workers, max_parts, available_memory)
+        self.part_size = max(1, int(part_size))
+        self._avg_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def next_part_size(self, remaining_bytes: int, remaining_parts: int) -> int:
+        """Return the size for the next part given what is left to send."""
+        with self._lock:
+            size = self.part_size
+        floor = -(-remaining_bytes // max(1, remaining_parts))
+        return max(1, min(max(size, floor), remaining_bytes))
+
+    def record(self, nbytes: int, seconds: float) -> None:
+        """Feed the duration of a finished part of ``nbytes`` bytes."""
+        with self._lock:
+            if not self.adaptive or nbytes != self.part_size:
+                # Parts planned before the last resize, or the short trailing
+                # part, say little about the current size
+                return
+            avg = seconds if self._avg_seconds is None else 0.7 * self._avg_seconds + 0.3 * seconds
+            self._avg_seconds = avg
+            if avg < PART_SECONDS_LOW and self.part_size * 2 <= self._ceiling:
+                self.part_size *= 2
+                self._avg_seconds = None
+            elif avg > PART_SECONDS_HIGH and self.part_size // 2 >= MIN_PART_SIZE:
+                self.part_size = _round_mib(self.part_size // 2)
+                self._avg_seconds = None
 
 
 def download_file_with_progress_polling(
@@ -26,6 +546,10 @@ def download_file_with_progress_polling(
 ):
     """Download a file using SDK's download_file while polling local file size.
 
+    The SDK writes to the temp file next to ``dest_path``, which is renamed
+    into place by the process-wide ``DownloadCommitter`` when complete;
+    under ``--fsync batch`` the caller flushes the committer once at the end.
+
     Args:
         client_raw: Authenticated CosS3Client
         bucket: Bucket name
@@ -39,11 +563,13 @@ def download_file_with_progress_polling(
     stop_flag = threading.Event()
     bytes_holder = {"value": 0}
 
+    temp_path = download_temp_path(dest_path)
+
     def poller():
         while not stop_flag.is_set():
             try:
-                if dest_path.exists():
-                    sz = dest_path.stat().st_size
+                if temp_path.exists():
+                    sz = temp_path.stat().st_size
                     bytes_holder["value"] = sz
                     progress_update(sz, total_size)
             except (OSError, PermissionError):
@@ -54,16 +580,574 @@ def download_file_with_progress_polling(
     t = threading.Thread(target=poller, daemon=True)
     t.start()
     try:
-        client_raw.download_file(
+        default_policy().call(
+            client_raw.download_file,
             Bucket=bucket,
             Key=key,
-            DestFilePath=str(dest_path),
+            DestFilePath=str(temp_path),
         )
+        # With --fsync batch the rename waits for the caller's flush
+        get_download_committer().commit(temp_path, dest_path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
     finally:
         stop_flag.set()
         t.join(timeout=1.0)
+    # Ensure final completion
+    progress_update(total_size, total_size)
+
+
+def _complete_upload(
+    retry: RetryPolicy,
+    client_raw,
+    bucket: str,
+    key: str,
+    upload_id: str,
+    etags: Dict[int, str],
+) -> Dict:
+    """Complete a multipart upload and return headers to verify the object with.
+
+    A retry that finds the upload gone (``NoSuchUpload``) means an earlier
+    attempt completed it; the object's HEAD stands in for the lost response.
+    """
+    resp = retry.call_non_idempotent(
+        client_raw.complete_multipart_upload,
+        {"NoSuchUpload"},
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={"Part": [{"PartNumber": pn, "ETag": etags[pn]} for pn in sorted(etags)]},
+    )
+    if resp is None:
+        resp = retry.call(client_raw.head_object, Bucket=bucket, Key=key)
+    return resp
+
+
+def _upload_part_with_retry(
+    client_raw,
+    bucket: str,
+    key: str,
+    upload_id: str,
+    part_number: int,
+    body,
+    retry: RetryPolicy,
+    checksum: Optional[Callable[[], Optional[int]]] = None,
+) -> str:
+    """Upload a single part under ``retry`` and return its ETag.
+
+    ``checksum`` returns the CRC64 of the part as sent (it may be computed
+    while the body is read); a part whose CRC64 the server reports
+    differently is sent again.
+    """
+
+    def put() -> str:
+        if hasattr(body, "seek"):
+            # A streamed body may be partly consumed by a failed attempt
+            body.seek(0)
+        resp = client_raw.upload_part(
+            Bucket=bucket,
+            Key=key,
+            PartNumber=part_number,
+            UploadId=upload_id,
+            Body=body,
+        )
+        if checksum is not None:
+            verify_crc64(resp, checksum(), f"part {part_number} of {key}")
+        return resp.get("ETag")
+
+    return retry.call(put)
+
+
+class MappedPartSource:
+    """Serve upload parts as zero-copy views over a memory-mapped file.
+
+    ``part()`` returns a ``memoryview`` slice of the mapping, so part bodies
+    are never copied into Python ``bytes``. Files that cannot be mapped
+    (empty files, pipes, some network filesystems) fall back to positional
+    reads that return ``bytes``. ``cache_policy`` (see
+    ``configure_cache_policy``) sets the read-ahead and page-cache hints.
+    """
+
+    def __init__(self, path: Path, use_mmap: bool = True, cache_policy: str = "normal"):
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.cache_policy = cache_policy
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        if use_mmap and self.size > 0:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._map = None
+        if cache_policy != "normal":
+            _fadvise(self._file.fileno(), 0, 0, "POSIX_FADV_SEQUENTIAL")
+            if self._map is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+                try:
+                    self._map.madvise(mmap.MADV_SEQUENTIAL)
+                except (OSError, ValueError):
+                    pass
+
+    @property
+    def mapped(self) -> bool:
+        return self._map is not None
+
+    def part(self, offset: int, length: int):
+        """Return ``length`` bytes starting at ``offset``."""
+        if self._map is not None:
+            return memoryview(self._map)[offset:offset + length]
+        if hasattr(os, "pread"):
+            return os.pread(self._file.fileno(), length, offset)
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def readinto(self, offset: int, view: memoryview) -> int:
+        """Read up to ``len(view)`` bytes at ``offset`` into ``view``."""
+        length = max(0, min(len(view), self.size - offset))
+        if self._map is not None:
+            view[:length] = self._map[offset:offset + length]
+            return length
+        if hasattr(os, "preadv"):
+            return os.preadv(self._file.fileno(), [view[:length]], offset)
+        data = self.part(offset, length)
+        view[:len(data)] = data
+        return len(data)
+
+    def prefetch(self, offset: int, length: int) -> None:
+        """Start reading a part into the page cache ahead of its upload."""
+        if self.cache_policy != "normal":
+            _fadvise(self._file.fileno(), offset, length, "POSIX_FADV_WILLNEED")
+
+    def release(self, offset: int, length: int) -> None:
+        """Drop the pages of a sent part from this process's resident set.
+
+        The pages stay in the page cache unless the cache policy is "drop".
+        """
+        if self._map is not None and hasattr(self._map, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+            start = offset - offset % mmap.PAGESIZE
+            try:
+                self._map.madvise(mmap.MADV_DONTNEED, start, offset + length - start)
+            except (OSError, ValueError):
+                pass
+        if self.cache_policy == "drop":
+            _fadvise(self._file.fileno(), offset, length, "POSIX_FADV_DONTNEED")
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A part view is still referenced elsewhere; the mapping is
+                # closed when the last view is garbage collected
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "MappedPartSource":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+class PooledPartReader:
+    """Seekable file-like body for one part, streamed through a pooled buffer.
+
+    Used when a file cannot be mapped: instead of reading the whole part
+    into memory, each ``read()`` fills the borrowed buffer from the file and
+    returns a view of it, so a part costs one pool buffer whatever its size.
+    The SDK and HTTP stack send each block before asking for the next.
+    ``crc`` is the CRC64 of the part once it has been read through from
+    the start, computed on the blocks as they are sent.
+    """
+
+    def __init__(self, source: MappedPartSource, offset: int, length: int, buffer: memoryview):
+        self._source = source
+        self._offset = offset
+        self._length = length
+        self._buffer = buffer
+        self._pos = 0
+        # CRC64 of bytes [0, _crc_pos) of the part
+        self._crc = 0
+        self._crc_pos = 0
+
+    @property
+    def crc(self) -> Optional[int]:
+        return self._crc if self._crc_pos == self._length else None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self._length}[whence]
+        self._pos = max(0, min(self._length, base + pos))
+        if self._pos == 0:
+            self._crc = self._crc_pos = 0
+        return self._pos
+
+    def read(self, size: int = -1):
+        if size is None or size < 0:
+            chunks = []
+            while True:
+                chunk = self.read(len(self._buffer))
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(bytes(chunk))
+        size = min(size, len(self._buffer), self._length - self._pos)
+        if size <= 0:
+            return b""
+        n = self._source.readinto(self._offset + self._pos, self._buffer[:size])
+        if self._pos == self._crc_pos:
+            self._crc = inline_crc64(self._buffer[:n], self._crc)
+            self._crc_pos += n
+        self._pos += n
+        return self._buffer[:n]
+
+
+def _upload_state_id(local_path: Path, bucket: str, key: str) -> str:
+    """Resume-tracker identity for uploading ``local_path`` to ``bucket/key``."""
+    return f"{local_path.resolve()}::cos://{bucket}/{key}"
+
+
+def _encode_layout(sizes: List[int]) -> List[List[int]]:
+    """Run-length encode part sizes as [[size, count], ...]."""
+    runs: List[List[int]] = []
+    for size in sizes:
+        if runs and runs[-1][0] == size:
+            runs[-1][1] += 1
+        else:
+            runs.append([size, 1])
+    return runs
+
+
+def _decode_layout(runs: List[List[int]]) -> List[int]:
+    return [int(size) for size, count in runs for _ in range(int(count))]
+
+
+def _file_identity(local_path: Path) -> Dict[str, int]:
+    st = local_path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def _list_uploaded_parts(client_raw, bucket: str, key: str, upload_id: str) -> Dict[int, Dict]:
+    """Return {PartNumber: part} for every part the server holds for an upload."""
+    parts: Dict[int, Dict] = {}
+    marker = 0
+    while True:
+        resp = default_policy().call(
+            client_raw.list_parts, Bucket=bucket, Key=key, UploadId=upload_id, PartNumberMarker=marker
+        )
+        page = resp.get("Part", []) or []
+        if isinstance(page, dict):
+            page = [page]
+        for part in page:
+            parts[int(part.get("PartNumber"))] = part
+        if str(resp.get("IsTruncated", "false")).lower() != "true":
+            return parts
+        next_marker = int(resp.get("NextPartNumberMarker") or 0)
+        if next_marker <= marker:
+            return parts
+        marker = next_marker
+
+
+def _load_upload_state(
+    client_raw,
+    bucket: str,
+    key: str,
+    local_path: Path,
+    resume_tracker: ResumeTracker,
+) -> Optional[Dict]:
+    """Load saved multipart state and reconcile it with the server.
+
+    The saved state is only used when the local file still has the same
+    size, mtime and inode and the upload still exists on the server. Parts
+    are taken from ``list_parts`` so only parts the server actually holds
+    at the expected size are skipped.
+    """
+    state_id = _upload_state_id(local_path, bucket, key)
+    try:
+        st = resume_tracker.load_progress(state_id, "upload")
+    except Exception:
+        return None
+    data = st.get("data", {}) if st else {}
+    if not isinstance(data, dict) or not data.get("upload_id"):
+        return None
+    identity = _file_identity(local_path)
+    if any(data.get(k) != v for k, v in identity.items()):
+        # File changed since the upload started; the old upload is stale
+        _abort_quietly(client_raw, bucket, key, data["upload_id"])
+        return None
+    total_size = identity["size"]
+    try:
+        if "layout" in data:
+            layout = _decode_layout(data["layout"])
+        else:
+            # Fixed-size state: every part but the last is part_size
+            part_size = int(data["part_size"])
+            layout = [
+                min(part_size, total_size - off) for off in range(0, total_size, part_size)
+            ]
+        server_parts = _list_uploaded_parts(client_raw, bucket, key, data["upload_id"])
+    except (KeyError, TypeError, ValueError, CosServiceError, CosClientError):
+        return None
+    etags: Dict[int, str] = {}
+    for pn, part in server_parts.items():
+        try:
+            if 0 < pn <= len(layout) and int(part.get("Size", -1)) == layout[pn - 1]:
+                etags[pn] = part.get("ETag")
+        except (TypeError, ValueError):
+            continue
+    crcs: Dict[int, int] = {}
+    for pn, crc in (data.get("crcs") or {}).items():
+        try:
+            if int(pn) in etags:
+                crcs[int(pn)] = int(crc)
+        except (TypeError, ValueError):
+            continue
+    return {"upload_id": data["upload_id"], "layout": layout, "etags": etags, "crcs": crcs}
+
+
+def _abort_quietly(client_raw, bucket: str, key: str, upload_id: str) -> None:
+    try:
+        client_raw.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+    except (OSError, CosServiceError, CosClientError):
+        pass
+
+
+def _no_progress(_done: int, _total: int) -> None:
+    return None
+
+
+class MultipartUploadJob(TransferJob):
+    """Multipart upload of one local file as a ``TransferScheduler`` job.
+
+    ``start()`` opens a new upload or resumes a saved one, ``tasks()``
+    yields one task per missing part and ``finish()`` completes the upload.
+    Part sizes are taken from the ``PartSizePlanner`` as the scheduler
+    pulls tasks, so parts planned later see the latency of earlier ones.
+    See ``upload_file_multipart_with_progress`` for the arguments.
+    """
+
+    def __init__(
+        self,
+        client_raw,
+        bucket: str,
+        key: str,
+        local_path: Path,
+        chunk_size: Optional[int] = None,
+        progress_update: Optional[Callable[[int, int], None]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 5.0,
+        concurrency: int = 4,
+        *,
+        resume_tracker: Optional[ResumeTracker] = None,
+        use_mmap: bool = True,
+        buffer_pool: Optional[BufferPool] = None,
+        throttle: Optional[BandwidthThrottle] = None,
+        cache_policy: Optional[str] = None,
+    ):
+        self.client_raw = client_raw
+        self.bucket = bucket
+        self.key = key
+        self.local_path = local_path
+        self.cache_policy = cache_policy or get_cache_policy()
+        self.chunk_size = chunk_size
+        self.progress_update = progress_update or _no_progress
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retry = RetryPolicy(max_retries, retry_backoff, retry_backoff_max)
+        self.concurrency = max(1, int(concurrency or 1))
+        self.resume_tracker = resume_tracker
+        self.use_mmap = use_mmap
+        self.pool = buffer_pool or get_buffer_pool()
+        self.throttle = throttle or get_bandwidth_throttle("upload")
+        self.identity = _file_identity(local_path)
+        self.size = self.identity["size"]
+        self.label = str(local_path)
+        self.upload_id: Optional[str] = None
+        self._state_id = _upload_state_id(local_path, bucket, key)
+        self._layout: List[int] = []
+        self._etags: Dict[int, str] = {}
+        self._crcs: Dict[int, int] = {}
+        self._transferred = 0
+        self.checksum = TransferChecksum()
+        self._source: Optional[MappedPartSource] = None
+        self._planner: Optional[PartSizePlanner] = None
+        self._lock = threading.Lock()
+        # Resume-state writes: serialised, newest wins, rate-limited
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._saved_at = float("-inf")
+        self._state_seq = 0
+        self._written_seq = 0
+
+    def _save_state(self, force: bool = False) -> None:
+        """Write the resume state, unless saved within the last few parts or seconds.
+
+        A state a few parts behind loses nothing: resume takes finished
+        parts from ``list_parts``.
+        """
+        if self.resume_tracker is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._unsaved < RESUME_SAVE_PARTS and now - self._saved_at < RESUME_SAVE_INTERVAL:
+                return
+            self._unsaved = 0
+            self._saved_at = now
+            self._state_seq += 1
+            seq = self._state_seq
+            state = {
+                "upload_id": self.upload_id,
+                "bucket": self.bucket,
+                "key": self.key,
+                "layout": _encode_layout(self._layout),
+                "parts": {str(pn): etag for pn, etag in self._etags.items()},
+                "crcs": {str(pn): crc for pn, crc in self._crcs.items()},
+                **self.identity,
+            }
+        # Written outside ``_lock`` so other parts are not held up by the disk
+        with self._save_lock:
+            if seq < self._written_seq:
+                return
+            self._written_seq = seq
+            try:
+                self.resume_tracker.save_progress(self._state_id, "upload", state)
+            except Exception:
+                pass
+
+    def start(self) -> None:
+        saved = None
+        if self.resume_tracker is not None:
+            saved = _load_upload_state(
+                self.client_raw, self.bucket, self.key, self.local_path, self.resume_tracker
+            )
+        if saved:
+            self.upload_id = saved["upload_id"]
+            self._layout = saved["layout"]
+            self._etags = dict(saved["etags"])
+            self._crcs = dict(saved.get("crcs", {}))
+        else:
+            # Initiate multipart upload
+            resp = self.retry.call(
+                self.client_raw.create_multipart_upload, Bucket=self.bucket, Key=self.key
+            )
+            self.upload_id = resp.get("UploadId")
+        self._planner = PartSizePlanner(
+            self.size, concurrency=self.concurrency, part_size=self.chunk_size,
+            available_memory=_memory_budget(self.pool),
+        )
+        self._source = MappedPartSource(
+            self.local_path, use_mmap=self.use_mmap, cache_policy=self.cache_policy
+        )
+        with self._lock:
+            self._transferred = sum(self._layout[pn - 1] for pn in self._etags)
+        self._save_state(force=True)
+        if self._transferred:
+            self.progress_update(self._transferred, self.size)
+
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        planner = self._planner
+        part_number = 1
+        offset = 0
+        while offset < self.size:
+            if part_number <= len(self._layout):
+                # Layout fixed by a previous run
+                length = self._layout[part_number - 1]
+            else:
+                length = planner.next_part_size(
+                    self.size - offset, planner.max_parts - part_number + 1
+                )
+                with self._lock:
+                    self._layout.append(length)
+            if part_number not in self._etags:
+                # Parts already on the server from a previous run are skipped
+                yield functools.partial(self._upload_part, part_number, offset, length)
+            part_number += 1
+            offset += length
+
+    def _upload_part(self, part_number: int, offset: int, length: int) -> None:
+        source = self._source
+        try:
+            source.prefetch(offset, length)
+            started = time.monotonic()
+            if source.mapped:
+                view = source.part(offset, length)
+                # Hashed from the mapping the part is sent from; no extra file read
+                crc = inline_crc64(view)
+                etag = _upload_part_with_retry(
+                    self.client_raw, self.bucket, self.key, self.upload_id, part_number,
+                    self._paced(view), self.retry, lambda: crc,
+                )
+            else:
+                with self.pool.borrow() as buf:
+                    reader = PooledPartReader(source, offset, length, buf)
+                    etag = _upload_part_with_retry(
+                        self.client_raw, self.bucket, self.key, self.upload_id, part_number,
+                        self._paced(reader), self.retry, lambda: reader.crc,
+                    )
+                    crc = reader.crc
+            self._planner.record(length, time.monotonic() - started)
+            with self._lock:
+                self._etags[part_number] = etag
+                if crc is not None:
+                    self._crcs[part_number] = crc
+                self._transferred += length
+                self._unsaved += 1
+                done = self._transferred
+            self._save_state()
+            self.progress_update(done, self.size)
+        finally:
+            source.release(offset, length)
+
+    def _paced(self, body):
+        return ThrottledBody(body, self.throttle) if self.throttle is not None else body
+
+    def _close_source(self) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def _object_crc(self) -> Optional[int]:
+        offsets, offset = {}, 0
+        for pn, length in enumerate(self._layout, 1):
+            if pn in self._crcs:
+                offsets[offset] = (self._crcs[pn], length)
+            offset += length
+        return PartChecksums(offsets).combined(self.size)
+
+    def finish(self) -> None:
+        self._close_source()
+        # Complete
+        resp = _complete_upload(
+            self.retry, self.client_raw, self.bucket, self.key, self.upload_id, self._etags
+        )
+        crc = self._object_crc()
+        verify_crc64(resp, crc, f"cos://{self.bucket}/{self.key}")
+        self.checksum = TransferChecksum(crc)
+        record_upload(self.bucket, self.key, self.size, (resp or {}).get("ETag"))
         # Ensure final completion
-        progress_update(total_size, total_size)
+        self.progress_update(self.size, self.size)
+        if self.resume_tracker is not None:
+            try:
+                self.resume_tracker.clear_progress(self._state_id, "upload")
+            except Exception:
+                pass
+
+    def abort(self, exc: BaseException) -> None:
+        self._close_source()
+        # Keep the upload open for a later resume; otherwise abort it,
+        # ignoring abort failures
+        if self.upload_id and self.resume_tracker is None:
+            _abort_quietly(self.client_raw, self.bucket, self.key, self.upload_id)
+        elif self.upload_id:
+            self._save_state(force=True)
 
 
 def upload_file_multipart_with_progress(
@@ -71,79 +1155,392 @@ def upload_file_multipart_with_progress(
     bucket: str,
     key: str,
     local_path: Path,
-    chunk_size: int,
+    chunk_size: Optional[int],
     progress_update: Callable[[int, int], None],
     max_retries: int = 3,
     retry_backoff: float = 0.5,
     retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+    *,
+    resume_tracker: Optional[ResumeTracker] = None,
+    use_mmap: bool = True,
+    buffer_pool: Optional[BufferPool] = None,
 ):
     """Upload a local file using multipart API with byte-level progress.
 
+    Runs a ``MultipartUploadJob`` on its own ``TransferScheduler``, so
+    ``concurrency`` parts are in flight at once; commands moving several
+    files add the jobs to one shared scheduler instead. Part bodies are
+    zero-copy views over a memory-mapped file (see ``MappedPartSource``);
+    files that cannot be mapped are streamed through a buffer borrowed from
+    the process-wide ``BufferPool``. Parts may finish in any order; they
+    are sorted by part number before completion.
+
+    Each part's CRC64 is computed from the bytes as they are sent and
+    checked against the one COS returns for the part; the part CRCs are
+    combined into the object's CRC64 and checked against the completed
+    object, so the file is never read a second time to verify it.
+
+    Part sizes come from a ``PartSizePlanner``: with ``chunk_size=None`` the
+    size is planned from the file size, concurrency and available memory
+    and adapted to observed per-part latency, keeping in-flight parts
+    within the pool's memory cap; a fixed ``chunk_size`` is only raised
+    when needed to stay within the service part-count limit.
+
+    With a ``resume_tracker`` the UploadId, part layout, file identity and
+    completed part ETags are saved as parts finish, and a failed upload is
+    left open instead of aborted. The next call for the same file and
+    destination checks the saved state against ``list_parts`` and uploads
+    only the missing parts.
+
     Args:
         client_raw: Authenticated CosS3Client
         bucket: Bucket name
         key: Object key in COS
         local_path: Local file path
-        chunk_size: Size of each part in bytes (e.g., 8MB)
+        chunk_size: Size of each part in bytes (e.g., 8MB), or None to plan it
         progress_update: Callback receiving (bytes_transferred, total_size)
+        concurrency: Number of parts uploaded in parallel
+        resume_tracker: Optional tracker used to persist and resume state
+        use_mmap: Map the file instead of reading parts into memory
+        buffer_pool: Pool to borrow part buffers from (process-wide if None)
+
+    Returns:
+        ``TransferChecksum`` with the object's CRC64 (None if a part
+        uploaded by an earlier run has no recorded CRC)
+
+    Raises:
+        ChecksumError: If the completed object's CRC64 differs
     """
+    scheduler = TransferScheduler(concurrency)
+    job = scheduler.add(MultipartUploadJob(
+        client_raw, bucket, key, local_path, chunk_size, progress_update,
+        max_retries, retry_backoff, retry_backoff_max, concurrency,
+        resume_tracker=resume_tracker, use_mmap=use_mmap, buffer_pool=buffer_pool,
+    ))
+    scheduler.run()
+    return job.checksum
+
+
+class RangeBitmap:
+    """Bitmap of completed fixed-size ranges, serialisable for resume state."""
+
+    def __init__(self, count: int, data: Optional[bytes] = None):
+        self.count = count
+        size = (count + 7) // 8
+        self._bits = bytearray(data[:size]) if data else bytearray(size)
+        self._bits.extend(b"\x00" * (size - len(self._bits)))
+
+    def set(self, index: int) -> None:
+        self._bits[index >> 3] |= 1 << (index & 7)
+
+    def is_set(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def missing(self) -> List[int]:
+        """Return the indices of ranges that are not yet complete."""
+        return [i for i in range(self.count) if not self.is_set(i)]
+
+    def to_hex(self) -> str:
+        return self._bits.hex()
 
-    total_size = local_path.stat().st_size
-    # Initiate multipart upload
-    resp = client_raw.create_multipart_upload(Bucket=bucket, Key=key)
-    upload_id = resp.get("UploadId")
-    parts: List[Tuple[int, str]] = []  # (PartNumber, ETag)
-    transferred = 0
-    part_number = 1
+    @classmethod
+    def from_hex(cls, count: int, value: str) -> "RangeBitmap":
+        return cls(count, bytes.fromhex(value))
+
+
+def _pwrite(fd: int, data, offset: int, lock: threading.Lock) -> None:
+    """Write ``data`` at ``offset`` without moving a shared file position."""
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    # Platforms without pwrite (Windows): serialise seek+write
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+
+def _readinto(body, view: memoryview) -> int:
+    """Fill ``view`` from a response body, returning the byte count (0 at EOF).
+
+    Uses ``readinto`` on the body or on the SDK's raw stream so data lands
+    in the caller's buffer; other bodies fall back to ``read`` plus a copy.
+    """
+    if hasattr(body, "readinto"):
+        return body.readinto(view) or 0
+    if hasattr(body, "get_raw_stream") and not getattr(body, "_use_encoding", False):
+        raw = body.get_raw_stream()
+        if hasattr(raw, "readinto"):
+            return raw.readinto(view) or 0
+    chunk = body.read(len(view))
+    if not chunk:
+        return 0
+    view[: len(chunk)] = chunk
+    return len(chunk)
+
+
+def _load_download_bitmap(
+    resume_tracker: Optional[ResumeTracker],
+    dest_path: Path,
+    total_size: int,
+    chunk_size: int,
+) -> Tuple[Optional[RangeBitmap], int]:
+    """Load saved range state for ``dest_path``.
+
+    Returns the bitmap (or None) and the chunk size it was recorded with.
+    Legacy state holding only a sequential ``offset`` has no range CRCs
+    and is not resumed from.
+    """
+    if resume_tracker is None:
+        return None, chunk_size
     try:
-        with open(local_path, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                # Retry upload_part with backoff
-                attempt = 0
-                while True:
-                    try:
-                        put = client_raw.upload_part(
-                            Bucket=bucket,
-                            Key=key,
-                            PartNumber=part_number,
-                            UploadId=upload_id,
-                            Body=chunk,
-                        )
-                        break
-                    except (OSError, CosServiceError, CosClientError) as _e:
-                        if attempt >= max_retries:
-                            raise
-                        delay = min(retry_backoff * (2 ** attempt), retry_backoff_max)
-                        time.sleep(delay)
-                        attempt += 1
-                etag = put.get("ETag")
-                parts.append((part_number, etag))
-                transferred += len(chunk)
-                progress_update(transferred, total_size)
-                part_number += 1
-        # Complete
-        client_raw.complete_multipart_upload(
-            Bucket=bucket,
-            Key=key,
-            UploadId=upload_id,
-            MultipartUpload={
-                "Part": [{"PartNumber": pn, "ETag": etag} for pn, etag in parts]
-            },
+        st = resume_tracker.load_progress(str(dest_path), "download")
+    except Exception:
+        return None, chunk_size
+    data = st.get("data", {}) if st else {}
+    if not isinstance(data, dict) or int(data.get("total", total_size)) != total_size:
+        return None, chunk_size
+    if "ranges" not in data:
+        return None, chunk_size
+    try:
+        saved_chunk = int(data.get("chunk_size", chunk_size))
+        count = (total_size + saved_chunk - 1) // saved_chunk
+        return RangeBitmap.from_hex(count, data["ranges"]), saved_chunk
+    except (TypeError, ValueError):
+        return None, chunk_size
+
+
+def _load_range_crcs(
+    resume_tracker: Optional[ResumeTracker],
+    dest_path: Path,
+    bitmap: RangeBitmap,
+) -> Dict[int, int]:
+    """Load the saved CRC64 of each completed range of ``dest_path``."""
+    if resume_tracker is None:
+        return {}
+    try:
+        st = resume_tracker.load_progress(str(dest_path), "download")
+        saved = (st.get("data", {}) if st else {}).get("crcs") or {}
+        return {int(i): int(c) for i, c in saved.items() if bitmap.is_set(int(i))}
+    except Exception:
+        return {}
+
+
+class RangedDownloadJob(TransferJob):
+    """Ranged download of one object as a ``TransferScheduler`` job.
+
+    ``start()`` loads resume state and preallocates the temp file next to
+    the destination, ``tasks()`` yields one task per missing range and
+    ``finish()`` closes the file, clears the resume state and hands the
+    file to the ``DownloadCommitter`` to be renamed into place. See
+    ``download_file_in_ranges_with_progress`` for the arguments.
+    """
+
+    def __init__(
+        self,
+        client_raw,
+        bucket: str,
+        key: str,
+        dest_path: Path,
+        total_size: int,
+        chunk_size: Optional[int] = None,
+        progress_update: Optional[Callable[[int, int], None]] = None,
+        *,
+        resume: bool = True,
+        resume_tracker: Optional[ResumeTracker] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 5.0,
+        concurrency: int = 4,
+        buffer_pool: Optional[BufferPool] = None,
+        throttle: Optional[BandwidthThrottle] = None,
+        committer: Optional[DownloadCommitter] = None,
+        cache_policy: Optional[str] = None,
+    ):
+        self.client_raw = client_raw
+        self.bucket = bucket
+        self.key = key
+        self.dest_path = dest_path
+        self.temp_path = download_temp_path(dest_path)
+        self.committer = committer or get_download_committer()
+        self.cache_policy = cache_policy or get_cache_policy()
+        self.size = total_size
+        self.chunk_size = chunk_size
+        self.progress_update = progress_update or _no_progress
+        self.resume = resume
+        self.resume_tracker = resume_tracker
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retry = RetryPolicy(max_retries, retry_backoff, retry_backoff_max)
+        self.concurrency = max(1, int(concurrency or 1))
+        self.pool = buffer_pool or get_buffer_pool()
+        self.throttle = throttle or get_bandwidth_throttle("download")
+        self.label = f"cos://{bucket}/{key}"
+        self._bitmap: Optional[RangeBitmap] = None
+        self._fd: Optional[int] = None
+        self._transferred = 0
+        self._crcs: Dict[int, int] = {}
+        self._expected_crc: Optional[int] = None
+        self.checksum = TransferChecksum()
+        self._lock = threading.Lock()
+
+    def _range_bounds(self, index: int) -> Tuple[int, int]:
+        start = index * self.chunk_size
+        return start, min(start + self.chunk_size, self.size) - 1
+
+    def start(self) -> None:
+        total_size = self.size
+        dest_path = self.dest_path
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        chunk_size = self.chunk_size
+        if not chunk_size:
+            chunk_size = plan_part_size(
+                total_size, self.concurrency, available_memory=_memory_budget(self.pool)
+            )
+        # Range indices are fixed by the resume bitmap, so ranges are never
+        # resized mid-transfer; the part-count limit keeps the bitmap small
+        chunk_size = max(chunk_size, -(-total_size // MAX_MULTIPART_PARTS))
+        temp_path = self.temp_path
+        bitmap: Optional[RangeBitmap] = None
+        if self.resume and temp_path.exists():
+            # Only ranges recorded in the saved state with their CRC64 are
+            # trusted; the destination itself is never read or moved
+            bitmap, chunk_size = _load_download_bitmap(
+                self.resume_tracker, dest_path, total_size, chunk_size
+            )
+        count = (total_size + chunk_size - 1) // chunk_size
+        if bitmap is not None:
+            self._crcs = _load_range_crcs(self.resume_tracker, dest_path, bitmap)
+        bitmap = RangeBitmap(count)
+        for index in self._crcs:
+            bitmap.set(index)
+        self.chunk_size = chunk_size
+        self._bitmap = bitmap
+        self._transferred = sum(
+            self._range_bounds(i)[1] - self._range_bounds(i)[0] + 1
+            for i in range(count) if bitmap.is_set(i)
         )
-        # Ensure final completion
-        progress_update(total_size, total_size)
-    except (OSError, CosServiceError, CosClientError) as _e:
-        # Attempt to abort only for expected SDK/client errors; ignore abort failures
-        try:
-            client_raw.abort_multipart_upload(
-                Bucket=bucket, Key=key, UploadId=upload_id
+        fresh = not any(bitmap.is_set(i) for i in range(count))
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        if fresh:
+            flags |= os.O_TRUNC
+        self._fd = os.open(str(temp_path), flags, 0o644)
+        # Size the file so every worker can write at its own offset
+        _preallocate(self._fd, total_size)
+
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        for index in self._bitmap.missing():
+            yield functools.partial(self._fetch_range, index)
+
+    def _fetch_range(self, index: int) -> None:
+        # One pooled buffer per range in flight, independent of the part size
+        with self.pool.borrow() as view:
+            self._stream_range(index, view)
+
+    def _stream_range(self, index: int, view: memoryview) -> None:
+        start, end = self._range_bounds(index)
+        # Advance across attempts, so a retry resumes where the last one
+        # stopped: position and CRC64 of the bytes written so far
+        cursor = [start]
+        crc = [0]
+
+        def fetch() -> None:
+            pos = cursor[0]
+            resp = self.client_raw.get_object(
+                Bucket=self.bucket, Key=self.key, Range=f"bytes={pos}-{end}"
             )
-        except (OSError, CosServiceError, CosClientError):
-            pass
-        raise
+            expected = header_crc64(resp)
+            if expected is not None:
+                self._expected_crc = expected
+            body = resp.get("Body")
+            got = 0
+            while pos <= end:
+                if hasattr(body, "read"):
+                    n = _readinto(body, view[: min(len(view), end - pos + 1)])
+                    data = view[:n]
+                else:
+                    # Body already materialised as bytes
+                    data = memoryview(body or b"")[got: got + end - pos + 1]
+                    n = len(data)
+                if not n:
+                    break
+                if self.throttle is not None:
+                    self.throttle.throttle(n)
+                _pwrite(self._fd, data, pos, self._lock)
+                crc[0] = inline_crc64(data, crc[0])
+                pos += n
+                got += n
+                cursor[0] = pos
+                with self._lock:
+                    self._transferred += n
+                    done = self._transferred
+                self.progress_update(done, self.size)
+            if pos <= end:
+                # Empty or truncated body: a failed attempt, never a silent loop
+                raise CosClientError(f"Body ended at byte {pos} of bytes={start}-{end}")
+
+        self.retry.call(fetch)
+        if self.cache_policy == "drop":
+            # Starts writeback of the range; its pages go once they are clean
+            _fadvise(self._fd, start, end - start + 1, "POSIX_FADV_DONTNEED")
+        with self._lock:
+            self._bitmap.set(index)
+            if crc[0] is not None:
+                self._crcs[index] = crc[0]
+            if self.resume and self.resume_tracker is not None:
+                try:
+                    self.resume_tracker.save_progress(
+                        str(self.dest_path),
+                        "download",
+                        {
+                            "total": self.size,
+                            "chunk_size": self.chunk_size,
+                            "ranges": self._bitmap.to_hex(),
+                            "crcs": {str(i): c for i, c in self._crcs.items()},
+                        },
+                    )
+                except Exception:
+                    pass
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def finish(self) -> None:
+        if self.cache_policy == "drop" and self._fd is not None:
+            # Ranges written back since their own hint can be dropped now
+            _fadvise(self._fd, 0, 0, "POSIX_FADV_DONTNEED")
+        self._close()
+        crc = PartChecksums({
+            self._range_bounds(i)[0]: (c, self._range_bounds(i)[1] - self._range_bounds(i)[0] + 1)
+            for i, c in self._crcs.items()
+        }).combined(self.size)
+        # Clear resume tracking on completion; after a mismatch the ranges
+        # on disk must not be resumed from either
+        if self.resume and self.resume_tracker is not None:
+            try:
+                self.resume_tracker.clear_progress(str(self.dest_path), "download")
+            except Exception:
+                pass
+        check_crc64(self._expected_crc, crc, f"cos://{self.bucket}/{self.key}")
+        self.checksum = TransferChecksum(crc)
+        self.committer.commit(self.temp_path, self.dest_path)
+        # Ensure completion
+        self.progress_update(self.size, self.size)
+
+    def abort(self, exc: BaseException) -> None:
+        self._close()
+        # Keep the ranges on disk only while resume state points at them
+        if not self.resume or self.resume_tracker is None or isinstance(exc, ChecksumError):
+            _remove_quietly(self.temp_path)
 
 
 def download_file_in_ranges_with_progress(
@@ -152,7 +1549,7 @@ def download_file_in_ranges_with_progress(
     key: str,
     dest_path: Path,
     total_size: int,
-    chunk_size: int,
+    chunk_size: Optional[int],
     progress_update: Callable[[int, int], None],
     *,
     resume: bool = True,
@@ -160,8 +1557,28 @@ def download_file_in_ranges_with_progress(
     max_retries: int = 3,
     retry_backoff: float = 0.5,
     retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+    buffer_pool: Optional[BufferPool] = None,
 ):
-    """Download a file via ranged GET requests with byte-level progress.
+    """Download a file via parallel ranged GET requests with byte-level progress.
+
+    Runs a ``RangedDownloadJob`` on its own ``TransferScheduler``, so
+    ``concurrency`` ranges are in flight at once; commands moving several
+    files add the jobs to one shared scheduler instead. The destination is
+    sized to ``total_size`` up front and each worker streams its range
+    through a buffer borrowed from the process-wide ``BufferPool`` straight
+    to the file at the matching offset, so ranges may complete in any
+    order and memory per worker does not depend on ``chunk_size``.
+    Ranges are written to a preallocated temp file next to ``dest_path``
+    that replaces it atomically once the download is verified.
+    Progress is reported per buffer rather than per range. Completed
+    ranges are recorded as a bitmap in the resume tracker; an interrupted
+    download only fetches the ranges still missing.
+
+    Each range's CRC64 is computed on the buffers as they are written and
+    the range CRCs are combined into the object's CRC64, which is checked
+    against the ``x-cos-hash-crc64ecma`` COS returns; the file is not read
+    back.
 
     Args:
         client_raw: Authenticated CosS3Client
@@ -169,100 +1586,915 @@ def download_file_in_ranges_with_progress(
         key: Object key in COS
         dest_path: Destination local path
         total_size: Expected total size in bytes
-        chunk_size: Size for each range in bytes
+        chunk_size: Size for each range in bytes, or None to plan it with
+            ``plan_part_size``
         progress_update: Callback receiving (bytes_transferred, total_size)
+        concurrency: Number of ranges fetched in parallel
+        buffer_pool: Pool to borrow stream buffers from (process-wide if None)
+
+    Returns:
+        ``TransferChecksum`` with the object's CRC64 (None if a range
+        fetched by an earlier run has no recorded CRC)
+
+    Raises:
+        ChecksumError: If the downloaded data's CRC64 differs
     """
-    transferred = 0
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    # Determine resume offset
-    start = 0
-    if resume:
-        if dest_path.exists():
-            try:
-                fs = dest_path.stat().st_size
-                if 0 < fs < total_size:
-                    start = fs
-            except OSError:
-                start = 0
-        if resume_tracker is not None:
+    scheduler = TransferScheduler(concurrency)
+    job = scheduler.add(RangedDownloadJob(
+        client_raw, bucket, key, dest_path, total_size, chunk_size, progress_update,
+        resume=resume, resume_tracker=resume_tracker, max_retries=max_retries,
+        retry_backoff=retry_backoff, retry_backoff_max=retry_backoff_max,
+        concurrency=concurrency, buffer_pool=buffer_pool,
+    ))
+    try:
+        scheduler.run()
+    finally:
+        job.committer.flush()
+    return job.checksum
+
+
+# Headers of the source object carried over to a multipart copy; upload_part_copy
+# copies bytes only
+_COPY_HEADERS = {
+    "content-type": "ContentType",
+    "cache-control": "CacheControl",
+    "content-disposition": "ContentDisposition",
+    "content-encoding": "ContentEncoding",
+    "content-language": "ContentLanguage",
+    "expires": "Expires",
+}
+
+
+def plan_copy_part_size(object_size: int, concurrency: int = 4) -> int:
+    """Choose the part size for a server-side multipart copy.
+
+    No bytes pass through this host, so memory does not matter: parts are
+    ``MULTIPART_COPY_CHUNKSIZE`` unless the object is small enough that
+    every worker would otherwise get fewer than two, and large enough to
+    keep the part count within the service limit.
+
+    Args:
+        object_size: Source object size in bytes
+        concurrency: Number of parts copied in parallel
+
+    Returns:
+        Part size in bytes
+    """
+    workers = max(1, int(concurrency or 1))
+    size = min(MULTIPART_COPY_CHUNKSIZE, object_size // (2 * workers))
+    size = max(size, -(-object_size // MAX_MULTIPART_PARTS), MIN_PART_SIZE)
+    return min(_round_mib(size), MAX_PART_SIZE)
+
+
+def _copy_create_kwargs(head: Optional[Dict]) -> Dict:
+    """Map a HEAD response of the copy source to create_multipart_upload arguments."""
+    kwargs: Dict = {}
+    metadata: Dict[str, str] = {}
+    for name, value in (head or {}).items():
+        lname = str(name).lower()
+        if lname in _COPY_HEADERS:
+            kwargs[_COPY_HEADERS[lname]] = value
+        elif lname.startswith("x-cos-meta-"):
+            metadata[name] = value
+    if metadata:
+        kwargs["Metadata"] = metadata
+    return kwargs
+
+
+class MultipartCopyJob(TransferJob):
+    """Server-side copy of one object with parallel ``upload_part_copy``.
+
+    ``start()`` reads the source's headers and opens a multipart upload on
+    the destination, ``tasks()`` yields one ``upload_part_copy`` per byte
+    range and ``finish()`` completes the upload. Object data never passes
+    through this host, so objects above the single-copy limit copy at
+    service speed. A failed copy aborts the destination upload.
+    """
+
+    def __init__(
+        self,
+        client_raw,
+        source_bucket: str,
+        source_key: str,
+        dest_bucket: str,
+        dest_key: str,
+        size: int,
+        part_size: Optional[int] = None,
+        progress_update: Optional[Callable[[int, int], None]] = None,
+        *,
+        region: Optional[str] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 5.0,
+        concurrency: int = 4,
+    ):
+        self.client_raw = client_raw
+        self.copy_source = {"Bucket": source_bucket, "Key": source_key}
+        if region:
+            self.copy_source["Region"] = region
+        self.dest_bucket = dest_bucket
+        self.dest_key = dest_key
+        self.size = size
+        self.part_size = part_size or plan_copy_part_size(size, concurrency)
+        # Part count limit applies to copies too
+        self.part_size = max(self.part_size, -(-size // MAX_MULTIPART_PARTS))
+        self.progress_update = progress_update or _no_progress
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retry = RetryPolicy(max_retries, retry_backoff, retry_backoff_max)
+        self.label = f"cos://{source_bucket}/{source_key}"
+        self.upload_id: Optional[str] = None
+        self._etags: Dict[int, str] = {}
+        self._source_crc: Optional[int] = None
+        self._transferred = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        head = self.retry.call(
+            self.client_raw.head_object,
+            Bucket=self.copy_source["Bucket"],
+            Key=self.copy_source["Key"],
+        )
+        resp = self.retry.call(
+            self.client_raw.create_multipart_upload,
+            Bucket=self.dest_bucket,
+            Key=self.dest_key,
+            **_copy_create_kwargs(head)
+        )
+        self.upload_id = resp.get("UploadId")
+        self._source_crc = header_crc64(head)
+
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        for index, offset in enumerate(range(0, self.size, self.part_size)):
+            end = min(offset + self.part_size, self.size) - 1
+            yield functools.partial(self._copy_part, index + 1, offset, end)
+
+    def _copy_part(self, part_number: int, offset: int, end: int) -> None:
+        resp = self.retry.call(
+            self.client_raw.upload_part_copy,
+            Bucket=self.dest_bucket,
+            Key=self.dest_key,
+            PartNumber=part_number,
+            UploadId=self.upload_id,
+            CopySource=self.copy_source,
+            CopySourceRange=f"bytes={offset}-{end}",
+        )
+        with self._lock:
+            self._etags[part_number] = resp.get("ETag")
+            self._transferred += end - offset + 1
+            done = self._transferred
+        self.progress_update(done, self.size)
+
+    def finish(self) -> None:
+        resp = _complete_upload(
+            self.retry, self.client_raw, self.dest_bucket, self.dest_key, self.upload_id, self._etags
+        )
+        # The copy must hash to what the source does
+        verify_crc64(resp, self._source_crc, f"cos://{self.dest_bucket}/{self.dest_key}")
+        record_upload(self.dest_bucket, self.dest_key, self.size, (resp or {}).get("ETag"))
+        self.progress_update(self.size, self.size)
+
+    def abort(self, exc: BaseException) -> None:
+        if self.upload_id:
+            _abort_quietly(self.client_raw, self.dest_bucket, self.dest_key, self.upload_id)
+
+
+def copy_object_multipart_with_progress(
+    client_raw,
+    source_bucket: str,
+    source_key: str,
+    dest_bucket: str,
+    dest_key: str,
+    size: int,
+    progress_update: Optional[Callable[[int, int], None]] = None,
+    *,
+    part_size: Optional[int] = None,
+    region: Optional[str] = None,
+    max_retries: int = 3,
+    retry_backoff: float = 0.5,
+    retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+):
+    """Copy an object inside COS with parallel ``upload_part_copy`` requests.
+
+    Runs a ``MultipartCopyJob`` on its own ``TransferScheduler``.
+
+    Args:
+        client_raw: Authenticated CosS3Client
+        source_bucket: Source bucket name
+        source_key: Source object key
+        dest_bucket: Destination bucket name
+        dest_key: Destination object key
+        size: Source object size in bytes
+        progress_update: Callback receiving (bytes_copied, size)
+        part_size: Bytes per part, or None to use ``plan_copy_part_size``
+        region: Region of the source bucket (client region if None)
+        concurrency: Number of parts copied in parallel
+    """
+    scheduler = TransferScheduler(concurrency)
+    scheduler.add(MultipartCopyJob(
+        client_raw, source_bucket, source_key, dest_bucket, dest_key, size, part_size,
+        progress_update, region=region, max_retries=max_retries, retry_backoff=retry_backoff,
+        retry_backoff_max=retry_backoff_max, concurrency=concurrency,
+    ))
+    scheduler.run()
+
+
+def _read_full(stream, view: memoryview) -> int:
+    """Fill ``view`` from a pipe or file, stopping early only at EOF."""
+    got = 0
+    while got < len(view):
+        if hasattr(stream, "readinto"):
+            n = stream.readinto(view[got:]) or 0
+        else:
+            chunk = stream.read(len(view) - got)
+            n = len(chunk or b"")
+            view[got: got + n] = chunk or b""
+        if not n:
+            break
+        got += n
+    return got
+
+
+class StreamUploadJob(TransferJob):
+    """Upload of a stream of unknown length (e.g. stdin) as a ``TransferScheduler`` job.
+
+    ``start()`` reads the first part; a stream shorter than one part is
+    sent with a single ``put_object``, otherwise a multipart upload is
+    opened. ``tasks()`` then yields a task per worker slot until the
+    stream ends: each task reads the next part into a buffer from a small
+    ring of part-sized buffers, under a lock so parts keep stream order,
+    and uploads it while other workers read and send the following parts.
+    Memory is the ring, at most ``concurrency + 1`` parts and never more
+    than the process-wide buffer cap. MD5 and CRC64 of the stream are
+    computed as parts are read; each part and the completed object are
+    checked against the CRC64 COS returns, and ``checksum`` holds both.
+
+    Args:
+        client_raw: Authenticated CosS3Client
+        bucket: Bucket name
+        key: Object key in COS
+        stream: Binary file-like object to read until EOF
+        part_size: Part size in bytes (``STREAM_PART_SIZE`` if None); the
+            stream may have at most ``MAX_MULTIPART_PARTS`` parts
+        progress_update: Callback receiving (bytes_transferred, 0)
+        concurrency: Parts uploaded in parallel, or the scheduler's
+            ``AdaptiveConcurrency``; the part ring is sized for its maximum
+        throttle: Upload limiter (process-wide if None)
+    """
+
+    def __init__(
+        self,
+        client_raw,
+        bucket: str,
+        key: str,
+        stream,
+        part_size: Optional[int] = None,
+        progress_update: Optional[Callable[[int, int], None]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 5.0,
+        concurrency: Union[int, AdaptiveConcurrency] = 4,
+        *,
+        throttle: Optional[BandwidthThrottle] = None,
+    ):
+        self.client_raw = client_raw
+        self.bucket = bucket
+        self.key = key
+        self.stream = stream
+        self.part_size = min(max(int(part_size or STREAM_PART_SIZE), MIN_PART_SIZE), MAX_PART_SIZE)
+        self.progress_update = progress_update or _no_progress
+        self.retry = RetryPolicy(max_retries, retry_backoff, retry_backoff_max)
+        self.concurrency = max(1, int(concurrency or 1))
+        self.throttle = throttle or get_bandwidth_throttle("upload")
+        self.pool = BufferPool(
+            min(get_buffer_pool().max_memory, (max_workers(concurrency) + 1) * self.part_size), self.part_size
+        )
+        self.size = 0
+        self.label = "-"
+        self.upload_id: Optional[str] = None
+        self._first: Optional[Tuple[bytearray, int]] = None
+        self._eof = False
+        self._parts = 0
+        self._etags: Dict[int, str] = {}
+        self._digest = StreamDigest()
+        self.checksum = TransferChecksum()
+        self._transferred = 0
+        self._read_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _paced(self, body):
+        return ThrottledBody(body, self.throttle) if self.throttle is not None else body
+
+    def start(self) -> None:
+        buf = self.pool.acquire()
+        n = _read_full(self.stream, memoryview(buf))
+        self._digest.update(memoryview(buf)[:n])
+        if n < self.part_size:
+            # Whole stream fits in one part: a plain PUT
+            self._eof = True
+            crc = self._digest.crc64
             try:
-                st = resume_tracker.load_progress(str(dest_path), "download")
-                if st and isinstance(st.get("data", {}), dict):
-                    off = int(st["data"].get("offset", 0))
-                    if 0 < off < total_size:
-                        start = max(start, off)
-            except Exception:
-                pass
+                self.retry.call(self._put_checked, bytes(memoryview(buf)[:n]), crc)
+            finally:
+                self.pool.release(buf)
+            self.checksum = self._digest.result()
+            if self.throttle is not None:
+                self.throttle.throttle(n)
+            self._transferred = n
+            self.progress_update(n, 0)
+            return
+        self._first = (buf, n)
+        resp = self.retry.call(
+            self.client_raw.create_multipart_upload, Bucket=self.bucket, Key=self.key
+        )
+        self.upload_id = resp.get("UploadId")
+
+    def _put_checked(self, body: bytes, crc: int) -> None:
+        resp = self.client_raw.put_object(Bucket=self.bucket, Key=self.key, Body=body)
+        verify_crc64(resp, crc, f"cos://{self.bucket}/{self.key}")
+        record_upload(self.bucket, self.key, len(body), (resp or {}).get("ETag"))
+
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        if self.upload_id is None:
+            return
+        yield self._send_first
+        while not self._eof:
+            # Tasks pulled after the stream ended find nothing to send
+            yield self._send_next
+
+    def _send_first(self) -> None:
+        buf, n = self._first
+        self._first = None
+        with self._read_lock:
+            self._parts = 1
+        try:
+            self._send(1, memoryview(buf)[:n])
+        finally:
+            self.pool.release(buf)
+
+    def _send_next(self) -> None:
+        buf = self.pool.acquire()
+        try:
+            with self._read_lock:
+                if self._eof:
+                    return
+                n = _read_full(self.stream, memoryview(buf))
+                if n < self.part_size:
+                    self._eof = True
+                if not n:
+                    return
+                # Parts are read in stream order, so the digest sees every byte once
+                self._digest.update(memoryview(buf)[:n])
+                self._parts += 1
+                part_number = self._parts
+            if part_number > MAX_MULTIPART_PARTS:
+                raise COSError(
+                    f"Stream exceeds {MAX_MULTIPART_PARTS} parts of {self.part_size} bytes; "
+                    "use a larger --part-size"
+                )
+            self._send(part_number, memoryview(buf)[:n])
+        finally:
+            self.pool.release(buf)
+
+    def _send(self, part_number: int, body: memoryview) -> None:
+        crc = inline_crc64(body)
+        etag = _upload_part_with_retry(
+            self.client_raw, self.bucket, self.key, self.upload_id, part_number,
+            self._paced(body), self.retry, lambda: crc,
+        )
+        with self._lock:
+            self._etags[part_number] = etag
+            self._transferred += len(body)
+            done = self._transferred
+        self.progress_update(done, 0)
+
+    def finish(self) -> None:
+        self.size = self._transferred
+        if self.upload_id is None:
+            return
+        resp = _complete_upload(
+            self.retry, self.client_raw, self.bucket, self.key, self.upload_id, self._etags
+        )
+        self.checksum = self._digest.result()
+        verify_crc64(resp, self.checksum.crc64, f"cos://{self.bucket}/{self.key}")
+        record_upload(self.bucket, self.key, self.size, (resp or {}).get("ETag"))
+
+    def abort(self, exc: BaseException) -> None:
+        if self._first is not None:
+            self.pool.release(self._first[0])
+            self._first = None
+        if self.upload_id:
+            _abort_quietly(self.client_raw, self.bucket, self.key, self.upload_id)
+
+
+class StreamDownloadJob(TransferJob):
+    """Ordered download of one object onto a stream (e.g. stdout) as a job.
+
+    Ranges are fetched in parallel like ``RangedDownloadJob`` but written
+    to ``out`` strictly in order: a fetched range waits in its buffer until
+    the ranges before it are written, and whichever worker completes the
+    next range in line writes every consecutive range that is ready. A
+    range is only fetched once it is within ``window`` ranges of the write
+    position, so at most ``window`` ranges are held in memory however slow
+    the reader of ``out`` is. MD5 and CRC64 are computed on the bytes as
+    they are written; a CRC64 that differs from the object's fails the job
+    (after the data was written, so the command exits non-zero).
+
+    Args:
+        client_raw: Authenticated CosS3Client
+        bucket: Bucket name
+        key: Object key in COS
+        out: Binary file-like object to write to
+        total_size: Object size in bytes
+        chunk_size: Range size in bytes, or None to plan it
+        progress_update: Callback receiving (bytes_written, total_size)
+        concurrency: Ranges fetched in parallel, or the scheduler's
+            ``AdaptiveConcurrency``; the reorder window is sized for its maximum
+        throttle: Download limiter (process-wide if None)
+    """
+
+    def __init__(
+        self,
+        client_raw,
+        bucket: str,
+        key: str,
+        out,
+        total_size: int,
+        chunk_size: Optional[int] = None,
+        progress_update: Optional[Callable[[int, int], None]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 5.0,
+        concurrency: Union[int, AdaptiveConcurrency] = 4,
+        *,
+        throttle: Optional[BandwidthThrottle] = None,
+    ):
+        self.client_raw = client_raw
+        self.bucket = bucket
+        self.key = key
+        self.out = out
+        self.size = total_size
+        self.progress_update = progress_update or _no_progress
+        self.retry = RetryPolicy(max_retries, retry_backoff, retry_backoff_max)
+        self.concurrency = max(1, int(concurrency or 1))
+        self.throttle = throttle or get_bandwidth_throttle("download")
+        max_memory = get_buffer_pool().max_memory
+        self.chunk_size = max(1, chunk_size or plan_part_size(
+            total_size, concurrency=self.concurrency, available_memory=max_memory
+        ))
+        self.window = max(1, min(2 * max_workers(concurrency), max_memory // self.chunk_size))
+        self.pool = BufferPool(self.window * self.chunk_size, self.chunk_size)
+        self.label = f"cos://{bucket}/{key}"
+        self._ranges = -(-total_size // self.chunk_size) if total_size else 0
+        self._ready: Dict[int, Tuple[bytearray, int]] = {}
+        self._next = 0
+        self._written = 0
+        self._writing = False
+        self._failed = False
+        self._digest = StreamDigest()
+        self._expected_crc: Optional[int] = None
+        self.checksum = TransferChecksum()
+        self._cond = threading.Condition()
 
-    # Open file in appropriate mode
-    mode = "r+b" if dest_path.exists() and start > 0 else "wb"
-    with open(dest_path, mode) as out:
-        if start > 0:
+    def tasks(self) -> Iterator[Callable[[], None]]:
+        for index in range(self._ranges):
+            yield functools.partial(self._fetch_range, index)
+
+    def _fetch_range(self, index: int) -> None:
+        try:
+            with self._cond:
+                self._cond.wait_for(lambda: self._failed or index < self._next + self.window)
+                if self._failed:
+                    raise COSError("Stream download stopped after an earlier failure")
+            buf = self.pool.acquire()
             try:
-                out.seek(start)
-            except OSError:
-                start = 0
-                out.seek(0)
-        while start < total_size:
-            end = min(start + chunk_size - 1, total_size - 1)
-            expected = end - start + 1
-            rng = f"bytes={start}-{end}"
-            # Retry ranged GET with backoff
-            attempt = 0
-            while True:
-                try:
-                    resp = client_raw.get_object(Bucket=bucket, Key=key, Range=rng)
-                    break
-                except Exception:
-                    if attempt >= max_retries:
-                        raise
-                    delay = min(retry_backoff * (2 ** attempt), retry_backoff_max)
-                    time.sleep(delay)
-                    attempt += 1
-            body = resp.get("Body")
+                n = self.retry.call(self._fetch, index, memoryview(buf))
+            except BaseException:
+                self.pool.release(buf)
+                raise
+            self._deliver(index, buf, n)
+        except BaseException:
+            with self._cond:
+                self._failed = True
+                self._cond.notify_all()
+            raise
 
-            # Read exactly the expected number of bytes from the stream when possible
+    def _fetch(self, index: int, view: memoryview) -> int:
+        start = index * self.chunk_size
+        end = min(start + self.chunk_size, self.size) - 1
+        resp = self.client_raw.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}"
+        )
+        expected = header_crc64(resp)
+        if expected is not None:
+            self._expected_crc = expected
+        body = resp.get("Body")
+        length = end - start + 1
+        got = 0
+        while got < length:
             if hasattr(body, "read"):
-                remaining = expected
-                buffers = []
-                # Read in 1MB chunks or remaining size
-                while remaining > 0:
-                    chunk = body.read(min(1024 * 1024, remaining))
-                    if not chunk:
-                        break
-                    buffers.append(chunk)
-                    remaining -= len(chunk)
-                data = b"".join(buffers)
+                n = _readinto(body, view[got:length])
             else:
-                data = body
+                data = (body or b"")[got:length]
+                n = len(data)
+                view[got: got + n] = data
+            if not n:
+                raise CosClientError(f"Body ended at byte {start + got} of bytes={start}-{end}")
+            if self.throttle is not None:
+                self.throttle.throttle(n)
+            got += n
+        return got
 
-            if not data:
-                # No data returned; treat as transient error for retry at next iteration
-                # Sleep a minimal delay and continue (bounded by loop condition)
-                delay = min(retry_backoff, retry_backoff_max)
-                time.sleep(delay)
-                continue
+    def _deliver(self, index: int, buf: bytearray, n: int) -> None:
+        with self._cond:
+            self._ready[index] = (buf, n)
+            if self._writing:
+                # The worker writing now will pick this range up
+                return
+            self._writing = True
+        try:
+            while True:
+                with self._cond:
+                    item = self._ready.pop(self._next, None)
+                    if item is None:
+                        self._writing = False
+                        return
+                buf, n = item
+                try:
+                    # Only the writing worker gets here, in range order
+                    self._digest.update(memoryview(buf)[:n])
+                    self.out.write(memoryview(buf)[:n])
+                finally:
+                    self.pool.release(buf)
+                with self._cond:
+                    self._next += 1
+                    self._written += n
+                    written = self._written
+                    self._cond.notify_all()
+                self.progress_update(written, self.size)
+        except BaseException:
+            with self._cond:
+                self._writing = False
+            raise
 
-            out.write(data)
-            transferred += len(data)
-            progress_update(transferred, total_size)
+    def finish(self) -> None:
+        self.out.flush()
+        self.checksum = self._digest.result()
+        check_crc64(self._expected_crc, self.checksum.crc64, f"cos://{self.bucket}/{self.key}")
 
-            # Save resume progress
-            if resume and resume_tracker is not None:
-                try:
-                    resume_tracker.save_progress(
-                        str(dest_path), "download", {"offset": start + len(data), "total": total_size}
-                    )
-                except Exception:
-                    pass
+    def abort(self, exc: BaseException) -> None:
+        with self._cond:
+            for buf, _ in self._ready.values():
+                self.pool.release(buf)
+            self._ready.clear()
 
-            # Advance start by the number of bytes actually written
-            start += len(data)
-    # Ensure completion
-    progress_update(total_size, total_size)
-    # Clear resume tracking on completion
-    if resume and resume_tracker is not None:
+
+class AggregateProgress:
+    """Fold per-file ``(done, total)`` progress callbacks into byte deltas.
+
+    Each transfer reports its own running total; ``callback()`` gives every
+    transfer a callback that turns those totals into increments passed to
+    ``on_advance``, so one bar can show bytes across all files. Subclasses
+    (e.g. ``progress.TransferMonitor``) may override ``callback()`` to keep
+    per-file totals instead; ``run_transfers`` uses them as they are.
+    """
+
+    def __init__(self, on_advance: Callable[[int], None]):
+        self.on_advance = on_advance
+        self._lock = threading.Lock()
+
+    def callback(self, label: str = "", size: int = 0) -> Callable[[int, int], None]:
+        """Return the progress callback for one transfer of ``size`` bytes."""
+        last = {"value": 0}
+
+        def update(done: int, _total: int) -> None:
+            with self._lock:
+                delta = done - last["value"]
+                last["value"] = max(done, last["value"])
+            if delta > 0:
+                self.on_advance(delta)
+
+        return update
+
+
+def upload_job(
+    cos_client,
+    local_path: Path,
+    key: str,
+    *,
+    part_size: Optional[int] = None,
+    max_retries: int = 3,
+    retry_backoff: float = 0.5,
+    retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+    resume_tracker: Optional[ResumeTracker] = None,
+) -> TransferJob:
+    """Build the scheduler job that uploads ``local_path`` to ``key``.
+
+    Files below ``MULTIPART_THRESHOLD`` are sent in one request through
+    ``cos_client.upload_file``, which checks the bytes sent against the
+    CRC64 (or MD5 ETag) COS returns; larger files become a ``MultipartUploadJob`` on the
+    raw client, split into parts that share the scheduler's workers.
+
+    Args:
+        cos_client: COSClient bound to the destination bucket
+        local_path: Local file path
+        key: Object key in COS
+        part_size: Fixed part size in bytes, or None to plan it
+        concurrency: Worker count, used to plan part sizes
+        resume_tracker: Optional tracker for resumable multipart uploads
+
+    Returns:
+        The job, not yet scheduled
+    """
+    size = local_path.stat().st_size
+    if size < MULTIPART_THRESHOLD:
+        # PartSize is in MB; at or below it the SDK sends a single PUT
+        single_part_mb = -(-MULTIPART_THRESHOLD // (1024 * 1024))
+        throttle = get_bandwidth_throttle("upload")
+
+        cache_policy = get_cache_policy()
+
+        def send():
+            # The SDK sends the file in one request; pace it as a whole
+            if throttle is not None:
+                throttle.throttle(size)
+            cos_client.upload_file(str(local_path), key, PartSize=single_part_mb)
+            if cache_policy == "drop":
+                _drop_cached(local_path)
+
+        return CallableJob(send, size, str(local_path))
+    return MultipartUploadJob(
+        cos_client.client, cos_client.bucket, key, local_path, part_size, None,
+        max_retries, retry_backoff, retry_backoff_max, concurrency,
+        resume_tracker=resume_tracker,
+    )
+
+
+def download_job(
+    cos_client,
+    key: str,
+    dest_path: Path,
+    size: int,
+    *,
+    part_size: Optional[int] = None,
+    max_retries: int = 3,
+    retry_backoff: float = 0.5,
+    retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+    resume: bool = True,
+    resume_tracker: Optional[ResumeTracker] = None,
+) -> TransferJob:
+    """Build the scheduler job that downloads ``key`` to ``dest_path``.
+
+    Objects below ``MULTIPART_THRESHOLD`` (or of unknown size) are fetched
+    in one request through ``cos_client.download_file``, which checks the
+    bytes written against the CRC64 (or MD5 ETag) COS returns; larger objects
+    become a ``RangedDownloadJob`` on the raw client. Either way the data
+    lands in a temp file that the process-wide ``DownloadCommitter``
+    renames to ``dest_path``.
+
+    Args:
+        cos_client: COSClient bound to the source bucket
+        key: Object key in COS
+        dest_path: Destination local path
+        size: Object size in bytes from a listing or HEAD (0 if unknown)
+        part_size: Fixed range size in bytes, or None to plan it
+        concurrency: Worker count, used to plan range sizes
+        resume: Resume from saved range state
+        resume_tracker: Optional tracker for resumable ranged downloads
+
+    Returns:
+        The job, not yet scheduled
+    """
+    if size < MULTIPART_THRESHOLD:
+        throttle = get_bandwidth_throttle("download")
+        cache_policy = get_cache_policy()
+
+        def fetch():
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = download_temp_path(dest_path)
+            try:
+                cos_client.download_file(key, str(temp_path))
+            except BaseException:
+                _remove_quietly(temp_path)
+                raise
+            # The SDK fetches the object in one request; pace it as a whole
+            if throttle is not None:
+                throttle.throttle(size)
+            if cache_policy == "drop":
+                _drop_cached(temp_path)
+            get_download_committer().commit(temp_path, dest_path)
+
+        return CallableJob(fetch, size, f"cos://{cos_client.bucket}/{key}")
+    return RangedDownloadJob(
+        cos_client.client, cos_client.bucket, key, dest_path, size, part_size, None,
+        resume=resume, resume_tracker=resume_tracker, max_retries=max_retries,
+        retry_backoff=retry_backoff, retry_backoff_max=retry_backoff_max,
+        concurrency=concurrency,
+    )
+
+
+def copy_job(
+    cos_client,
+    source_bucket: str,
+    source_key: str,
+    dest_bucket: str,
+    dest_key: str,
+    size: int,
+    *,
+    part_size: Optional[int] = None,
+    max_retries: int = 3,
+    retry_backoff: float = 0.5,
+    retry_backoff_max: float = 5.0,
+    concurrency: int = 4,
+) -> TransferJob:
+    """Build the scheduler job that copies an object inside COS.
+
+    Objects below ``MULTIPART_COPY_THRESHOLD`` (or of unknown size) are
+    copied with one ``cos_client.copy_object`` request; larger objects
+    become a ``MultipartCopyJob`` whose parts share the scheduler's
+    workers. Both are server-side copies.
+
+    Args:
+        cos_client: COSClient used for the copy
+        source_bucket: Source bucket name
+        source_key: Source object key
+        dest_bucket: Destination bucket name
+        dest_key: Destination object key
+        size: Source object size in bytes (0 if unknown)
+        part_size: Fixed part size in bytes, or None to plan it
+        concurrency: Worker count, used to plan part sizes
+
+    Returns:
+        The job, not yet scheduled
+    """
+    if size < MULTIPART_COPY_THRESHOLD:
+        return CallableJob(
+            lambda: cos_client.copy_object(source_bucket, source_key, dest_bucket, dest_key),
+            size,
+            f"cos://{source_bucket}/{source_key}",
+        )
+    client_raw = cos_client.client
+    return MultipartCopyJob(
+        client_raw, source_bucket, source_key, dest_bucket, dest_key, size, part_size,
+        region=getattr(getattr(client_raw, "_conf", None), "_region", None),
+        max_retries=max_retries, retry_backoff=retry_backoff,
+        retry_backoff_max=retry_backoff_max, concurrency=concurrency,
+    )
+
+
+def resolve_concurrency(value: Union[str, int, None]) -> Union[int, AdaptiveConcurrency]:
+    """Turn a ``--concurrency`` value into a worker count or an adaptive controller.
+
+    Args:
+        value: A positive integer, or "auto"
+
+    Returns:
+        The integer, or an ``AdaptiveConcurrency`` for "auto"
+
+    Raises:
+        COSError: If the value is neither
+    """
+    if isinstance(value, str) and value.strip().lower() == "auto":
+        return AdaptiveConcurrency(
+            AUTO_CONCURRENCY_START, 1, AUTO_CONCURRENCY_MAX, is_throttle=is_throttle_error
+        )
+    try:
+        workers = int(value if value is not None else 4)
+    except (TypeError, ValueError):
+        raise COSError(f"Invalid --concurrency value: {value} (expected a positive integer or 'auto')")
+    if workers < 1:
+        raise COSError(f"Invalid --concurrency value: {value} (expected a positive integer or 'auto')")
+    return workers
+
+
+def run_transfers(
+    jobs: Iterable[TransferJob],
+    concurrency: Union[int, AdaptiveConcurrency] = 4,
+    on_advance: Optional[Callable[[int], None]] = None,
+    *,
+    fail_fast: bool = True,
+    on_done: Optional[Callable[[TransferJob, Optional[BaseException]], None]] = None,
+) -> List[Tuple[TransferJob, BaseException]]:
+    """Run transfer jobs on one shared ``TransferScheduler``.
+
+    Args:
+        jobs: Jobs from ``upload_job``/``download_job``/``copy_job`` or any
+            ``TransferJob``
+        concurrency: Worker threads shared by every file and part, or an
+            ``AdaptiveConcurrency`` controller
+        on_advance: Receives byte increments summed over all jobs, or an
+            ``AggregateProgress`` that tracks each job itself
+        fail_fast: Stop at the first failure and raise it
+        on_done: Called in the calling thread as each job ends
+
+    Returns:
+        (job, error) for every job that failed or was skipped
+    """
+    scheduler = TransferScheduler(concurrency)
+    aggregate = on_advance
+    if on_advance is not None and not isinstance(on_advance, AggregateProgress):
+        aggregate = AggregateProgress(on_advance)
+    for job in jobs:
+        if aggregate is not None:
+            job.progress_update = aggregate.callback(job.label, job.size)
+        scheduler.add(job)
+    try:
+        return scheduler.run(fail_fast=fail_fast, on_done=on_done)
+    finally:
+        # Downloads held back by --fsync batch are published with the batch
+        get_download_committer().flush()
+
+
+def copy_objects(
+    cos_client,
+    copies: Iterable[Tuple[str, str, str, str, int]],
+    concurrency: int = 4,
+    on_advance: Optional[Callable[[int], None]] = None,
+    *,
+    on_done: Optional[Callable[[str, Optional[BaseException]], None]] = None,
+    part_size: Optional[int] = None,
+    max_retries: int = 3,
+    retry_backoff: float = 0.5,
+    retry_backoff_max: float = 5.0,
+) -> List[Tuple[str, BaseException]]:
+    """Copy many objects inside COS on one scheduler, continuing past failures.
+
+    Args:
+        cos_client: COSClient used for the copies
+        copies: (source_bucket, source_key, dest_bucket, dest_key, size)
+            for each object
+        concurrency: Worker threads shared by every copy and part
+        on_advance: Receives byte increments summed over all copies
+        on_done: Called in the calling thread with the source key and its
+            error (None once the copy is complete)
+        part_size: Fixed part size in bytes for multipart copies
+
+    Returns:
+        (source_key, error) for every copy that failed
+    """
+    sources: Dict[TransferJob, str] = {}
+    for source_bucket, source_key, dest_bucket, dest_key, size in copies:
+        job = copy_job(
+            cos_client, source_bucket, source_key, dest_bucket, dest_key, size,
+            part_size=part_size, max_retries=max_retries, retry_backoff=retry_backoff,
+            retry_backoff_max=retry_backoff_max, concurrency=concurrency,
+        )
+        sources[job] = source_key
+
+    def done(job: TransferJob, exc: Optional[BaseException]) -> None:
+        if on_done is not None:
+            on_done(sources[job], exc)
+
+    failures = run_transfers(sources, concurrency, on_advance, fail_fast=False, on_done=done)
+    return [(sources[job], exc) for job, exc in failures]
+
+
+class BatchDeleter:
+    """Delete objects with one multi-object request per batch.
+
+    Keys queued with ``add()`` are sent once ``batch_size`` of them have
+    gathered, and the remainder on ``flush()``. Keys the service refused,
+    and every key of a batch whose request failed, are collected in
+    ``failures`` rather than raised, so one bad batch does not stop a move.
+
+    Args:
+        cos_client: COSClient bound to the bucket
+        bucket: Bucket the keys belong to
+        batch_size: Keys per request (service maximum 1000)
+    """
+
+    def __init__(self, cos_client, bucket: Optional[str] = None, batch_size: int = DELETE_BATCH_SIZE):
+        self.cos_client = cos_client
+        self.bucket = bucket
+        self.batch_size = max(1, min(int(batch_size), DELETE_BATCH_SIZE))
+        self.deleted = 0
+        self.failures: List[Tuple[str, str]] = []
+        self._pending: List[str] = []
+
+    def add(self, key: str) -> None:
+        self._pending.append(key)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, []
         try:
-            resume_tracker.clear_progress(str(dest_path), "download")
-        except Exception:
-            pass
+            response = self.cos_client.delete_objects(keys, bucket=self.bucket)
+        except COSError as e:
+            self.failures.extend((key, str(e)) for key in keys)
+            return
+        errors = response.get("Error") if isinstance(response, dict) else None
+        if isinstance(errors, dict):
+            # A single <Error> element is parsed as a dict, not a list
+            errors = [errors]
+        errors = errors or []
+        self.failures.extend(
+            (err.get("Key", ""), err.get("Message") or err.get("Code", "")) for err in errors
+        )
+        self.deleted += len(keys) - len(errors)
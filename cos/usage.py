@@ -0,0 +1,120 @@
+"""Prefix-tree size and count aggregation for ``cos du``.
+
+Objects are counted as the listing streams past: each key is cut to its
+first ``depth`` ``/`` segments below the listed prefix and its size added to
+that node, per storage class. Only the cut nodes are kept while listing, so
+memory grows with the number of distinct prefixes, not objects; parent
+totals are rolled up once at the end.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import DU_PROGRESS_EVERY
+
+DEFAULT_STORAGE_CLASS = "STANDARD"
+
+
+class PrefixUsage:
+    """Bytes and objects under one prefix, with a per-storage-class breakdown."""
+
+    __slots__ = ("prefix", "size", "objects", "classes")
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.size = 0
+        self.objects = 0
+        self.classes: Dict[str, List[int]] = {}
+
+    @property
+    def depth(self) -> int:
+        return self.prefix.count("/")
+
+    def add(self, storage_class: str, size: int, objects: int) -> None:
+        self.size += size
+        self.objects += objects
+        totals = self.classes.setdefault(storage_class, [0, 0])
+        totals[0] += size
+        totals[1] += objects
+
+
+class UsageTree:
+    """Aggregates listing entries under ``prefix`` into nodes ``depth`` segments deep.
+
+    Args:
+        prefix: The listed prefix; node prefixes are relative to it
+        depth: ``/`` segments below ``prefix`` to break totals down by
+    """
+
+    def __init__(self, prefix: str = "", depth: int = 1):
+        self.prefix = prefix
+        self.depth = depth
+        # (node, storage class) -> [bytes, objects], for nodes at the cut only
+        self._cut: Dict[Tuple[str, str], List[int]] = {}
+
+    def add(self, key: str, size: int, storage_class: Optional[str] = None) -> None:
+        """Count one object."""
+        rel = key[len(self.prefix):]
+        parts = rel.split("/", self.depth)
+        if len(parts) > self.depth:
+            node = rel[:len(rel) - len(parts[-1])]
+        else:
+            # Shallower than the cut: counts in its own directory
+            node = rel[:rel.rfind("/") + 1]
+        slot = self._cut.get((node, storage_class or DEFAULT_STORAGE_CLASS))
+        if slot is None:
+            slot = self._cut[(node, storage_class or DEFAULT_STORAGE_CLASS)] = [0, 0]
+        slot[0] += size
+        slot[1] += 1
+
+    def add_entries(self, entries: Iterable[Dict], progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """Count ListObjects-shaped entries as they arrive.
+
+        Args:
+            entries: Listing entries with Key, Size and optionally StorageClass
+            progress: Called with (objects, bytes) so far every ``DU_PROGRESS_EVERY`` objects
+
+        Returns:
+            Number of objects counted
+        """
+        add = self.add
+        objects = size = 0
+        for entry in entries:
+            entry_size = int(entry.get("Size", 0))
+            add(entry.get("Key", ""), entry_size, entry.get("StorageClass"))
+            objects += 1
+            size += entry_size
+            if progress is not None and objects % DU_PROGRESS_EVERY == 0:
+                progress(objects, size)
+        if progress is not None:
+            progress(objects, size)
+        return objects
+
+    def nodes(self) -> Dict[str, PrefixUsage]:
+        """Every prefix down to the cut with its rolled-up totals; ``""`` is the whole listing."""
+        nodes: Dict[str, PrefixUsage] = {"": PrefixUsage("")}
+        for (node, storage_class), (size, objects) in self._cut.items():
+            end = 0
+            while True:
+                ancestor = node[:end]
+                usage = nodes.get(ancestor)
+                if usage is None:
+                    usage = nodes[ancestor] = PrefixUsage(ancestor)
+                usage.add(storage_class, size, objects)
+                if end == len(node):
+                    break
+                end = node.index("/", end) + 1
+        return nodes
+
+    def top(self, limit: Optional[int] = None) -> Tuple[PrefixUsage, List[PrefixUsage]]:
+        """The total and the largest prefixes below it, biggest first.
+
+        Args:
+            limit: Prefixes to return; all of them when None
+
+        Returns:
+            (total, prefixes) where prefixes are sorted by bytes, then objects, then name
+        """
+        nodes = self.nodes()
+        total = nodes.pop("")
+        ranked = sorted(nodes.values(), key=lambda u: (-u.size, -u.objects, u.prefix))
+        return total, ranked[:limit] if limit is not None else ranked
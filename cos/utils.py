@@ -2,21 +2,25 @@
 
 import json
 import os
+import sys
 import time
 import fnmatch
 import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, Iterator, List, Optional, Callable
 from urllib.parse import urlparse
 import threading
+from contextlib import contextmanager
 
 from rich.console import Console
 from rich.table import Table
 from tabulate import tabulate
 
 from .constants import COS_URI_SCHEME
+from .crc64 import file_crc64
 from .exceptions import InvalidURIError
+from .writers import stream_writer
 
 console = Console()
 
@@ -91,6 +95,21 @@ def parse_size_to_bytes(size: Optional[str | int | float]) -> int:
     return int(val * mult)
 
 
+def parse_bandwidth(rate: Optional[str | int | float]) -> Optional[int]:
+    """Parse a bandwidth limit such as '10MB', '10MB/s' or '512k' into bytes per second.
+
+    Returns None (no limit) when the input is empty or not positive.
+    """
+    if rate is None or rate == "":
+        return None
+    if isinstance(rate, str):
+        rate = rate.strip()
+        if rate.lower().endswith("/s"):
+            rate = rate[:-2]
+    value = parse_size_to_bytes(rate)
+    return value if value > 0 else None
+
+
 def validate_bucket_name(bucket: str) -> bool:
     """
     Validate Tencent COS bucket name.
@@ -235,9 +254,14 @@ def format_output(data: Any, output_format: str = "table") -> None:
     
     Args:
         data: Data to output
-        output_format: Output format (json, table, text)
-    """
-    if output_format == "json":
+        output_format: Output format (json, table, text, ndjson, csv)
+    """
+    if output_format in ("ndjson", "csv") and isinstance(data, list) and data and isinstance(data[0], dict):
+        writer = stream_writer(output_format, list(data[0].keys()), sys.stdout)
+        for row in data:
+            writer.write(row)
+        writer.close()
+    elif output_format in ("json", "ndjson", "csv"):
         output_json(data)
     elif output_format == "text":
         if isinstance(data, list):
@@ -294,6 +318,28 @@ def is_cos_uri(path: str) -> bool:
     return path.startswith(COS_URI_SCHEME)
 
 
+def get_content_length(headers: Optional[Dict[str, Any]]) -> int:
+    """
+    Get the object size from a HEAD response.
+    
+    Args:
+        headers: HEAD response headers
+        
+    Returns:
+        Size in bytes, or 0 if missing or malformed
+    """
+    if not hasattr(headers, "get"):
+        return 0
+    for name in ("Content-Length", "content-length", "ContentLength"):
+        try:
+            value = headers.get(name)
+            if value is not None:
+                return int(value)
+        except (TypeError, ValueError):
+            continue
+    return 0
+
+
 def join_cos_path(*parts: str) -> str:
     """
     Join COS path parts.
@@ -320,6 +366,24 @@ def error_message(message: str, exception: Optional[Exception] = None) -> None:
         console.print(f"[dim]{str(exception)}[/dim]")
 
 
+def failure_summary(failures: List[tuple], action: str, limit: int = 10) -> None:
+    """
+    Display a summary of items that failed in a batch operation.
+    
+    Args:
+        failures: (name, error) pairs
+        action: Verb describing the operation, e.g. "copy"
+        limit: Maximum number of failures listed individually
+    """
+    if not failures:
+        return
+    console.print(f"[bold red]Error:[/bold red] Failed to {action} {len(failures)} object(s):")
+    for name, error in failures[:limit]:
+        console.print(f"  - {name}: [dim]{error}[/dim]")
+    if len(failures) > limit:
+        console.print(f"  ... and {len(failures) - limit} more")
+
+
 def success_message(message: str) -> None:
     """
     Display success message.
@@ -339,6 +403,21 @@ def info_message(message: str) -> None:
     """
     console.print(f"[bold blue]ℹ[/bold blue] {message}")
 
+
+@contextmanager
+def messages_to_stderr() -> Iterator[None]:
+    """
+    Print console messages and progress to stderr inside the block.
+
+    Used while stdout carries data, e.g. ``cos cp cos://bucket/key -``.
+    """
+    previous = console.stderr
+    console.stderr = True
+    try:
+        yield
+    finally:
+        console.stderr = previous
+
 def matches_pattern(path: str, patterns: List[str], is_include: bool = True) -> bool:
     """
     Check if path matches any of the given patterns.
@@ -388,37 +467,54 @@ def should_process_file(
 
 
 class BandwidthThrottle:
-    """Throttle bandwidth for uploads/downloads"""
+    """Token-bucket bandwidth limiter shared by concurrent transfers.
+
+    Each ``throttle()`` call takes its bytes from the bucket, which refills
+    at ``max_bytes_per_sec`` up to ``burst`` bytes. A caller that overdraws
+    the bucket sleeps until the refill covers its debt; the sleep happens
+    outside the lock, so workers wait side by side and are served in the
+    order they asked, which shares the rate fairly among them.
+    """
     
-    def __init__(self, max_bytes_per_sec: Optional[int] = None):
+    def __init__(self, max_bytes_per_sec: Optional[int] = None, burst: Optional[int] = None):
         """
         Initialize bandwidth throttle.
         
         Args:
             max_bytes_per_sec: Maximum bytes per second (None = no limit)
+            burst: Bytes that may pass at once after an idle period
+                (default: a quarter second at the full rate)
         """
         self.max_bytes_per_sec = max_bytes_per_sec
+        self.burst = burst if burst is not None else (max_bytes_per_sec or 0) // 4
         self.bytes_transferred = 0
         self.start_time = time.time()
+        # The bucket starts empty so the first chunk is paced too
+        self._tokens = 0.0
+        self._last = time.monotonic()
         self._lock = threading.Lock()
     
     def throttle(self, chunk_size: int) -> None:
         """
-        Apply throttle based on bytes transferred.
+        Take ``chunk_size`` bytes from the bucket, waiting if it is overdrawn.
         
         Args:
             chunk_size: Size of chunk being transferred
         """
-        if self.max_bytes_per_sec is None:
+        if self.max_bytes_per_sec is None or chunk_size <= 0:
             return
         
+        rate = float(self.max_bytes_per_sec)
         with self._lock:
             self.bytes_transferred += chunk_size
-            elapsed = time.time() - self.start_time
-            expected_time = self.bytes_transferred / self.max_bytes_per_sec
-            
-            if expected_time > elapsed:
-                time.sleep(expected_time - elapsed)
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * rate)
+            self._last = now
+            self._tokens -= chunk_size
+            wait = -self._tokens / rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
     
     def get_speed(self) -> float:
         """
@@ -532,13 +628,15 @@ def compute_file_checksum(file_path: str, algorithm: str = "md5") -> str:
     return hasher.hexdigest()
 
 
-def compare_checksums(local_path: str, remote_etag: str) -> bool:
+def compare_checksums(local_path: str, remote_etag: str, remote_crc64: Optional[int] = None) -> bool:
     """
     Compare local file checksum with remote ETag.
     
     Args:
         local_path: Path to local file
         remote_etag: ETag from COS (typically MD5)
+        remote_crc64: Object CRC64 from ``x-cos-hash-crc64ecma``, used when
+            the ETag is not an MD5
         
     Returns:
         True if checksums match
@@ -549,8 +647,10 @@ def compare_checksums(local_path: str, remote_etag: str) -> bool:
     # For multipart uploads, ETag is not a simple MD5
     # If ETag contains '-', it's a multipart upload
     if '-' in remote_etag:
-        # Can't reliably compare multipart ETags
-        return False
+        # COS still keeps a CRC64 of the whole object
+        if remote_crc64 is None:
+            return False
+        return file_crc64(local_path) == remote_crc64
     
     local_md5 = compute_file_checksum(local_path, "md5")
     return local_md5 == remote_etag
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""Streaming row writers for listings.
+
+Each writer takes rows (dicts) one at a time and writes them straight to a
+text stream, so a listing is printed as its pages arrive and never held in
+memory. Text, NDJSON and CSV go to the stream without ``rich``; JSON is
+written as the same indented array ``format_output`` produces; tables are
+rendered with ``rich`` a page of rows at a time.
+
+``open_export`` opens an ``--export`` file, gzip-compressed when its name
+ends in ``.gz``, and picks the writer from the extension.
+"""
+
+import abc
+import csv
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Sequence, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from .constants import EXPORT_GZIP_LEVEL, TABLE_PAGE_ROWS
+from .exceptions import COSError
+
+
+class RowWriter(abc.ABC):
+    """Base writer: ``write`` each row, then ``close`` once."""
+
+    def __init__(self, stream: IO[str], fields: Sequence[str]):
+        self.stream = stream
+        self.fields = list(fields)
+        self.rows = 0
+        self.closes_stream = False
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self.rows += 1
+        self._write(row)
+
+    @abc.abstractmethod
+    def _write(self, row: Dict[str, Any]) -> None:
+        """Write one row to the stream."""
+
+    def close(self) -> None:
+        self.stream.flush()
+        if self.closes_stream:
+            self.stream.close()
+
+
+class TextWriter(RowWriter):
+    """One value of the first field per line."""
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        self.stream.write(f"{row.get(self.fields[0], '')}\n")
+
+
+class NdjsonWriter(RowWriter):
+    """One compact JSON object per line."""
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps({f: row.get(f) for f in self.fields}, separators=(",", ":"), default=str))
+        self.stream.write("\n")
+
+
+class CsvWriter(RowWriter):
+    """CSV with a header row."""
+
+    def __init__(self, stream: IO[str], fields: Sequence[str]):
+        super().__init__(stream, fields)
+        self._csv = csv.writer(stream, lineterminator="\n")
+        self._csv.writerow(self.fields)
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        self._csv.writerow(["" if row.get(f) is None else row.get(f) for f in self.fields])
+
+
+class JsonArrayWriter(RowWriter):
+    """An indented JSON array, byte-for-byte what ``json.dumps(rows, indent=2)`` gives."""
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        text = json.dumps({f: row.get(f) for f in self.fields}, indent=2, default=str)
+        self.stream.write(("[\n" if self.rows == 1 else ",\n") + "\n".join("  " + line for line in text.split("\n")))
+
+    def close(self) -> None:
+        self.stream.write("\n]\n" if self.rows else "[]\n")
+        super().close()
+
+
+class TableWriter(RowWriter):
+    """``rich`` tables of at most ``page_rows`` rows each; the header is shown once."""
+
+    def __init__(self, console: Console, fields: Sequence[str], page_rows: int = TABLE_PAGE_ROWS):
+        super().__init__(console.file, fields)
+        self.console = console
+        self.page_rows = page_rows
+        self._page: List[Dict[str, Any]] = []
+        self._pages = 0
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        self._page.append(row)
+        if len(self._page) >= self.page_rows:
+            self._flush_page()
+
+    def _flush_page(self) -> None:
+        if not self._page:
+            return
+        table = Table(show_header=self._pages == 0, header_style="bold magenta")
+        for field in self.fields:
+            table.add_column(field)
+        for row in self._page:
+            table.add_row(*[str(row.get(f, "")) for f in self.fields])
+        self.console.print(table)
+        self._page = []
+        self._pages += 1
+
+    def close(self) -> None:
+        self._flush_page()
+
+
+WRITERS = {
+    "text": TextWriter,
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "json": JsonArrayWriter,
+}
+
+EXPORT_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".txt": "text"}
+
+
+def export_format(path: Path) -> Tuple[str, bool]:
+    """The writer format and whether to gzip, from an export file name.
+
+    Raises:
+        COSError: If the extension is not one of .ndjson, .jsonl, .csv or .txt (optionally .gz)
+    """
+    suffixes = [s.lower() for s in path.suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == ".gz"
+    if compressed:
+        suffixes = suffixes[:-1]
+    fmt = EXPORT_FORMATS.get(suffixes[-1]) if suffixes else None
+    if fmt is None:
+        raise COSError(f"Cannot tell the export format of {path}: use .ndjson, .jsonl, .csv or .txt, optionally .gz")
+    return fmt, compressed
+
+
+def open_export(path: Path, fields: Sequence[str]) -> RowWriter:
+    """Open ``path`` for writing and return the writer its extension asks for."""
+    fmt, compressed = export_format(path)
+    if compressed:
+        stream = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=EXPORT_GZIP_LEVEL)
+    else:
+        stream = open(path, "w", encoding="utf-8", newline="")
+    writer = WRITERS[fmt](stream, fields)
+    writer.closes_stream = True
+    return writer
+
+
+def stream_writer(output_format: str, fields: Sequence[str], stream: IO[str], console: Optional[Console] = None) -> RowWriter:
+    """The writer for an ``--output`` format on ``stream``; anything else is a table through ``console``."""
+    if output_format not in WRITERS:
+        return TableWriter(console or Console(file=stream), fields)
+    return WRITERS[output_format](stream, fields)
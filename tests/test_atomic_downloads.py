@@ -0,0 +1,185 @@
+import io
+import os
+
+import pytest
+
+from cos.exceptions import ChecksumError, COSError
+from cos.transfer import (
+    DownloadCommitter,
+    configure_fsync,
+    download_file_in_ranges_with_progress,
+    download_file_with_progress_polling,
+    download_job,
+    get_download_committer,
+    download_temp_path,
+    run_transfers,
+)
+from cos.utils import ResumeTracker
+
+MB = 1024 * 1024
+
+
+class ObservingClient:
+    """Serves ranges of ``data`` and records what the destination looked like meanwhile."""
+
+    def __init__(self, data, dest, fail_range=None, crc_header=None):
+        self.data = data
+        self.dest = dest
+        self.fail_range = fail_range
+        self.crc_header = crc_header
+        self.seen = []
+
+    def get_object(self, Bucket, Key, Range):
+        temp = download_temp_path(self.dest)
+        self.seen.append((self.dest.read_bytes() if self.dest.exists() else None, temp.stat().st_size))
+        start, end = (int(x) for x in Range.split("=")[1].split("-"))
+        if (start, end) == self.fail_range:
+            raise ConnectionResetError("reset")
+        resp = {"Body": io.BytesIO(self.data[start:end + 1])}
+        if self.crc_header is not None:
+            resp["x-cos-hash-crc64ecma"] = self.crc_header
+        return resp
+
+
+def download(client, dest, **kwargs):
+    kwargs.setdefault("resume", False)
+    return download_file_in_ranges_with_progress(
+        client, "b", "k", dest, len(client.data), MB, lambda *a: None,
+        max_retries=0, retry_backoff=0, retry_backoff_max=0, **kwargs,
+    )
+
+
+def test_download_appears_only_when_complete(tmp_path):
+    data = os.urandom(3 * MB + 7)
+    dest = tmp_path / "out.bin"
+    dest.write_bytes(b"old")
+    client = ObservingClient(data, dest)
+    download(client, dest)
+    # Readers saw the old file throughout; the temp file was preallocated
+    assert all(old == b"old" and size == len(data) for old, size in client.seen)
+    assert dest.read_bytes() == data
+    assert not download_temp_path(dest).exists()
+
+
+def test_failed_download_leaves_destination_untouched(tmp_path):
+    data = os.urandom(3 * MB)
+    dest = tmp_path / "out.bin"
+    dest.write_bytes(b"old")
+    with pytest.raises(ConnectionResetError):
+        download(ObservingClient(data, dest, fail_range=(MB, 2 * MB - 1)), dest)
+    assert dest.read_bytes() == b"old"
+    assert not download_temp_path(dest).exists()
+
+    with pytest.raises(ChecksumError):
+        download(ObservingClient(data, dest, crc_header="1"), dest)
+    assert dest.read_bytes() == b"old"
+    assert not download_temp_path(dest).exists()
+
+
+def test_resumable_download_keeps_its_temp_file(tmp_path):
+    data = os.urandom(3 * MB)
+    dest = tmp_path / "out.bin"
+    tracker = ResumeTracker(cache_dir=tmp_path / ".cache")
+    with pytest.raises(ConnectionResetError):
+        download(
+            ObservingClient(data, dest, fail_range=(2 * MB, 3 * MB - 1)), dest,
+            resume=True, resume_tracker=tracker, concurrency=1,
+        )
+    assert not dest.exists()
+    assert download_temp_path(dest).stat().st_size == len(data)
+
+    client = ObservingClient(data, dest)
+    download(client, dest, resume=True, resume_tracker=tracker)
+    assert len(client.seen) == 1
+    assert dest.read_bytes() == data
+
+
+def test_resume_never_adopts_a_shorter_destination(tmp_path):
+    data = os.urandom(3 * MB)
+    dest = tmp_path / "out.bin"
+    stale = os.urandom(MB + 5)
+    dest.write_bytes(stale)
+    tracker = ResumeTracker(cache_dir=tmp_path / ".cache")
+    tracker.save_progress(str(dest), "download", {"offset": MB, "total": len(data)})
+    with pytest.raises(ConnectionResetError):
+        download(
+            ObservingClient(data, dest, fail_range=(2 * MB, 3 * MB - 1)), dest,
+            resume=True, resume_tracker=tracker, concurrency=1,
+        )
+    assert dest.read_bytes() == stale
+
+    # The stale bytes are not trusted as a prefix: every range is fetched
+    client = ObservingClient(data, dest)
+    download(client, dest, resume=True, resume_tracker=ResumeTracker(cache_dir=tmp_path / ".other"))
+    assert len(client.seen) == 3
+    assert dest.read_bytes() == data
+
+
+def test_fsync_modes(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr("cos.transfer.os.fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+
+    def finished(name):
+        temp = tmp_path / f".{name}.tmp"
+        temp.write_bytes(name.encode())
+        return temp, tmp_path / name
+
+    DownloadCommitter("none").commit(*finished("a"))
+    assert (tmp_path / "a").read_bytes() == b"a" and not synced
+
+    DownloadCommitter("file").commit(*finished("b"))
+    # The file, then its directory
+    assert len(synced) == 2
+
+    synced.clear()
+    batch = DownloadCommitter("batch", batch_size=3)
+    batch.commit(*finished("c"))
+    batch.commit(*finished("d"))
+    assert not (tmp_path / "c").exists() and not synced
+    batch.commit(*finished("e"))
+    assert all((tmp_path / n).exists() for n in "cde")
+    # Three files and one shared directory
+    assert len(synced) == 4
+    batch.commit(*finished("f"))
+    batch.flush()
+    assert (tmp_path / "f").exists()
+
+    with pytest.raises(COSError):
+        DownloadCommitter("always")
+
+
+def test_batched_small_downloads_are_published_by_run_transfers(tmp_path):
+    class SmallClient:
+        bucket = "b"
+        client = None
+
+        def download_file(self, key, local_path):
+            with open(local_path, "wb") as f:
+                f.write(key.encode())
+
+    configure_fsync("batch", batch_size=100)
+    try:
+        jobs = [download_job(SmallClient(), f"k{i}", tmp_path / f"f{i}", 2) for i in range(5)]
+        run_transfers(jobs, concurrency=2)
+    finally:
+        configure_fsync()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"f{i}" for i in range(5)]
+    assert (tmp_path / "f3").read_bytes() == b"k3"
+
+
+def test_polling_download_leaves_the_batch_to_the_caller(tmp_path):
+    class SdkClient:
+        def download_file(self, Bucket, Key, DestFilePath):
+            with open(DestFilePath, "wb") as f:
+                f.write(Key.encode())
+
+    configure_fsync("batch", batch_size=100)
+    try:
+        for name in ("a", "b"):
+            download_file_with_progress_polling(SdkClient(), "b", name, tmp_path / name, 0, lambda *a: None)
+        assert not (tmp_path / "a").exists() and not (tmp_path / "b").exists()
+        get_download_committer().flush()
+    finally:
+        configure_fsync()
+    assert (tmp_path / "a").read_bytes() == b"a" and (tmp_path / "b").read_bytes() == b"b"
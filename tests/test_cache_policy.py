@@ -0,0 +1,95 @@
+import io
+import os
+
+import pytest
+
+from cos.exceptions import COSError
+from cos.transfer import (
+    configure_cache_policy,
+    download_file_in_ranges_with_progress,
+    upload_file_multipart_with_progress,
+)
+
+MB = 1024 * 1024
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="needs posix_fadvise")
+
+
+class MemoryClient:
+    def __init__(self, data=b""):
+        self.data = data
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "u"}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        if hasattr(Body, "read"):
+            Body.read()
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        return {"ETag": '"done"'}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        return {}
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(x) for x in Range.split("=")[1].split("-"))
+        return {"Body": io.BytesIO(self.data[start:end + 1])}
+
+
+@pytest.fixture
+def advice(monkeypatch):
+    calls = []
+    real = os.posix_fadvise
+    names = {getattr(os, n): n[len("POSIX_FADV_"):] for n in dir(os) if n.startswith("POSIX_FADV_")}
+
+    def record(fd, offset, length, value):
+        calls.append((names[value], offset, length))
+        real(fd, offset, length, value)
+
+    monkeypatch.setattr("cos.transfer.os.posix_fadvise", record)
+    yield calls
+    configure_cache_policy()
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_upload_hints_follow_the_policy(tmp_path, advice, use_mmap):
+    local = tmp_path / "src.bin"
+    local.write_bytes(os.urandom(3 * MB))
+
+    def upload():
+        upload_file_multipart_with_progress(
+            MemoryClient(), "b", "k", local, MB, lambda *a: None, concurrency=1, use_mmap=use_mmap,
+        )
+
+    upload()
+    assert advice == []
+
+    configure_cache_policy("sequential")
+    upload()
+    assert advice[0] == ("SEQUENTIAL", 0, 0)
+    assert [a for a in advice if a[0] == "WILLNEED"] == [("WILLNEED", i * MB, MB) for i in range(3)]
+    assert not any(a[0] == "DONTNEED" for a in advice)
+
+    advice.clear()
+    configure_cache_policy("drop")
+    upload()
+    # Each part is dropped once it has been sent
+    assert [a for a in advice if a[0] == "DONTNEED"] == [("DONTNEED", i * MB, MB) for i in range(3)]
+
+
+def test_download_drops_written_ranges(tmp_path, advice):
+    data = os.urandom(2 * MB + 5)
+    configure_cache_policy("drop")
+    download_file_in_ranges_with_progress(
+        MemoryClient(data), "b", "k", tmp_path / "out", len(data), MB, lambda *a: None,
+        resume=False, concurrency=1,
+    )
+    assert (tmp_path / "out").read_bytes() == data
+    assert advice == [("DONTNEED", 0, MB), ("DONTNEED", MB, MB), ("DONTNEED", 2 * MB, 5), ("DONTNEED", 0, 0)]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(COSError):
+        configure_cache_policy("aggressive")
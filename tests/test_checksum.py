@@ -0,0 +1,232 @@
+import hashlib
+import io
+import os
+
+import crcmod
+import pytest
+
+from cos.checksum import PartChecksums, StreamDigest, header_crc64, inline_crc64, verify_checksum, verify_crc64
+from cos.client import COSClient
+from cos.crc64 import CRC64, _crc64_py, _crc64_slice8, crc64, crc64_combine, file_crc64
+from cos.exceptions import ChecksumError
+from cos.retry import RetryPolicy
+from cos.transfer import (
+    StreamDownloadJob,
+    StreamUploadJob,
+    download_file_in_ranges_with_progress,
+    download_job,
+    download_temp_path,
+    run_transfers,
+    upload_file_multipart_with_progress,
+    upload_job,
+)
+
+# Independent reference: the definition the COS SDK uses
+reference_crc = crcmod.mkCrcFun(0x142F0E1EBA9EA3693, initCrc=0, xorOut=0xFFFFFFFFFFFFFFFF, rev=True)
+
+
+class CRCServer:
+    """In-memory COS that returns ``x-cos-hash-crc64ecma`` like the service."""
+
+    def __init__(self, corrupt_parts=0, corrupt_object=False, corrupt_body=False):
+        self.objects = {}
+        self.uploads = {}
+        self.corrupt_parts = corrupt_parts
+        self.corrupt_object = corrupt_object
+        self.corrupt_body = corrupt_body
+        self.part_calls = 0
+
+    def _header(self, data):
+        crc = reference_crc(data) ^ (1 if self.corrupt_object else 0)
+        return {"x-cos-hash-crc64ecma": str(crc)}
+
+    def create_multipart_upload(self, Bucket, Key):
+        self.uploads[Key] = {}
+        return {"UploadId": "u1"}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        self.part_calls += 1
+        data = Body.read() if hasattr(Body, "read") else bytes(Body)
+        data = bytes(data)
+        if self.corrupt_parts:
+            # Bytes damaged in flight: the server hashes what it received
+            self.corrupt_parts -= 1
+            data = b"\0" + data[1:]
+        self.uploads[Key][PartNumber] = data
+        return {"ETag": f'"e{PartNumber}"', "x-cos-hash-crc64ecma": str(reference_crc(data))}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(Key)
+        self.objects[Key] = b"".join(parts[pn] for pn in sorted(parts))
+        return {"ETag": '"done-2"', **self._header(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = bytes(Body)
+        return {"ETag": '"put"', **self._header(self.objects[Key])}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(Key, None)
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[Key]
+        start, end = (int(x) for x in Range.split("=")[1].split("-")) if Range else (0, len(data) - 1)
+        body = data[start:end + 1]
+        if self.corrupt_body:
+            # Damaged after COS hashed it
+            body = bytes([body[0] ^ 1]) + body[1:]
+        return {"Body": io.BytesIO(body), **self._header(data)}
+
+
+def test_crc64_matches_cos_definition():
+    data = os.urandom(100_000)
+    assert crc64(b"123456789") == 0x995DC9BBDF1939FA
+    assert crc64(data) == reference_crc(data) == _crc64_py(data)
+    assert crc64(data[500:], crc64(data[:500])) == crc64(data)
+    hasher = CRC64(data[:10])
+    hasher.update(data[10:])
+    assert hasher.digest() == crc64(data)
+
+
+@pytest.mark.parametrize("length", [0, 1, 7, 8, 9, 63, 64, 1000, 4099])
+def test_slice_by_8_matches_bytewise(length):
+    data = os.urandom(length)
+    assert _crc64_slice8(data) == _crc64_py(data) == reference_crc(data)
+    assert _crc64_slice8(data[length // 2:], _crc64_slice8(data[:length // 2])) == reference_crc(data)
+
+
+def test_file_crc64_and_large_combine(tmp_path):
+    data = os.urandom(300_000)
+    path = tmp_path / "f"
+    path.write_bytes(data)
+    assert file_crc64(path, block_size=4096) == reference_crc(data)
+    # Lengths with many set bits reuse the cached zero operators
+    for split in (1, 65_535, 131_071, 299_999):
+        assert crc64_combine(crc64(data[:split]), crc64(data[split:]), len(data) - split) == reference_crc(data)
+
+
+def test_inline_crc_is_skipped_without_fast_backend(monkeypatch):
+    assert inline_crc64(b"abc") == reference_crc(b"abc")
+    assert inline_crc64(b"abc", None) is None
+    monkeypatch.setattr("cos.checksum.FAST_CRC64", False)
+    assert inline_crc64(b"abc") is None
+    digest = StreamDigest()
+    digest.update(b"abc")
+    assert digest.result() == (None, hashlib.md5(b"abc").hexdigest())
+
+
+def test_crc64_combine_and_part_checksums():
+    a, b, c = os.urandom(1000), os.urandom(1), os.urandom(4096)
+    assert crc64_combine(crc64(a), crc64(b), len(b)) == crc64(a + b)
+    assert crc64_combine(crc64(a), 0, 0) == crc64(a)
+    parts = PartChecksums()
+    # Recorded out of order, combined by offset
+    parts.add(1001, crc64(c), len(c))
+    assert parts.combined(len(a + b + c)) is None
+    parts.add(0, crc64(a), len(a))
+    parts.add(1000, crc64(b), len(b))
+    assert parts.combined(len(a + b + c)) == crc64(a + b + c)
+
+
+def test_stream_digest_and_header_checks():
+    digest = StreamDigest()
+    digest.update(b"hello ")
+    digest.update(memoryview(b"world"))
+    assert digest.result() == (crc64(b"hello world"), hashlib.md5(b"hello world").hexdigest())
+    assert header_crc64({"X-Cos-Hash-Crc64ecma": "42"}) == 42
+    assert header_crc64({"ETag": "x"}) is None
+    verify_crc64({}, 1, "obj")
+    with pytest.raises(ChecksumError):
+        verify_crc64({"x-cos-hash-crc64ecma": "2"}, 1, "obj")
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_multipart_upload_is_verified_without_rereading(tmp_path, use_mmap):
+    data = os.urandom(3 * 1024 * 1024 + 11)
+    local = tmp_path / "up.bin"
+    local.write_bytes(data)
+    server = CRCServer(corrupt_parts=1)
+    checksum = upload_file_multipart_with_progress(
+        server, "b", "up.bin", local, 1024 * 1024, lambda *a: None,
+        retry_backoff=0, retry_backoff_max=0, use_mmap=use_mmap,
+    )
+    # The damaged part was detected from its CRC and sent again
+    assert server.part_calls == 5
+    assert server.objects["up.bin"] == data
+    assert checksum.crc64 == reference_crc(data)
+
+    with pytest.raises(ChecksumError):
+        upload_file_multipart_with_progress(
+            CRCServer(corrupt_object=True), "b", "up.bin", local, 1024 * 1024, lambda *a: None,
+            use_mmap=use_mmap,
+        )
+
+
+def test_ranged_download_is_verified(tmp_path):
+    data = os.urandom(2 * 1024 * 1024 + 5)
+    server = CRCServer()
+    server.objects["obj"] = data
+    dest = tmp_path / "obj"
+    checksum = download_file_in_ranges_with_progress(
+        server, "b", "obj", dest, len(data), 1024 * 1024, lambda *a: None, resume=False,
+    )
+    assert checksum.crc64 == reference_crc(data)
+    assert dest.read_bytes() == data
+
+    server.corrupt_object = True
+    with pytest.raises(ChecksumError):
+        download_file_in_ranges_with_progress(
+            server, "b", "obj", tmp_path / "bad", len(data), 1024 * 1024, lambda *a: None,
+            resume=False,
+        )
+
+
+def test_small_transfers_are_verified(tmp_path):
+    data = os.urandom(1000)
+    src = tmp_path / "src"
+    src.write_bytes(data)
+    server = CRCServer()
+    client = COSClient(server, "b", retry=RetryPolicy(0, 0, 0))
+    run_transfers([upload_job(client, src, "small")])
+    run_transfers([download_job(client, "small", tmp_path / "ok", len(data))])
+    assert (tmp_path / "ok").read_bytes() == data
+
+    server.corrupt_body = True
+    dest = tmp_path / "bad"
+    with pytest.raises(ChecksumError):
+        run_transfers([download_job(client, "small", dest, len(data))])
+    assert not dest.exists() and not download_temp_path(dest).exists()
+
+    server.corrupt_body, server.corrupt_object = False, True
+    with pytest.raises(ChecksumError):
+        run_transfers([upload_job(client, src, "small")])
+
+
+def test_md5_etag_is_checked_without_crc64():
+    digest = StreamDigest()
+    digest.update(b"abc")
+    md5 = hashlib.md5(b"abc").hexdigest()
+    md5_only = digest.result()._replace(crc64=None)
+    verify_checksum({"ETag": f'"{md5}"'}, md5_only, "x")
+    # Multipart and encrypted ETags are not content MD5s
+    verify_checksum({"ETag": '"0123-2"'}, md5_only, "x")
+    verify_checksum({"ETag": f'"{"0" * 32}"', "x-cos-server-side-encryption": "AES256"}, md5_only, "x")
+    with pytest.raises(ChecksumError):
+        verify_checksum({"ETag": f'"{"0" * 32}"'}, md5_only, "x")
+
+
+def test_stream_transfers_return_md5_and_crc64():
+    data = os.urandom(2 * 1024 * 1024 + 100)
+    server = CRCServer()
+    up = StreamUploadJob(server, "b", "s", io.BytesIO(data), 1024 * 1024, concurrency=2)
+    run_transfers([up], concurrency=2)
+    assert up.checksum == (reference_crc(data), hashlib.md5(data).hexdigest())
+
+    small = StreamUploadJob(server, "b", "small", io.BytesIO(b"abc"), 1024 * 1024)
+    run_transfers([small])
+    assert small.checksum.md5 == hashlib.md5(b"abc").hexdigest()
+
+    out = io.BytesIO()
+    down = StreamDownloadJob(server, "b", "s", out, len(data), 1024 * 1024, concurrency=2)
+    run_transfers([down], concurrency=2)
+    assert out.getvalue() == data
+    assert down.checksum == up.checksum
@@ -14,6 +14,7 @@ from cos.commands.mv import mv
 from cos.commands.rm import rm
 from cos.commands.presign import presign
 from cos.commands.sync import sync
+from cos.exceptions import COSError
 
 
 # ============================================================================
@@ -45,7 +46,11 @@ def mock_cos_client():
         ]
     })
     client.upload_file = Mock(return_value={"ETag": "test-etag"})
-    client.download_file = Mock(return_value={"ETag": "test-etag"})
+    # Like the SDK, a download creates the file it is given
+    def write_download(key, local_path, *args, **kwargs):
+        Path(local_path).write_bytes(b"")
+        return {"ETag": "test-etag"}
+    client.download_file = Mock(side_effect=write_download)
     client.delete_object = Mock(return_value={})
     client.copy_object = Mock(return_value={"ETag": "test-etag"})
     return client
@@ -219,6 +224,27 @@ class TestCpCommand:
         assert result.exit_code == 0
         mock_cos_client.upload_file.assert_called()
     
+    @patch('cos.commands.cp.ConfigManager')
+    @patch('cos.commands.cp.COSAuthenticator')
+    @patch('cos.commands.cp.COSClient')
+    def test_cp_upload_with_auto_concurrency(self, mock_client_class, mock_auth_class,
+                                             mock_config_class, cli_runner, mock_cos_client,
+                                             mock_authenticator, mock_config_manager, temp_test_file):
+        """Test --concurrency auto uploads and reports the concurrency it settled on"""
+        mock_config_class.return_value = mock_config_manager
+        mock_auth_class.return_value = mock_authenticator
+        mock_client_class.return_value = mock_cos_client
+        
+        result = cli_runner.invoke(cp, [
+            temp_test_file,
+            'cos://test-bucket/test.txt',
+            '--no-progress', '--concurrency', 'auto'
+        ], obj={"profile": "default"})
+        
+        assert result.exit_code == 0
+        mock_cos_client.upload_file.assert_called()
+        assert "Concurrency settled at" in result.output
+    
     @patch('cos.commands.cp.ConfigManager')
     @patch('cos.commands.cp.COSAuthenticator')
     @patch('cos.commands.cp.COSClient')
@@ -242,6 +268,33 @@ class TestCpCommand:
             assert result.exit_code == 0
             mock_cos_client.download_file.assert_called()
     
+    @patch('cos.commands.cp.ConfigManager')
+    @patch('cos.commands.cp.COSAuthenticator')
+    @patch('cos.commands.cp.COSClient')
+    def test_cp_stdin_and_stdout_streams(self, mock_client_class, mock_auth_class,
+                                         mock_config_class, cli_runner, mock_cos_client,
+                                         mock_authenticator, mock_config_manager, mock_cos_s3_client):
+        """Test `cp -` uploads stdin and `cp <uri> -` writes only the object to stdout"""
+        import io
+        mock_config_class.return_value = mock_config_manager
+        mock_auth_class.return_value = mock_authenticator
+        mock_client_class.return_value = mock_cos_client
+        
+        result = cli_runner.invoke(cp, ['-', 'cos://test-bucket/dump.sql'],
+                                   input=b"SELECT 1;\n", obj={"profile": "default"})
+        assert result.exit_code == 0
+        put = mock_cos_s3_client.put_object.call_args[1]
+        assert (put["Key"], put["Body"]) == ("dump.sql", b"SELECT 1;\n")
+        
+        mock_cos_client.head_object.return_value = {"Content-Length": "10"}
+        mock_cos_s3_client.get_object.side_effect = lambda **kw: {"Body": io.BytesIO(b"SELECT 1;\n")}
+        result = cli_runner.invoke(cp, ['cos://test-bucket/dump.sql', '-'], obj={"profile": "default"})
+        assert result.exit_code == 0
+        assert result.stdout_bytes == b"SELECT 1;\n"
+        
+        result = cli_runner.invoke(cp, ['-', './local.txt'], obj={"profile": "default"})
+        assert result.exit_code == 1
+    
     @patch('cos.commands.cp.ConfigManager')
     @patch('cos.commands.cp.COSAuthenticator')
     @patch('cos.commands.cp.COSClient')
@@ -313,6 +366,40 @@ class TestMvCommand:
         mock_cos_client.copy_object.assert_called()
         mock_cos_client.delete_object.assert_called()
     
+    @patch('cos.commands.mv.ConfigManager')
+    @patch('cos.commands.mv.COSAuthenticator')
+    @patch('cos.commands.mv.COSClient')
+    def test_mv_recursive_deletes_only_copied_sources(self, mock_client_class, mock_auth_class,
+                                                      mock_config_class, cli_runner, mock_cos_client,
+                                                      mock_authenticator, mock_config_manager):
+        """Test recursive mv keeps sources whose copy failed and batches deletes"""
+        mock_config_class.return_value = mock_config_manager
+        mock_auth_class.return_value = mock_authenticator
+        mock_client_class.return_value = mock_cos_client
+        mock_cos_client.list_objects.return_value = {
+            "Contents": [{"Key": f"dir/{name}", "Size": 10} for name in ("a", "b", "c")]
+        }
+
+        def copy_object(src_bucket, src_key, dst_bucket, dst_key):
+            if src_key == "dir/b":
+                raise COSError("copy failed")
+            return {}
+
+        mock_cos_client.copy_object.side_effect = copy_object
+        mock_cos_client.delete_objects.return_value = {}
+
+        result = cli_runner.invoke(mv, [
+            'cos://test-bucket/dir/',
+            'cos://test-bucket/new/',
+            '-r', '--no-progress', '--concurrency', '3'
+        ], obj={"profile": "default"})
+
+        assert result.exit_code == 1
+        assert mock_cos_client.copy_object.call_count == 3
+        mock_cos_client.delete_objects.assert_called_once()
+        assert sorted(mock_cos_client.delete_objects.call_args[0][0]) == ["dir/a", "dir/c"]
+        assert "dir/b" in result.output
+
     @patch('cos.commands.mv.ConfigManager')
     @patch('cos.commands.mv.COSAuthenticator')
     @patch('cos.commands.mv.COSClient')
@@ -622,6 +709,36 @@ class TestSyncCommand:
         
         assert result.exit_code == 0
 
+    
+    @patch('cos.commands.sync.ConfigManager')
+    @patch('cos.commands.sync.COSAuthenticator')
+    @patch('cos.commands.sync.COSClient')
+    def test_sync_checksum_compares_multipart_objects_by_crc64(
+            self, mock_client_class, mock_auth_class, mock_config_class, cli_runner,
+            mock_cos_client, mock_authenticator, mock_config_manager, tmp_path):
+        """Test sync --checksum skips multipart objects whose CRC64 matches"""
+        mock_config_class.return_value = mock_config_manager
+        mock_auth_class.return_value = mock_authenticator
+        mock_client_class.return_value = mock_cos_client
+        
+        (tmp_path / "same.bin").write_bytes(b"123456789")
+        (tmp_path / "changed.bin").write_bytes(b"123456780")
+        mock_cos_client.list_objects.return_value = {
+            "Contents": [
+                {"Key": "sync/same.bin", "Size": 9, "ETag": '"abc-2"'},
+                {"Key": "sync/changed.bin", "Size": 9, "ETag": '"def-2"'},
+            ]
+        }
+        mock_cos_client.head_object.return_value = {"x-cos-hash-crc64ecma": str(0x995DC9BBDF1939FA)}
+        
+        result = cli_runner.invoke(sync, [
+            str(tmp_path), 'cos://test-bucket/sync/', '--checksum', '--no-progress'
+        ], obj={"profile": "default"})
+        
+        assert result.exit_code == 0
+        assert "CHECKSUM DIFF: changed.bin" in result.output
+        assert "same.bin" not in result.output
+        assert mock_cos_client.upload_file.call_count == 1
 
 # ============================================================================
 # INTEGRATION TESTS
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from cos.connections import ConnectionRegistry, configure_connections, get_connection_registry, pool_size_for
+from cos.constants import CONNECT_TIMEOUT, DEFAULT_POOL_SIZE, POOL_HEADROOM, READ_TIMEOUT
+from cos.scheduler import AdaptiveConcurrency
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_size_follows_concurrency():
+    assert pool_size_for(None) == DEFAULT_POOL_SIZE
+    assert pool_size_for(4) == DEFAULT_POOL_SIZE
+    assert pool_size_for(32) == 32 + POOL_HEADROOM
+    assert pool_size_for(AdaptiveConcurrency(2, 1, 24)) == 24 + POOL_HEADROOM
+
+
+def test_sessions_are_shared_per_profile_and_region():
+    registry = ConnectionRegistry()
+    session = registry.session("default", "ap-shanghai")
+    assert registry.session("default", "ap-shanghai") is session
+    assert registry.session("default", "ap-guangzhou") is not session
+    assert registry.session("other", "ap-shanghai") is not session
+    registry.close()
+
+
+def test_workers_reuse_pooled_connections(http_url):
+    registry = ConnectionRegistry()
+    session = registry.session("default", "local")
+    registry.resize(pool_size_for(16))
+    # Shrinking is ignored: clients already bound keep their capacity
+    registry.resize(4)
+    assert registry.pool_size == 16 + POOL_HEADROOM
+
+    with ThreadPoolExecutor(16) as pool:
+        for _ in range(10):
+            list(pool.map(lambda _: session.get(http_url).content, range(16)))
+
+    stats = registry.stats()
+    assert stats.requests == 160
+    # Every worker keeps its connection instead of reconnecting
+    assert stats.connections <= 16
+    assert "160 request(s)" in stats.summary()
+    registry.close()
+
+
+def test_resize_keeps_counters(http_url):
+    registry = ConnectionRegistry()
+    session = registry.session("default", "local")
+    session.get(http_url)
+    registry.resize(DEFAULT_POOL_SIZE + 8)
+    session.get(http_url)
+    assert registry.stats().requests == 2
+    assert ConnectionRegistry().stats().summary() is None
+    registry.close()
+
+
+def test_authenticated_clients_share_the_registry_session():
+    from cos.auth import COSAuthenticator
+
+    config_manager = Mock(profile="conn-test")
+    config_manager.get_credentials.return_value = {"secret_id": "id", "secret_key": "key"}
+    first = COSAuthenticator(config_manager).authenticate("ap-shanghai")
+    second = COSAuthenticator(config_manager).authenticate("ap-shanghai")
+    expected = get_connection_registry().session("conn-test", "ap-shanghai")
+    assert first._session is second._session is expected
+    assert first.get_conf()._timeout == (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+
+def test_pool_is_sized_for_the_larger_concurrency_before_authenticating():
+    from cos.auth import COSAuthenticator
+
+    size = configure_connections(AdaptiveConcurrency(2, 1, 8), 96)
+    assert size == get_connection_registry().pool_size >= 96 + POOL_HEADROOM
+    config_manager = Mock(profile="conn-size-test")
+    config_manager.get_credentials.return_value = {"secret_id": "id", "secret_key": "key"}
+    client = COSAuthenticator(config_manager).authenticate("ap-shanghai")
+    assert client.get_conf()._pool_maxsize == size
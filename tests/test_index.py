@@ -0,0 +1,183 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from cos.client import COSClient
+from cos.commands.index import index
+from cos.commands.sync import sync
+from cos.exceptions import ObjectNotFoundError
+from cos.index import configure_index, confirm_objects, get_listing_index, indexed_objects
+
+
+class BucketClient:
+    """COSClient stand-in serving one bucket's objects in a single page."""
+
+    bucket = "b"
+
+    def __init__(self, objects):
+        self.objects = dict(objects)
+        self.listed = 0
+
+    def list_objects(self, prefix="", delimiter="", max_keys=1000, marker="", bucket=None):
+        self.listed += 1
+        return {"Contents": [
+            {"Key": k, "Size": s, "ETag": f'"{k}"', "LastModified": "2024-01-01T12:00:00.000Z", "StorageClass": "STANDARD"}
+            for k, s in sorted(self.objects.items()) if k.startswith(prefix)
+        ]}
+
+    def head_object(self, key, bucket=None):
+        if key not in self.objects:
+            raise ObjectNotFoundError(key)
+        return {"Content-Length": str(self.objects[key]), "ETag": f'"{key}"',
+                "Last-Modified": "Mon, 01 Jan 2024 12:00:00 GMT"}
+
+
+@pytest.fixture
+def listing_index(tmp_path):
+    configure_index(tmp_path / "index.db")
+    yield get_listing_index(create=True)
+    configure_index()
+
+
+def keys(entries):
+    return [e["Key"] for e in entries]
+
+
+def test_refresh_upserts_and_sweeps(listing_index):
+    client = BucketClient({"logs/a": 1, "logs/b": 2, "other": 3})
+    assert listing_index.refresh(client, "b", "logs/") == 2
+    entry = next(listing_index.iter_objects("b", "logs/"))
+    assert entry == {"Key": "logs/a", "Size": 1, "ETag": '"logs/a"',
+                     "LastModified": "2024-01-01T12:00:00.000Z", "StorageClass": "STANDARD"}
+
+    del client.objects["logs/a"]
+    client.objects["logs/c"] = 4
+    listing_index.refresh(client, "b", "logs/")
+    assert keys(listing_index.iter_objects("b")) == ["logs/b", "logs/c"]
+    assert keys(listing_index.iter_objects("b", "logs/", start_after="logs/b")) == ["logs/c"]
+    [status] = listing_index.listings()
+    assert (status.prefix, status.objects, status.size) == ("logs/", 2, 6)
+
+
+
+def test_failed_refresh_keeps_the_previous_listing(listing_index):
+    class FailsMidway(BucketClient):
+        def list_objects(self, **kwargs):
+            page = super().list_objects(**kwargs)
+            if self.listed > 1:
+                raise RuntimeError("listing failed")
+            return {"Contents": page["Contents"][:2], "IsTruncated": "true", "NextMarker": page["Contents"][1]["Key"]}
+
+    listing_index.refresh(BucketClient({"logs/a": 1, "logs/b": 2, "logs/c": 3}), "b", "logs/")
+    [before] = listing_index.listings()
+    with patch("cos.index.REFRESH_BATCH", 1), pytest.raises(RuntimeError):
+        listing_index.refresh(FailsMidway({"logs/a": 10, "logs/b": 20}), "b", "logs/")
+    assert [(e["Key"], e["Size"]) for e in listing_index.iter_objects("b")] == [("logs/a", 1), ("logs/b", 2), ("logs/c", 3)]
+    assert listing_index.listings() == [before]
+    # The connection is usable again
+    listing_index.record_object("b", "logs/d", 4)
+    assert listing_index.lookup("b", "logs/d")["Size"] == 4
+
+def test_indexed_objects_refresh_only_when_stale(listing_index):
+    client = BucketClient({"logs/a": 1})
+    assert keys(indexed_objects(client, "b", "logs/")) == ["logs/a"]
+    client.objects["logs/b"] = 1
+    # A narrower prefix is covered by the fresh listing
+    assert keys(indexed_objects(client, "b", "logs/")) == ["logs/a"]
+    assert keys(indexed_objects(client, "b", "logs/a")) == ["logs/a"]
+    assert client.listed == 1
+    assert keys(indexed_objects(client, "b", "logs/", ttl=0)) == ["logs/a", "logs/b"]
+    assert client.listed == 2
+
+
+def test_uploads_copies_and_deletes_write_through(listing_index, tmp_path):
+    listing_index.refresh(BucketClient({"data/old": 5}), "b", "data/")
+    raw = Mock()
+    # Small files are sent with a single PUT
+    raw.put_object.return_value = {"ETag": '"new-etag"'}
+    raw.copy_object.return_value = {"ETag": '"copy-etag"'}
+    raw.delete_objects.return_value = {"Error": {"Key": "data/kept", "Code": "AccessDenied"}}
+    client = COSClient(raw, "b")
+    local = tmp_path / "f"
+    local.write_bytes(b"12345678")
+
+    client.upload_file(str(local), "data/new")
+    client.upload_file(str(local), "elsewhere/new")
+    client.copy_object("b", "data/new", "b", "data/copy")
+    entry = listing_index.lookup("b", "data/new")
+    assert (entry["Size"], entry["ETag"]) == (8, '"new-etag"')
+    assert listing_index.lookup("b", "elsewhere/new") is None
+    assert listing_index.lookup("b", "data/copy")["Size"] == 8
+
+    client.delete_object("data/old")
+    client.upload_file(str(local), "data/kept")
+    client.delete_objects(["data/copy", "data/kept"])
+    assert keys(listing_index.iter_objects("b")) == ["data/kept", "data/new"]
+
+    # A copy of an unindexed source cannot be sized: the listing goes stale
+    client.copy_object("b", "elsewhere/new", "b", "data/unknown")
+    assert not listing_index.is_fresh("b", "data/")
+
+
+def test_confirm_objects_heads_only_large_objects(listing_index):
+    client = BucketClient({"big": 300, "gone-small": 1})
+    listing_index.refresh(BucketClient({"big": 100, "gone": 200, "gone-small": 1}), "b")
+    client.head_object = Mock(side_effect=client.head_object)
+    confirmed = confirm_objects(client, listing_index.iter_objects("b"), min_size=100)
+    assert [(o["Key"], o["Size"]) for o in confirmed] == [("big", 300), ("gone-small", 1)]
+    assert client.head_object.call_count == 2
+    # HEAD results are written back
+    assert listing_index.lookup("b", "big")["Size"] == 300
+    assert listing_index.lookup("b", "gone") is None
+
+
+def test_index_commands(listing_index):
+    runner = CliRunner()
+    with patch("cos.commands.index.ConfigManager"), patch("cos.commands.index.COSAuthenticator"), \
+            patch("cos.commands.index.COSClient") as client_class:
+        client_class.return_value = BucketClient({"logs/a": 10, "logs/b": 20})
+        result = runner.invoke(index, ["refresh", "cos://b/logs/", "--list-concurrency", "2"], obj={})
+    assert result.exit_code == 0, result.output
+    assert "Indexed 2 objects" in result.output
+
+    result = runner.invoke(index, ["status"], obj={"output": "json"})
+    assert result.exit_code == 0 and '"cos://b/logs/"' in result.output and '"Objects": 2' in result.output
+
+    result = runner.invoke(index, ["clear", "cos://b/"], obj={})
+    assert result.exit_code == 0
+    assert listing_index.listings() == []
+    assert list(listing_index.iter_objects("b")) == []
+
+
+def test_no_index_file_means_no_database(tmp_path):
+    configure_index(tmp_path / "missing.db")
+    try:
+        assert get_listing_index() is None
+        COSClient(Mock(), "b").delete_object("k")
+        assert not (tmp_path / "missing.db").exists()
+    finally:
+        configure_index()
+
+
+def test_sync_use_index_confirms_before_deleting_local_files(listing_index, tmp_path):
+    remote = BucketClient({"dir/a.txt": 1})
+    listing_index.refresh(remote, "b", "dir/")
+    # Uploaded by someone else after the refresh: the index does not know it
+    remote.objects["dir/new.txt"] = 3
+    remote.download_file = Mock(side_effect=lambda key, path, *a, **k: open(path, "wb").close())
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "a.txt").write_bytes(b"a")
+    (local / "new.txt").write_bytes(b"new")
+    (local / "stale.txt").write_bytes(b"x")
+
+    with patch("cos.commands.sync.ConfigManager"), patch("cos.commands.sync.COSAuthenticator"), \
+            patch("cos.commands.sync.COSClient", return_value=remote):
+        result = CliRunner().invoke(
+            sync, ["cos://b/dir/", str(local), "--delete", "--use-index", "--size-only", "--no-progress"],
+            obj={"profile": "default"},
+        )
+    assert result.exit_code == 0, result.output
+    assert remote.listed == 1
+    assert sorted(p.name for p in local.iterdir()) == ["a.txt", "new.txt"]
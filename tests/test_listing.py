@@ -0,0 +1,172 @@
+import threading
+from itertools import islice
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from cos.commands.ls import ls
+from cos.exceptions import COSError
+from cos.listing import (
+    ListPartition,
+    decode_token,
+    discover_partitions,
+    encode_token,
+    iter_objects,
+    iter_objects_parallel,
+    split_partition,
+)
+
+
+class PagedClient:
+    """Serves ``keys`` like ListObjects: sorted, ``max_keys`` per page, after ``marker``."""
+
+    def __init__(self, keys, next_marker=True):
+        self.keys = sorted(keys)
+        self.next_marker = next_marker
+        self.calls = []
+
+    def list_objects(self, prefix="", delimiter="", max_keys=1000, marker="", bucket=None):
+        self.calls.append(marker)
+        entries = []
+        for key in self.keys:
+            if not key.startswith(prefix) or key <= marker:
+                continue
+            cut = key.find(delimiter, len(prefix)) if delimiter else -1
+            entry = ("P", key[:cut + 1]) if cut >= 0 else ("K", key)
+            if entries and entries[-1] == entry:
+                continue
+            if entry[0] == "P" and marker.startswith(entry[1]):
+                continue
+            entries.append(entry)
+        page, rest = entries[:max_keys], entries[max_keys:]
+        response = {
+            "Contents": [{"Key": k, "Size": len(k)} for kind, k in page if kind == "K"],
+            "CommonPrefixes": [{"Prefix": p} for kind, p in page if kind == "P"],
+            "IsTruncated": "true" if rest else "false",
+        }
+        if rest and self.next_marker:
+            response["NextMarker"] = page[-1][1]
+        return response
+
+
+KEYS = [f"logs/{d}/{i:03d}.log" for d in ("a", "b") for i in range(7)] + ["logs/top.txt", "other.txt"]
+
+
+@pytest.mark.parametrize("next_marker", [True, False])
+def test_iter_objects_follows_every_page(next_marker):
+    client = PagedClient(KEYS, next_marker=next_marker)
+    keys = [obj["Key"] for obj in iter_objects(client, prefix="logs/", page_size=4)]
+    assert keys == sorted(k for k in KEYS if k.startswith("logs/"))
+    assert len(client.calls) == 4
+    assert client.calls[0] == ""
+
+
+def test_iter_objects_is_lazy_and_honours_start_after():
+    client = PagedClient(KEYS)
+    entries = iter_objects(client, prefix="logs/", page_size=3, start_after="logs/a/004.log")
+    assert next(entries)["Key"] == "logs/a/005.log"
+    assert len(client.calls) == 1
+
+
+def test_iter_objects_with_delimiter_merges_prefixes_in_key_order():
+    client = PagedClient(KEYS)
+    entries = list(iter_objects(client, prefix="logs/", delimiter="/", page_size=1))
+    assert entries == [{"Prefix": "logs/a/"}, {"Prefix": "logs/b/"}, {"Key": "logs/top.txt", "Size": 12}]
+
+
+def test_iter_objects_stops_when_the_marker_does_not_advance():
+    client = Mock()
+    client.list_objects.return_value = {"Contents": [], "IsTruncated": "true"}
+    assert list(iter_objects(client)) == []
+    assert client.list_objects.call_count == 1
+
+
+def test_starting_token_round_trip():
+    assert decode_token(encode_token("logs/a/ä.log")) == "logs/a/ä.log"
+    with pytest.raises(COSError):
+        decode_token("not-a-token")
+
+
+@patch("cos.commands.ls.ConfigManager")
+@patch("cos.commands.ls.COSAuthenticator")
+@patch("cos.commands.ls.COSClient")
+def test_ls_max_items_resumes_from_next_token(mock_client_class, mock_auth_class, mock_config_class):
+    mock_config_class.return_value.get_output_format.return_value = "text"
+    mock_client_class.return_value = PagedClient(KEYS)
+    runner = CliRunner()
+
+    listed, token = [], None
+    for _ in range(10):
+        args = ["cos://bucket/logs/", "-r", "--max-items", "5"]
+        if token:
+            args += ["--starting-token", token]
+        result = runner.invoke(ls, args, obj={"profile": "default"})
+        assert result.exit_code == 0, result.output
+        lines = result.output.split()
+        token = lines[lines.index("NextToken:") + 1] if "NextToken:" in lines else None
+        listed += [line for line in lines if line.startswith("logs/")]
+        if token is None:
+            break
+    assert listed == sorted(k for k in KEYS if k.startswith("logs/"))
+
+
+def keyspaces():
+    nested = [f"data/{d}/{i:04d}.bin" for d in ("x", "y") for i in range(30)] + ["data/readme", "top.txt"]
+    flat = [f"{c}{i:03d}" for c in "0aZ_~" for i in range(20)] + ["", "été"]
+    wide = [f"d{i:02d}/f{j}" for i in range(25) for j in range(3)] + ["d/", "d05/"]
+    return {"nested": nested, "flat": [k for k in flat if k], "wide": wide}
+
+
+@pytest.mark.parametrize("shape", ["nested", "flat", "wide"])
+def test_parallel_listing_matches_serial_listing(shape):
+    keys = keyspaces()[shape]
+    client = PagedClient(keys)
+    assert [o["Key"] for o in iter_objects_parallel(client, concurrency=4, page_size=7)] == sorted(keys)
+    unordered = [o["Key"] for o in iter_objects_parallel(client, concurrency=4, ordered=False, page_size=7)]
+    assert sorted(unordered) == sorted(keys) and len(unordered) == len(keys)
+
+
+def test_partitions_cover_the_keyspace_without_overlap():
+    partitions, loose = discover_partitions(PagedClient(keyspaces()["nested"]), want=8)
+    # Descended through data/ (one prefix), then split x/ and y/ on key characters
+    assert [o["Key"] for o in loose] == ["data/readme", "top.txt"]
+    assert {p.prefix for p in partitions} == {"data/x/", "data/y/"} and len(partitions) == 8
+    for a, b in zip(partitions, partitions[1:]):
+        assert a.prefix != b.prefix or a.end == b.start_after
+    assert split_partition(ListPartition("p/"), 1) == [ListPartition("p/")]
+
+
+def test_parallel_listing_resumes_after_a_key():
+    keys = keyspaces()["nested"]
+    listed = [o["Key"] for o in iter_objects_parallel(
+        PagedClient(keys), concurrency=3, page_size=5, start_after="data/x/0017.bin")]
+    assert listed == [k for k in sorted(keys) if k > "data/x/0017.bin"]
+
+
+def test_parallel_listing_raises_worker_errors_and_stops_early():
+    class Failing(PagedClient):
+        def list_objects(self, prefix="", **kwargs):
+            if prefix == "data/y/" and kwargs.get("marker"):
+                raise COSError("listing failed")
+            return super().list_objects(prefix=prefix, **kwargs)
+
+    with pytest.raises(COSError, match="listing failed"):
+        list(iter_objects_parallel(Failing(keyspaces()["nested"]), concurrency=4, page_size=3))
+
+    entries = iter_objects_parallel(PagedClient(keyspaces()["flat"]), concurrency=4, page_size=2)
+    assert len(list(islice(entries, 3))) == 3
+    entries.close()
+    assert not [t for t in threading.enumerate() if t.name.startswith("cos-list-")]
+
+
+@patch("cos.commands.ls.ConfigManager")
+@patch("cos.commands.ls.COSAuthenticator")
+@patch("cos.commands.ls.COSClient")
+def test_ls_recursive_with_list_concurrency_stays_in_key_order(mock_client_class, mock_auth_class, mock_config_class):
+    mock_config_class.return_value.get_output_format.return_value = "text"
+    keys = keyspaces()["wide"]
+    mock_client_class.return_value = PagedClient(keys)
+    result = CliRunner().invoke(ls, ["cos://bucket/", "-r", "--list-concurrency", "8"], obj={"profile": "default"})
+    assert result.exit_code == 0, result.output
+    assert result.output.split() == sorted(keys)
@@ -0,0 +1,138 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cos.constants import MIN_PART_SIZE, MULTIPART_COPY_THRESHOLD
+from cos.scheduler import CallableJob
+from cos.transfer import (
+    BatchDeleter,
+    MultipartCopyJob,
+    copy_job,
+    copy_object_multipart_with_progress,
+    copy_objects,
+    plan_copy_part_size,
+)
+
+
+class FakeCopyClient:
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.created = None
+        self.ranges = {}
+        self.completed = None
+        self.aborted = False
+
+    def head_object(self, Bucket, Key):
+        return {
+            "Content-Length": "0",
+            "Content-Type": "video/mp4",
+            "Cache-Control": "max-age=60",
+            "x-cos-meta-owner": "alice",
+            "ETag": '"abc"',
+        }
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.created = (Bucket, Key, kwargs)
+        return {"UploadId": "u1"}
+
+    def upload_part_copy(self, Bucket, Key, PartNumber, UploadId, CopySource, CopySourceRange):
+        if PartNumber == self.fail_part:
+            raise OSError("copy failed")
+        self.ranges[PartNumber] = CopySourceRange
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload["Part"]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+def test_copy_parts_cover_object_and_keep_headers():
+    client = FakeCopyClient()
+    size = 3 * MIN_PART_SIZE + 7
+    progress = []
+    copy_object_multipart_with_progress(
+        client, "src", "a.mp4", "dst", "b.mp4", size,
+        lambda done, total: progress.append(done), part_size=MIN_PART_SIZE, concurrency=2,
+    )
+    assert client.ranges == {
+        1: f"bytes=0-{MIN_PART_SIZE - 1}",
+        2: f"bytes={MIN_PART_SIZE}-{2 * MIN_PART_SIZE - 1}",
+        3: f"bytes={2 * MIN_PART_SIZE}-{3 * MIN_PART_SIZE - 1}",
+        4: f"bytes={3 * MIN_PART_SIZE}-{size - 1}",
+    }
+    assert [p["PartNumber"] for p in client.completed] == [1, 2, 3, 4]
+    bucket, key, kwargs = client.created
+    assert (bucket, key) == ("dst", "b.mp4")
+    assert kwargs == {
+        "ContentType": "video/mp4",
+        "CacheControl": "max-age=60",
+        "Metadata": {"x-cos-meta-owner": "alice"},
+    }
+    assert progress[-1] == size
+
+
+def test_failed_part_aborts_copy():
+    client = FakeCopyClient(fail_part=2)
+    with pytest.raises(OSError):
+        copy_object_multipart_with_progress(
+            client, "src", "a", "dst", "b", 3 * MIN_PART_SIZE,
+            part_size=MIN_PART_SIZE, max_retries=0,
+        )
+    assert client.aborted
+    assert client.completed is None
+
+
+def test_copy_part_size_plan():
+    # Big objects use the default chunk; part count stays under the limit
+    assert plan_copy_part_size(MULTIPART_COPY_THRESHOLD, 4) >= MIN_PART_SIZE
+    huge = 48 * 1024 ** 4
+    assert -(-huge // plan_copy_part_size(huge, 4)) <= 10000
+
+
+def test_copy_job_uses_single_copy_below_threshold():
+    cos_client = Mock()
+    cos_client.client._conf._region = "ap-guangzhou"
+    job = copy_job(cos_client, "src", "a", "dst", "b", 10)
+    assert isinstance(job, CallableJob)
+    job.start()
+    cos_client.copy_object.assert_called_once_with("src", "a", "dst", "b")
+
+    job = copy_job(cos_client, "src", "a", "dst", "b", MULTIPART_COPY_THRESHOLD)
+    assert isinstance(job, MultipartCopyJob)
+    assert job.copy_source == {"Bucket": "src", "Key": "a", "Region": "ap-guangzhou"}
+
+
+def test_copy_objects_continues_past_failures():
+    cos_client = Mock()
+
+    def copy_object(source_bucket, source_key, dest_bucket, dest_key):
+        if source_key == "b":
+            raise OSError("boom")
+        return {}
+
+    cos_client.copy_object.side_effect = copy_object
+    done = []
+    copies = [("src", key, "dst", f"x/{key}", 1) for key in ("a", "b", "c")]
+    failures = copy_objects(cos_client, copies, concurrency=2, on_done=lambda key, exc: done.append((key, exc is None)))
+    assert [key for key, _ in failures] == ["b"]
+    assert sorted(done) == [("a", True), ("b", False), ("c", True)]
+    assert cos_client.copy_object.call_count == 3
+
+
+def test_batch_deleter_batches_and_collects_errors():
+    cos_client = Mock()
+    cos_client.delete_objects.side_effect = [
+        {},
+        {"Error": {"Key": "k3", "Code": "AccessDenied", "Message": "denied"}},
+    ]
+    deleter = BatchDeleter(cos_client, "src", batch_size=3)
+    for i in range(5):
+        deleter.add(f"k{i}")
+    assert cos_client.delete_objects.call_count == 1
+    deleter.flush()
+    deleter.flush()
+    assert [c[0][0] for c in cos_client.delete_objects.call_args_list] == [["k0", "k1", "k2"], ["k3", "k4"]]
+    assert deleter.deleted == 4
+    assert deleter.failures == [("k3", "denied")]
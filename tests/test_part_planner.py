@@ -0,0 +1,65 @@
+"""Tests for part-size planning in cos.transfer"""
+
+from cos.constants import MAX_MULTIPART_PARTS, MIN_PART_SIZE, MULTIPART_CHUNKSIZE
+from cos.transfer import PartSizePlanner, plan_part_size
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+
+def test_small_object_single_part():
+    assert plan_part_size(3 * MB, concurrency=8) == 3 * MB
+
+
+def test_default_size_for_medium_objects():
+    assert plan_part_size(1 * GB, concurrency=4, available_memory=64 * GB) == MULTIPART_CHUNKSIZE
+
+
+def test_shrinks_so_every_worker_gets_parts():
+    size = plan_part_size(16 * MB, concurrency=8, available_memory=64 * GB)
+    assert MIN_PART_SIZE <= size < MULTIPART_CHUNKSIZE
+    assert 16 * MB // size >= 8
+
+
+def test_huge_object_respects_part_limit():
+    total = 200 * GB
+    size = plan_part_size(total, concurrency=4, available_memory=64 * GB)
+    assert -(-total // size) <= MAX_MULTIPART_PARTS
+
+
+def test_part_limit_beats_memory_cap():
+    total = 200 * GB
+    size = plan_part_size(total, concurrency=32, available_memory=256 * MB)
+    assert -(-total // size) <= MAX_MULTIPART_PARTS
+
+
+def test_memory_cap_limits_part_size():
+    # A quarter of 4GB shared by 2 * 8 in-flight parts
+    assert plan_part_size(100 * GB, concurrency=8, available_memory=4 * GB) == 64 * MB
+    assert plan_part_size(100 * GB, concurrency=8, available_memory=64 * GB) > 64 * MB
+
+
+def test_fixed_size_raised_only_for_part_limit():
+    planner = PartSizePlanner(200 * GB, part_size=8 * MB)
+    assert planner.next_part_size(200 * GB, MAX_MULTIPART_PARTS) >= -(-200 * GB // MAX_MULTIPART_PARTS)
+    small = PartSizePlanner(64 * MB, part_size=8 * MB)
+    assert small.next_part_size(64 * MB, MAX_MULTIPART_PARTS) == 8 * MB
+
+
+def test_adaptive_planner_grows_and_shrinks():
+    planner = PartSizePlanner(10 * GB, concurrency=4, available_memory=64 * GB)
+    start = planner.part_size
+    planner.record(start, 0.1)
+    assert planner.part_size == start * 2
+    grown = planner.part_size
+    planner.record(grown, 120.0)
+    assert planner.part_size == grown // 2
+    # Parts planned before a resize are ignored
+    planner.record(grown, 0.01)
+    assert planner.part_size == grown // 2
+
+
+def test_fixed_planner_does_not_adapt():
+    planner = PartSizePlanner(10 * GB, part_size=16 * MB)
+    planner.record(16 * MB, 0.01)
+    assert planner.part_size == 16 * MB
@@ -0,0 +1,77 @@
+import threading
+
+from cos.progress import TransferMonitor, object_progress
+from cos.scheduler import CallableJob, TransferJob
+from cos.transfer import run_transfers
+
+
+class ChunkedJob(TransferJob):
+    """Job reporting its running total after each of ``parts`` tasks."""
+
+    def __init__(self, label, size, parts):
+        self.label = label
+        self.size = size
+        self.parts = parts
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def tasks(self):
+        step = self.size // self.parts
+        for _ in range(self.parts):
+            yield lambda: self._part(step)
+
+    def _part(self, step):
+        with self._lock:
+            self._done += step
+            done = self._done
+        self.progress_update(done, self.size)
+
+    def finish(self):
+        self.progress_update(self.size, self.size)
+
+
+def test_monitor_counts_every_byte_across_workers():
+    monitor = TransferMonitor("Uploading", 0)
+    jobs = [ChunkedJob(f"f{i}", 1000 * (i + 1), 10) for i in range(8)]
+    jobs.append(CallableJob(lambda: None, size=7, label="small"))
+    run_transfers(jobs, concurrency=4, on_advance=monitor)
+    done, running = monitor.sample()
+    assert done == sum(job.size for job in jobs)
+    assert running == []
+
+
+def test_monitor_reports_partial_files_and_plain_increments():
+    monitor = TransferMonitor("Copying", 300, total_objects=3)
+    big = monitor.callback("cos://b/big", 200)
+    small = monitor.callback("cos://b/small", 100)
+    big(50, 200)
+    big(40, 200)  # late, smaller report is ignored
+    small(100, 100)
+    monitor(5)
+    done, running = monitor.sample()
+    assert done == 155
+    assert [state.label for state in running] == ["cos://b/big"]
+
+    monitor.object_done()
+    monitor.object_done(failed=True)
+    assert monitor._label() == "Copying 2/3 objects (1 failed)"
+    assert monitor.summary().startswith("1 objects, ")
+
+
+def test_object_progress_disabled_yields_none():
+    with object_progress("Copying", 10, 1, enabled=False) as monitor:
+        assert monitor is None
+
+
+def test_monitor_draws_sub_bars_for_largest_files():
+    monitor = TransferMonitor("Downloading", 600, top_files=2, refresh_per_second=100).start()
+    try:
+        callbacks = [monitor.callback(f"dir/f{size}", size) for size in (100, 200, 300)]
+        for update, size in zip(callbacks, (100, 200, 300)):
+            update(size // 2, size)
+        monitor._draw()
+        shown = [state.label for state in monitor._slot_files]
+        assert shown == ["dir/f300", "dir/f200"]
+    finally:
+        monitor.stop()
+    assert monitor.sample()[0] == 300
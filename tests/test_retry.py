@@ -0,0 +1,162 @@
+import errno
+import io
+from unittest.mock import Mock
+
+import pytest
+from qcloud_cos.cos_exception import CosClientError, CosServiceError
+
+from cos.client import COSClient
+from cos.retry import (
+    FATAL,
+    THROTTLE,
+    TRANSIENT,
+    RetryBudget,
+    RetryPolicy,
+    RetryStats,
+    classify_error,
+    configure_retries,
+    retry_stats,
+)
+
+
+def service_error(status, code):
+    return CosServiceError(
+        "GET",
+        {"code": code, "message": code, "resource": "/k", "requestid": "r", "traceid": "t"},
+        status,
+    )
+
+
+def fast_policy(max_retries=3, **kwargs):
+    kwargs.setdefault("budget", RetryBudget())
+    kwargs.setdefault("stats", RetryStats())
+    return RetryPolicy(max_retries, backoff=0, backoff_max=0, **kwargs)
+
+
+def test_errors_are_classified():
+    assert classify_error(service_error(503, "SlowDown")) == THROTTLE
+    assert classify_error(service_error(429, "TooManyRequests")) == THROTTLE
+    assert classify_error(service_error(500, "InternalError")) == TRANSIENT
+    assert classify_error(service_error(404, "NoSuchKey")) == FATAL
+    assert classify_error(service_error(403, "RequestTimeTooSkewed")) == FATAL
+    assert classify_error(service_error(403, "AccessDenied")) == FATAL
+    assert classify_error(CosClientError("connection reset")) == TRANSIENT
+    assert classify_error(ConnectionResetError()) == TRANSIENT
+    assert classify_error(FileNotFoundError()) == FATAL
+    assert classify_error(OSError(errno.ENOSPC, "No space left")) == FATAL
+    assert classify_error(ValueError("bad")) == FATAL
+
+
+def test_full_jitter_delay_is_bounded(monkeypatch):
+    policy = RetryPolicy(5, backoff=0.5, backoff_max=3.0)
+    monkeypatch.setattr("cos.retry.random.uniform", lambda low, high: high)
+    assert [policy.delay(n) for n in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    monkeypatch.undo()
+    assert all(0 <= policy.delay(4) <= 3.0 for _ in range(50))
+
+
+def test_transient_errors_are_retried_and_counted():
+    policy = fast_policy()
+    fn = Mock(side_effect=[service_error(503, "SlowDown"), ConnectionResetError(), "ok"])
+    assert policy.call(fn) == "ok"
+    assert policy.stats.retries == {THROTTLE: 1, TRANSIENT: 1}
+    assert "Retried 2 request(s): 1 throttled, 1 transient" == policy.stats.summary()
+
+
+def test_fatal_errors_are_not_retried():
+    policy = fast_policy()
+    fn = Mock(side_effect=service_error(404, "NoSuchKey"))
+    with pytest.raises(CosServiceError):
+        policy.call(fn)
+    assert fn.call_count == 1
+    assert policy.stats.summary() is None
+
+
+def test_gives_up_after_max_retries():
+    policy = fast_policy(max_retries=2)
+    fn = Mock(side_effect=ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        policy.call(fn)
+    assert fn.call_count == 3
+    assert policy.stats.gave_up == 1
+
+
+def test_exhausted_budget_stops_retries():
+    budget = RetryBudget(capacity=2, ratio=0, per_second=0)
+    policy = fast_policy(max_retries=10, budget=budget)
+    fn = Mock(side_effect=ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        policy.call(fn)
+    assert fn.call_count == 3
+    assert policy.stats.budget_exhausted == 1
+    # Budget is shared: the next request fails on its first error
+    fn.reset_mock()
+    with pytest.raises(ConnectionResetError):
+        policy.call(fn)
+    assert fn.call_count == 1
+
+
+def test_client_requests_go_through_the_policy():
+    raw = Mock()
+    raw.head_object.side_effect = [service_error(503, "SlowDown"), {"Content-Length": "3"}]
+    client = COSClient(raw, "bucket", retry=fast_policy())
+    assert client.head_object("k") == {"Content-Length": "3"}
+    assert raw.head_object.call_count == 2
+    assert client.retry.stats.retries[THROTTLE] == 1
+
+
+def test_sdk_clients_do_not_retry_on_their_own():
+    from cos.auth import COSAuthenticator
+
+    config_manager = Mock(profile="retry-test")
+    config_manager.get_credentials.return_value = {"secret_id": "id", "secret_key": "key"}
+    assert COSAuthenticator(config_manager).authenticate("ap-shanghai")._retry == 0
+
+
+def test_non_idempotent_requests_accept_proof_of_an_earlier_success():
+    from cos.exceptions import COSError
+    from cos.transfer import _complete_upload
+
+    raw = Mock()
+    raw.create_bucket.side_effect = [CosClientError("read timeout"), service_error(409, "BucketAlreadyOwnedByYou")]
+    raw.delete_bucket.side_effect = [service_error(500, "InternalError"), service_error(404, "NoSuchBucket")]
+    client = COSClient(raw, retry=fast_policy())
+    assert client.create_bucket("b") is None
+    assert client.delete_bucket("b") is None
+
+    # On the first attempt the same errors are real failures
+    raw.create_bucket.side_effect = [service_error(409, "BucketAlreadyOwnedByYou")]
+    with pytest.raises(COSError):
+        client.create_bucket("b")
+
+    raw.complete_multipart_upload.side_effect = [CosClientError("read timeout"), service_error(404, "NoSuchUpload")]
+    raw.head_object.return_value = {"ETag": '"done-2"', "x-cos-hash-crc64ecma": "7"}
+    assert _complete_upload(fast_policy(), raw, "b", "k", "u1", {1: "e1"}) == raw.head_object.return_value
+    raw.complete_multipart_upload.side_effect = [service_error(404, "NoSuchUpload")]
+    with pytest.raises(CosServiceError):
+        _complete_upload(fast_policy(), raw, "b", "k", "u1", {1: "e1"})
+
+
+def test_configure_retries_resets_counters():
+    configure_retries(0, 0, 0)
+    with pytest.raises(ConnectionResetError):
+        RetryPolicy(0).call(Mock(side_effect=ConnectionResetError()))
+    assert retry_stats().gave_up == 1
+    configure_retries()
+    assert retry_stats().summary() is None
+
+
+def test_truncated_range_body_fails_instead_of_spinning(tmp_path):
+    from cos.transfer import download_file_in_ranges_with_progress
+
+    configure_retries()
+    raw = Mock()
+    raw.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(b"")}
+    with pytest.raises(CosClientError):
+        download_file_in_ranges_with_progress(
+            raw, "bucket", "k", tmp_path / "out", 16, 16, lambda *a: None,
+            resume=False, max_retries=2, retry_backoff=0, retry_backoff_max=0,
+        )
+    assert raw.get_object.call_count == 3
+    assert retry_stats().gave_up == 1
+    configure_retries()
@@ -1,7 +1,13 @@
 import io
 from pathlib import Path
 
-from cos.transfer import download_file_in_ranges_with_progress, upload_file_multipart_with_progress
+import pytest
+
+from cos.transfer import (
+    RangeBitmap,
+    download_file_in_ranges_with_progress,
+    upload_file_multipart_with_progress,
+)
 from cos.utils import ResumeTracker
 
 
@@ -107,4 +113,162 @@ def test_resumable_download(tmp_path):
 
     assert dest.read_bytes() == total
     # Ensure tracker cleared
-    assert tracker.load_progress(str(dest), "download") is None
\ No newline at end of file
+    assert tracker.load_progress(str(dest), "download") is None
+
+def test_parallel_download_resumes_missing_ranges_only(tmp_path):
+    total = bytes(range(256)) * 4096 * 4  # 4MB
+    client = FlakyClient(total)
+    # The third range fails persistently on the first run
+    client.fail_map["2097152-3145727"] = 10
+
+    dest = tmp_path / "holes.bin"
+    tracker = ResumeTracker(cache_dir=tmp_path / ".cache")
+    kwargs = dict(
+        bucket="b", key="k", dest_path=dest, total_size=len(total),
+        chunk_size=1024 * 1024, progress_update=lambda *_: None,
+        resume=True, resume_tracker=tracker, max_retries=0,
+        retry_backoff=0.01, retry_backoff_max=0.01, concurrency=4,
+    )
+    with pytest.raises(Exception):
+        download_file_in_ranges_with_progress(client, **kwargs)
+
+    state = tracker.load_progress(str(dest), "download")
+    assert state and "ranges" in state["data"]
+    done = RangeBitmap.from_hex(4, state["data"]["ranges"])
+    assert not done.is_set(2)
+    expected = {
+        f"bytes={i * 1048576}-{(i + 1) * 1048576 - 1}" for i in range(4) if not done.is_set(i)
+    }
+
+    # Second run: only the missing ranges are requested
+    client.fail_map.clear()
+    requested = []
+    original = client.get_object
+
+    def recording_get(Bucket, Key, Range):
+        requested.append(Range)
+        return original(Bucket, Key, Range)
+
+    client.get_object = recording_get
+    download_file_in_ranges_with_progress(client, **kwargs)
+
+    assert dest.read_bytes() == total
+    assert set(requested) == expected
+    assert tracker.load_progress(str(dest), "download") is None
+
+
+class MultipartStoreClient(FlakyClient):
+    """Keeps uploaded parts so list_parts and completion can be checked."""
+
+    def __init__(self):
+        super().__init__(b"")
+        self.parts = {}
+        self.fail_parts = set()
+        self.aborted = False
+        self.completed = None
+
+    def create_multipart_upload(self, Bucket: str, Key: str):
+        self.parts = {}
+        return {"UploadId": "uid"}
+
+    def upload_part(self, Bucket: str, Key: str, PartNumber: int, UploadId: str, Body: bytes):
+        self.upload_parts.append(PartNumber)
+        if PartNumber in self.fail_parts:
+            raise OSError("connection reset")
+        self.parts[PartNumber] = bytes(Body)
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    def list_parts(self, Bucket: str, Key: str, UploadId: str, PartNumberMarker: int = 0):
+        return {
+            "Part": [
+                {"PartNumber": str(pn), "ETag": f'"etag-{pn}"', "Size": str(len(data))}
+                for pn, data in sorted(self.parts.items())
+            ],
+            "IsTruncated": "false",
+        }
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload):
+        numbers = [p["PartNumber"] for p in MultipartUpload["Part"]]
+        self.completed = b"".join(self.parts[pn] for pn in numbers)
+        return {"ETag": '"complete"'}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str):
+        self.aborted = True
+        return {}
+
+
+def test_multipart_upload_resumes_missing_parts(tmp_path):
+    local = tmp_path / "big.bin"
+    local.write_bytes(bytes(range(256)) * 4096 * 5)  # 5MB, five 1MB parts
+    tracker = ResumeTracker(cache_dir=tmp_path / ".cache")
+    client = MultipartStoreClient()
+    client.fail_parts = {3}
+
+    with pytest.raises(OSError):
+        upload_file_multipart_with_progress(
+            client, "b", "k", local, chunk_size=1024 * 1024,
+            progress_update=lambda *_: None, max_retries=0, concurrency=1,
+            resume_tracker=tracker,
+        )
+    # Upload left open for resume
+    assert not client.aborted
+    assert {1, 2} <= set(client.parts)
+
+    client.fail_parts = set()
+    client.upload_parts = []
+    upload_file_multipart_with_progress(
+        client, "b", "k", local, chunk_size=1024 * 1024,
+        progress_update=lambda *_: None, concurrency=2, resume_tracker=tracker,
+    )
+
+    assert client.completed == local.read_bytes()
+    assert 1 not in client.upload_parts and 2 not in client.upload_parts
+    assert 3 in client.upload_parts
+
+
+
+def test_multipart_upload_state_writes_are_rate_limited(tmp_path, monkeypatch):
+    local = tmp_path / "big.bin"
+    local.write_bytes(bytes(range(256)) * 4096 * 5)  # five 1MB parts
+    saves = []
+
+    class CountingTracker(ResumeTracker):
+        def save_progress(self, file_path, operation, data):
+            saves.append(sorted(data["parts"]))
+            super().save_progress(file_path, operation, data)
+
+    monkeypatch.setattr("cos.transfer.RESUME_SAVE_PARTS", 2)
+    monkeypatch.setattr("cos.transfer.RESUME_SAVE_INTERVAL", 3600)
+    tracker = CountingTracker(cache_dir=tmp_path / ".cache")
+    client = MultipartStoreClient()
+    client.fail_parts = {5}
+    with pytest.raises(OSError):
+        upload_file_multipart_with_progress(
+            client, "b", "k", local, chunk_size=1024 * 1024,
+            progress_update=lambda *_: None, max_retries=0, concurrency=1,
+            resume_tracker=tracker,
+        )
+    # Once at the start, every second part, and once more on failure
+    assert saves == [[], ["1", "2"], ["1", "2", "3", "4"], ["1", "2", "3", "4"]]
+
+def test_multipart_upload_restarts_when_file_changed(tmp_path):
+    local = tmp_path / "changed.bin"
+    local.write_bytes(b"a" * (2 * 1024 * 1024))
+    tracker = ResumeTracker(cache_dir=tmp_path / ".cache")
+    client = MultipartStoreClient()
+    client.fail_parts = {2}
+    with pytest.raises(OSError):
+        upload_file_multipart_with_progress(
+            client, "b", "k", local, chunk_size=1024 * 1024,
+            progress_update=lambda *_: None, max_retries=0, concurrency=1,
+            resume_tracker=tracker,
+        )
+
+    local.write_bytes(b"b" * (2 * 1024 * 1024 + 10))
+    client.fail_parts = set()
+    upload_file_multipart_with_progress(
+        client, "b", "k", local, chunk_size=1024 * 1024,
+        progress_update=lambda *_: None, concurrency=2, resume_tracker=tracker,
+    )
+    assert client.aborted
+    assert client.completed == local.read_bytes()
@@ -0,0 +1,267 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from cos.scheduler import CallableJob, TransferJob, TransferScheduler
+from cos.transfer import AggregateProgress, run_transfers
+
+
+class PartsJob(TransferJob):
+    """Job with ``parts`` tasks that record when they run."""
+
+    def __init__(self, name, size, parts, log, fail_part=None, delay=0.01):
+        self.label = name
+        self.size = size
+        self.parts = parts
+        self.log = log
+        self.fail_part = fail_part
+        self.delay = delay
+        self.finished = False
+        self.aborted = None
+
+    def tasks(self):
+        for i in range(self.parts):
+            yield lambda i=i: self._part(i)
+
+    def _part(self, i):
+        self.log.append((self.label, i))
+        time.sleep(self.delay)
+        if i == self.fail_part:
+            raise OSError(f"{self.label} part {i} failed")
+
+    def finish(self):
+        self.finished = True
+
+    def abort(self, exc):
+        self.aborted = exc
+
+
+def test_largest_job_is_started_first():
+    log = []
+    scheduler = TransferScheduler(concurrency=1)
+    for name, size in [("small", 10), ("big", 1000), ("medium", 100)]:
+        scheduler.add(PartsJob(name, size, 2, log, delay=0))
+    assert scheduler.run() == []
+    assert [name for name, _ in log] == ["big", "big", "medium", "medium", "small", "small"]
+
+
+def test_parts_of_all_jobs_share_one_bounded_pool():
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+
+    class Job(TransferJob):
+        def __init__(self, size):
+            self.size = size
+
+        def tasks(self):
+            return (work for _ in range(8))
+
+    scheduler = TransferScheduler(concurrency=3)
+    for size in (1, 2, 3, 4):
+        scheduler.add(Job(size))
+    scheduler.run()
+    assert active["peak"] == 3
+
+
+def test_failed_job_is_aborted_and_error_raised():
+    log = []
+    scheduler = TransferScheduler(concurrency=2)
+    bad = scheduler.add(PartsJob("bad", 100, 6, log, fail_part=1))
+    later = scheduler.add(PartsJob("later", 1, 2, log))
+
+    with pytest.raises(OSError):
+        scheduler.run()
+    assert isinstance(bad.aborted, OSError)
+    assert not bad.finished
+    # Fail fast: work that had not started is skipped
+    assert not later.finished and later.aborted is None
+    assert ("later", 0) not in log
+
+
+def test_keep_going_reports_each_failure():
+    log = []
+    done = []
+    scheduler = TransferScheduler(concurrency=2)
+    scheduler.add(PartsJob("bad", 100, 3, log, fail_part=0))
+    good = scheduler.add(PartsJob("good", 10, 3, log))
+    scheduler.add(CallableJob(lambda: done.append("single"), size=5, label="single"))
+
+    failures = scheduler.run(fail_fast=False, on_done=lambda job, exc: done.append(job.label))
+    assert [job.label for job, _ in failures] == ["bad"]
+    assert good.finished
+    assert sorted(done) == ["bad", "good", "single", "single"]
+
+
+def test_run_transfers_aggregates_bytes():
+    advanced = []
+    jobs = [CallableJob(lambda: None, size=n) for n in (3, 5, 7)]
+    run_transfers(jobs, concurrency=2, on_advance=advanced.append)
+    assert sum(advanced) == 15
+
+    aggregate = AggregateProgress(advanced.append)
+    update = aggregate.callback()
+    advanced.clear()
+    update(4, 10)
+    update(4, 10)
+    update(10, 10)
+    assert advanced == [4, 6]
+
+
+def test_cancelled_jobs_are_reported_when_stopping():
+    log = []
+    scheduler = TransferScheduler(concurrency=1)
+    scheduler.add(PartsJob("bad", 100, 1, log, fail_part=0))
+    scheduler.add(PartsJob("never", 1, 1, log))
+    reported = []
+    with pytest.raises(OSError):
+        scheduler.run(on_done=lambda job, exc: reported.append((job.label, type(exc))))
+    assert ("never", CancelledError) in reported
+
+
+def test_upload_and_download_jobs_split_only_large_files(tmp_path):
+    from unittest.mock import Mock
+
+    from cos.constants import MULTIPART_THRESHOLD
+    from cos.transfer import MultipartUploadJob, RangedDownloadJob, download_job, upload_job
+
+    small = tmp_path / "small.bin"
+    small.write_bytes(b"s" * 10)
+    large = tmp_path / "large.bin"
+    large.write_bytes(b"l" * MULTIPART_THRESHOLD)
+    cos_client = Mock(bucket="bucket")
+
+    job = upload_job(cos_client, small, "k/small.bin")
+    assert isinstance(job, CallableJob) and job.size == 10
+    run_transfers([job])
+    cos_client.upload_file.assert_called_once()
+    assert cos_client.upload_file.call_args[0] == (str(small), "k/small.bin")
+
+    assert isinstance(upload_job(cos_client, large, "k/large.bin"), MultipartUploadJob)
+    assert isinstance(download_job(cos_client, "k/a", tmp_path / "a", 0), CallableJob)
+    assert isinstance(
+        download_job(cos_client, "k/b", tmp_path / "b", MULTIPART_THRESHOLD), RangedDownloadJob
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_adaptive_concurrency_grows_with_throughput_and_backs_off(monkeypatch):
+    from cos.scheduler import AdaptiveConcurrency
+
+    clock = FakeClock()
+    monkeypatch.setattr("cos.scheduler.time.monotonic", clock)
+    throttle_error = RuntimeError("SlowDown")
+    controller = AdaptiveConcurrency(
+        2, 1, 8, interval=1.0, is_throttle=lambda exc: exc is throttle_error
+    )
+
+    # Throughput improves each window: one more worker per window
+    for window in range(1, 4):
+        controller.add_bytes(window * 1000)
+        clock.now += 1.0
+        controller.task_done(0.1)
+    assert controller.limit == 5
+
+    # Flat throughput: hold
+    controller.add_bytes(3000)
+    clock.now += 1.0
+    controller.task_done(0.1)
+    assert controller.limit == 5
+
+    # Throttling halves the limit, once per window
+    controller.report_error(throttle_error)
+    controller.report_error(throttle_error)
+    assert controller.limit == 2
+    assert controller.throttled == 2
+
+    # Latency well above the best seen also backs off
+    clock.now += 1.0
+    controller.task_done(0.5)
+    assert controller.limit == 1
+    assert controller.peak == 5
+    assert "peak 5" in controller.describe()
+
+
+def test_scheduler_runs_at_most_the_adaptive_limit():
+    from cos.scheduler import AdaptiveConcurrency, max_workers, report_task_error
+
+    controller = AdaptiveConcurrency(2, 1, 6, interval=3600, is_throttle=lambda exc: True)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+
+    jobs = [CallableJob(work, size=i) for i in range(12)]
+    run_transfers(jobs, concurrency=controller)
+    assert active["peak"] == 2
+
+    # Retry loops inside tasks report throttling to the running controller
+    run_transfers([CallableJob(lambda: report_task_error(OSError("503")))], concurrency=controller)
+    assert controller.limit == 1
+    # Jobs planning from int() see the backed-off limit; buffers can size for the maximum
+    assert int(controller) == 1
+    assert (max_workers(controller), max_workers(3)) == (6, 3)
+    report_task_error(OSError("outside a worker"))
+    assert controller.throttled == 1
+
+
+def test_sdk_throttling_reaches_the_adaptive_controller():
+    from unittest.mock import Mock
+
+    from cos.auth import COSAuthenticator
+    from cos.client import COSClient
+    from cos.retry import RetryBudget, RetryPolicy, RetryStats, is_throttle_error
+    from cos.scheduler import AdaptiveConcurrency
+
+    config_manager = Mock(profile="throttle-test")
+    config_manager.get_credentials.return_value = {"secret_id": "id", "secret_key": "key"}
+    raw = COSAuthenticator(config_manager).authenticate("ap-shanghai")
+    # The SDK sees a 503 SlowDown, then success; it must not absorb the 503 itself
+    raw._session = Mock()
+    raw._session.head.side_effect = [
+        Mock(status_code=503, headers={}, content=b"<Error><Code>SlowDown</Code></Error>"),
+        Mock(status_code=200, headers={"Content-Length": "3"}),
+    ]
+    policy = RetryPolicy(3, backoff=0, backoff_max=0, budget=RetryBudget(), stats=RetryStats())
+    client = COSClient(raw, "bucket-1250000000", retry=policy)
+
+    controller = AdaptiveConcurrency(4, 1, 8, interval=3600, is_throttle=is_throttle_error)
+    run_transfers([CallableJob(lambda: client.head_object("k"))], concurrency=controller)
+    assert raw._session.head.call_count == 2
+    assert (controller.limit, controller.throttled) == (2, 1)
+
+def test_resolve_concurrency():
+    from cos.exceptions import COSError
+    from cos.scheduler import AdaptiveConcurrency
+    from cos.transfer import resolve_concurrency
+
+    assert resolve_concurrency("8") == 8
+    auto = resolve_concurrency("auto")
+    assert isinstance(auto, AdaptiveConcurrency)
+    assert int(auto) == auto.limit
+    with pytest.raises(COSError):
+        resolve_concurrency("0")
+    with pytest.raises(COSError):
+        resolve_concurrency("many")
@@ -1,8 +1,15 @@
 from typing import Dict, Tuple
 
 import io
+import threading
+import time
+
+import pytest
+from qcloud_cos.cos_exception import CosClientError
 
 from cos.transfer import (
+    BufferPool,
+    MappedPartSource,
     upload_file_multipart_with_progress,
     download_file_in_ranges_with_progress,
 )
@@ -20,6 +27,9 @@ class FakeRawClient:
         return {"UploadId": upload_id}
 
     def upload_part(self, Bucket: str, Key: str, PartNumber: int, UploadId: str, Body: bytes):
+        if hasattr(Body, "read"):
+            # Streamed bodies are consumed during the request, like the SDK does
+            Body = Body.read()
         self.multipart_store[(Bucket, Key, UploadId)][PartNumber] = Body
         return {"ETag": f"\"etag-{PartNumber}\""}
 
@@ -87,3 +97,305 @@ def test_streaming_multipart_upload_and_range_download(tmp_path):
 
     assert dest.read_bytes() == local.read_bytes()
     assert download_progress and download_progress[-1][0] == total_size
+
+
+class SlowPartClient(FakeRawClient):
+    """Delays early parts so later parts finish first."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def upload_part(self, Bucket: str, Key: str, PartNumber: int, UploadId: str, Body: bytes):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.05 if PartNumber % 2 else 0.0)
+            return super().upload_part(Bucket, Key, PartNumber, UploadId, bytes(Body))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_parallel_multipart_upload_orders_parts(tmp_path):
+    client = SlowPartClient()
+    local = tmp_path / "parallel.bin"
+    local.write_bytes(bytes(range(256)) * 4096 * 3)  # 3MB
+    progress = []
+
+    upload_file_multipart_with_progress(
+        client, "bucket", "p.bin", local, chunk_size=256 * 1024,
+        progress_update=lambda done, total: progress.append(done), concurrency=4,
+    )
+
+    assert client.storage["bucket"]["p.bin"] == local.read_bytes()
+    assert client.max_active > 1
+    assert progress[-1] == local.stat().st_size
+
+
+def test_parallel_multipart_upload_aborts_on_failure(tmp_path):
+    class FailingClient(FakeRawClient):
+        aborted = False
+
+        def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+            if PartNumber == 3:
+                raise CosClientError("boom")
+            return super().upload_part(Bucket, Key, PartNumber, UploadId, Body)
+
+        def abort_multipart_upload(self, Bucket, Key, UploadId):
+            self.aborted = True
+            return super().abort_multipart_upload(Bucket, Key, UploadId)
+
+    client = FailingClient()
+    local = tmp_path / "fail.bin"
+    local.write_bytes(b"x" * (1024 * 1024))
+
+    with pytest.raises(CosClientError):
+        upload_file_multipart_with_progress(
+            client, "bucket", "f.bin", local, chunk_size=128 * 1024,
+            progress_update=lambda *_: None, max_retries=0, concurrency=3,
+        )
+    assert client.aborted
+    assert "f.bin" not in client.storage.get("bucket", {})
+
+
+def test_mapped_part_source_views_and_fallback(tmp_path):
+    path = tmp_path / "src.bin"
+    data = bytes(range(256)) * 64
+    path.write_bytes(data)
+
+    with MappedPartSource(path) as source:
+        assert source.mapped
+        part = source.part(100, 50)
+        assert isinstance(part, memoryview)
+        assert bytes(part) == data[100:150]
+        del part
+        source.release(100, 50)
+
+    with MappedPartSource(path, use_mmap=False) as source:
+        assert not source.mapped
+        assert source.part(100, 50) == data[100:150]
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    with MappedPartSource(empty) as source:
+        assert not source.mapped
+        assert source.size == 0
+
+
+def test_multipart_upload_without_mmap(tmp_path):
+    client = FakeRawClient()
+    local = tmp_path / "plain.bin"
+    local.write_bytes(b"z" * (3 * 1024 * 1024 + 7))
+
+    upload_file_multipart_with_progress(
+        client, "bucket", "plain.bin", local, chunk_size=1024 * 1024,
+        progress_update=lambda *_: None, use_mmap=False,
+    )
+    assert client.storage["bucket"]["plain.bin"] == local.read_bytes()
+
+
+class ReadOnlyBody:
+    """Body exposing only read(), like SDK stream bodies without readinto."""
+
+    def __init__(self, data: bytes):
+        self._buf = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buf.read(min(size, 256 * 1024))
+
+
+def test_range_download_streams_in_buffer_sized_chunks(tmp_path):
+    client = FakeRawClient()
+    data = bytes(range(256)) * 4096 * 4  # 4MB
+    client.storage["bucket"] = {"k": data}
+    original = client.get_object
+    client.get_object = lambda Bucket, Key, Range: {
+        "Body": ReadOnlyBody(original(Bucket, Key, Range)["Body"].read())
+    }
+
+    dest = tmp_path / "stream.bin"
+    progress = []
+    download_file_in_ranges_with_progress(
+        client, "bucket", "k", dest, total_size=len(data), chunk_size=len(data),
+        progress_update=lambda done, total: progress.append(done), concurrency=1,
+    )
+
+    assert dest.read_bytes() == data
+    # One 4MB range, reported in at most 256KB steps
+    assert len(progress) >= 16
+    assert progress == sorted(progress)
+
+
+def test_buffer_pool_reuses_buffers_and_applies_backpressure():
+    pool = BufferPool(max_memory=2 * 1024, buffer_size=1024)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert pool.capacity == 2 and pool.allocated == 2
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not got
+    pool.release(first)
+    waiter.join(timeout=1)
+    # The waiting worker received the returned buffer; nothing new was allocated
+    assert got[0] is first
+    assert pool.allocated == 2 and pool.waits == 2
+    pool.release(second)
+    pool.release(got[0])
+    assert pool.in_use == 0
+
+
+def test_transfers_stay_within_buffer_pool(tmp_path):
+    client = FakeRawClient()
+    data = bytes(range(256)) * 4096 * 6  # 6MB
+    client.storage["bucket"] = {"k": data}
+    pool = BufferPool(max_memory=2 * 1024 * 1024)
+
+    dest = tmp_path / "pooled.bin"
+    download_file_in_ranges_with_progress(
+        client, "bucket", "k", dest, total_size=len(data), chunk_size=1024 * 1024,
+        progress_update=lambda *_: None, concurrency=6, buffer_pool=pool,
+    )
+    assert dest.read_bytes() == data
+
+    upload_file_multipart_with_progress(
+        client, "bucket", "up", dest, chunk_size=1024 * 1024,
+        progress_update=lambda *_: None, concurrency=6, use_mmap=False, buffer_pool=pool,
+    )
+    assert client.storage["bucket"]["up"] == data
+    # Six workers shared at most two buffers
+    assert 1 <= pool.allocated <= 2
+    assert pool.peak_in_use <= 2
+    assert pool.in_use == 0
+
+
+def test_bandwidth_limit_paces_uploads_and_downloads(tmp_path):
+    from cos.transfer import ThrottledBody, configure_bandwidth, get_bandwidth_throttle
+    from cos.utils import BandwidthThrottle
+
+    # Reads of a throttled body are taken from the bucket block by block
+    throttle = BandwidthThrottle(max_bytes_per_sec=10 ** 9)
+    body = ThrottledBody(memoryview(b"abcdef"), throttle)
+    assert len(body) == 6
+    assert bytes(body.read(4)) == b"abcd"
+    body.seek(0)
+    assert bytes(body.read()) == b"abcdef"
+    assert throttle.bytes_transferred == 10
+
+    client = FakeRawClient()
+    local = tmp_path / "limited.bin"
+    data = b"q" * (2 * 1024 * 1024 + 3)
+    local.write_bytes(data)
+    configure_bandwidth(upload=10 ** 9, download=10 ** 9)
+    try:
+        upload_file_multipart_with_progress(
+            client, "bucket", "limited.bin", local, chunk_size=1024 * 1024,
+            progress_update=lambda *_: None,
+        )
+        dest = tmp_path / "back.bin"
+        download_file_in_ranges_with_progress(
+            client, "bucket", "limited.bin", dest, total_size=len(data), chunk_size=1024 * 1024,
+            progress_update=lambda *_: None,
+        )
+        assert get_bandwidth_throttle("upload").bytes_transferred == len(data)
+        assert get_bandwidth_throttle("download").bytes_transferred == len(data)
+    finally:
+        configure_bandwidth()
+    assert client.storage["bucket"]["limited.bin"] == data
+    assert dest.read_bytes() == data
+    assert get_bandwidth_throttle("upload") is None
+
+
+class StreamClient(FakeRawClient):
+    """Copies part bodies (they are views of reused buffers) and delays early ranges."""
+
+    def __init__(self):
+        super().__init__()
+        self.put_calls = 0
+
+    def put_object(self, Bucket, Key, Body):
+        self.put_calls += 1
+        self.storage.setdefault(Bucket, {})[Key] = bytes(Body)
+        return {"ETag": "\"put-etag\""}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        return super().upload_part(Bucket, Key, PartNumber, UploadId, bytes(Body))
+
+    def get_object(self, Bucket, Key, Range):
+        start = int(Range.split("=")[1].split("-")[0])
+        if start == 0:
+            # First range finishes last, so later ones must wait to be written
+            time.sleep(0.05)
+        return super().get_object(Bucket, Key, Range)
+
+
+def test_stream_upload_of_unknown_length():
+    from cos.transfer import StreamUploadJob, run_transfers
+
+    client = StreamClient()
+    data = bytes(range(256)) * (14 * 1024 + 7)  # ~3.5MB: three full 1MB parts and a tail
+    progress = []
+    job = StreamUploadJob(
+        client, "bucket", "piped", io.BytesIO(data), 1024 * 1024,
+        lambda done, _total: progress.append(done), concurrency=3,
+    )
+    run_transfers([job], concurrency=3)
+    assert client.storage["bucket"]["piped"] == data
+    assert client.put_calls == 0
+    assert job.size == len(data) and max(progress) == len(data)
+    # Ring of part buffers: one per worker plus the one being read
+    assert job.pool.capacity == 4 and job.pool.in_use == 0
+
+    # A stream shorter than one part is a single PUT
+    small = StreamUploadJob(client, "bucket", "small", io.BytesIO(b"tiny"), 1024 * 1024)
+    run_transfers([small])
+    assert client.storage["bucket"]["small"] == b"tiny"
+    assert client.put_calls == 1
+
+
+def test_stream_download_writes_ranges_in_order():
+    from cos.transfer import StreamDownloadJob, run_transfers
+
+    client = StreamClient()
+    data = bytes(range(251)) * 20000  # ~4.8MB
+    client.storage["bucket"] = {"obj": data}
+    out = io.BytesIO()
+    job = StreamDownloadJob(client, "bucket", "obj", out, len(data), 1024 * 1024, concurrency=4)
+    run_transfers([job], concurrency=4)
+    assert out.getvalue() == data
+    assert job.pool.peak_in_use <= job.window
+    assert job.pool.in_use == 0
+
+
+def test_stream_download_stops_when_a_range_fails():
+    from cos.transfer import StreamDownloadJob, run_transfers
+
+    class Truncating(StreamClient):
+        def get_object(self, Bucket, Key, Range):
+            resp = super().get_object(Bucket, Key, Range)
+            if Range.startswith("bytes=0-"):
+                resp["Body"] = io.BytesIO(b"")
+            return resp
+
+    client = Truncating()
+    data = b"z" * (3 * 1024 * 1024)
+    client.storage["bucket"] = {"obj": data}
+    out = io.BytesIO()
+    job = StreamDownloadJob(
+        client, "bucket", "obj", out, len(data), 1024 * 1024,
+        max_retries=1, retry_backoff=0, retry_backoff_max=0, concurrency=1,
+    )
+    job.window = 1
+    with pytest.raises(CosClientError):
+        run_transfers([job], concurrency=3)
+    # Nothing after the failed range reaches the stream
+    assert out.getvalue() == b""
+    assert job.pool.in_use == 0
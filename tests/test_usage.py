@@ -0,0 +1,76 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from cos.commands.du import du
+from cos.usage import UsageTree
+
+from tests.test_listing import PagedClient, keyspaces
+
+OBJECTS = [
+    ("logs/2024/01/a.log", 100, "STANDARD"),
+    ("logs/2024/02/b.log", 200, "STANDARD_IA"),
+    ("logs/2025/c.log", 50, None),
+    ("logs/top.txt", 5, None),
+    ("img/x.png", 1000, "ARCHIVE"),
+    ("readme", 1, None),
+]
+
+
+def build(depth, prefix=""):
+    tree = UsageTree(prefix, depth)
+    objects = [o for o in OBJECTS if o[0].startswith(prefix)]
+    assert tree.add_entries({"Key": k, "Size": s, "StorageClass": c} for k, s, c in objects) == len(objects)
+    return tree
+
+
+def totals(nodes):
+    return {name: (u.objects, u.size) for name, u in nodes.items()}
+
+
+def test_usage_tree_rolls_up_to_the_requested_depth():
+    assert totals(build(1).nodes()) == {"": (6, 1356), "logs/": (4, 355), "img/": (1, 1000)}
+    assert totals(build(2).nodes()) == {
+        "": (6, 1356), "logs/": (4, 355), "logs/2024/": (2, 300), "logs/2025/": (1, 50), "img/": (1, 1000)}
+    assert totals(build(0).nodes()) == {"": (6, 1356)}
+    assert totals(build(1, prefix="logs/").nodes()) == {"": (4, 355), "2024/": (2, 300), "2025/": (1, 50)}
+
+
+def test_usage_tree_breaks_down_storage_classes_and_ranks_prefixes():
+    total, prefixes = build(3).top()
+    assert total.classes == {"STANDARD": [156, 4], "STANDARD_IA": [200, 1], "ARCHIVE": [1000, 1]}
+    assert [u.prefix for u in prefixes] == [
+        "img/", "logs/", "logs/2024/", "logs/2024/02/", "logs/2024/01/", "logs/2025/"]
+    assert [u.prefix for u in build(3).top(2)[1]] == ["img/", "logs/"]
+
+
+@pytest.mark.parametrize("list_concurrency", ["1", "4"])
+@patch("cos.commands.du.ConfigManager")
+@patch("cos.commands.du.COSAuthenticator")
+@patch("cos.commands.du.COSClient")
+def test_du_reports_prefix_totals(mock_client_class, mock_auth_class, mock_config_class, list_concurrency):
+    mock_config_class.return_value.get_output_format.return_value = "json"
+    keys = keyspaces()["nested"]
+    mock_client_class.return_value = PagedClient(keys)
+    result = CliRunner().invoke(
+        du, ["cos://bucket/", "-d", "2", "--list-concurrency", list_concurrency], obj={"profile": "default"})
+    assert result.exit_code == 0, result.output
+    rows = {row["Prefix"]: row for row in json.loads(result.output)}
+    assert list(rows) == ["cos://bucket/data/", "cos://bucket/data/x/", "cos://bucket/data/y/", "cos://bucket/"]
+    assert rows["cos://bucket/data/x/"]["Objects"] == 30
+    assert rows["cos://bucket/"]["Size"] == sum(len(k) for k in keys)
+    assert rows["cos://bucket/"]["StorageClasses"] == {"STANDARD": {"Objects": len(keys), "Size": sum(len(k) for k in keys)}}
+
+
+@patch("cos.commands.du.ConfigManager")
+@patch("cos.commands.du.COSAuthenticator")
+@patch("cos.commands.du.COSClient")
+def test_du_text_output_and_top(mock_client_class, mock_auth_class, mock_config_class):
+    mock_config_class.return_value.get_output_format.return_value = "text"
+    mock_client_class.return_value = PagedClient(keyspaces()["wide"])
+    result = CliRunner().invoke(du, ["cos://bucket/", "--top", "3"], obj={"profile": "default"})
+    assert result.exit_code == 0, result.output
+    lines = [line.split("\t") for line in result.output.splitlines()]
+    assert len(lines) == 4 and lines[-1][1:] == [str(len(keyspaces()["wide"])), "cos://bucket/"]
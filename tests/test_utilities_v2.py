@@ -116,6 +116,36 @@ class TestBandwidthThrottle:
         # Total time for 1MB at 1MB/s should be ~1s (with tolerance)
         assert 0.9 < total_elapsed < 1.3
     
+    def test_throttle_shares_rate_without_serialising_waits(self):
+        """Test concurrent workers share one limit and sleep outside the lock"""
+        import threading
+        
+        throttle = BandwidthThrottle(max_bytes_per_sec=1024 * 1024)
+        finished = []
+        
+        def worker():
+            for _ in range(4):
+                throttle.throttle(64 * 1024)
+            finished.append(time.time())
+        
+        start_time = time.time()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 1MB in total at 1MB/s, with every worker done close to the end
+        assert 0.85 < max(finished) - start_time < 1.3
+        assert min(finished) - start_time > 0.6
+    
+    def test_parse_bandwidth(self):
+        """Test bandwidth limit parsing"""
+        from cos.utils import parse_bandwidth
+        assert parse_bandwidth("10MB/s") == 10 * 1024 * 1024
+        assert parse_bandwidth("512k") == 512 * 1024
+        assert parse_bandwidth(None) is None
+        assert parse_bandwidth("0") is None
+    
     def test_get_speed(self):
         """Test speed calculation"""
         throttle = BandwidthThrottle(max_bytes_per_sec=None)
@@ -276,6 +306,19 @@ class TestChecksumFunctions:
             assert not compare_checksums(temp_path, remote_etag)
         finally:
             Path(temp_path).unlink()
+    
+    def test_compare_checksums_multipart_crc64(self):
+        """Test multipart ETag compared through the object CRC64"""
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(b"123456789")
+            temp_path = f.name
+        
+        try:
+            remote_etag = "d8e8fca2dc0f896fd7cb4cb0031ba249-5"
+            assert compare_checksums(temp_path, remote_etag, 0x995DC9BBDF1939FA)
+            assert not compare_checksums(temp_path, remote_etag, 1)
+        finally:
+            Path(temp_path).unlink()
 
 
 class TestUtilityIntegration:
@@ -0,0 +1,103 @@
+import csv
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from rich.console import Console
+
+from cos.commands.ls import ls
+from cos.exceptions import COSError
+from cos.writers import CsvWriter, JsonArrayWriter, NdjsonWriter, RowWriter, TableWriter, export_format
+
+from tests.test_listing import KEYS, PagedClient
+
+ROWS = [{"Key": "a.txt", "Size": 1, "Type": "FILE"}, {"Key": "b/", "Size": 0, "Type": "DIR"}]
+
+
+@pytest.mark.parametrize("rows", [ROWS, ROWS[:1], []])
+def test_json_array_writer_matches_json_dumps(rows):
+    stream = io.StringIO()
+    writer = JsonArrayWriter(stream, ["Key", "Size", "Type"])
+    for row in rows:
+        writer.write(row)
+    writer.close()
+    assert stream.getvalue() == json.dumps(rows, indent=2) + "\n"
+
+
+def test_ndjson_and_csv_writers():
+    ndjson, table = io.StringIO(), io.StringIO()
+    for stream, writer_class in ((ndjson, NdjsonWriter), (table, CsvWriter)):
+        writer = writer_class(stream, ["Key", "Size", "Type"])
+        for row in ROWS:
+            writer.write(row)
+        writer.close()
+    assert [json.loads(line) for line in ndjson.getvalue().splitlines()] == ROWS
+    assert list(csv.DictReader(io.StringIO(table.getvalue()))) == [
+        {"Key": "a.txt", "Size": "1", "Type": "FILE"}, {"Key": "b/", "Size": "0", "Type": "DIR"}]
+
+
+def test_table_writer_pages_rows_with_one_header():
+    stream = io.StringIO()
+    writer = TableWriter(Console(file=stream, width=80), ["Key", "Size"], page_rows=2)
+    for i in range(5):
+        writer.write({"Key": f"k{i}", "Size": i})
+        if i == 1:
+            # The first page is printed before the listing ends
+            assert "k1" in stream.getvalue()
+    writer.close()
+    output = stream.getvalue()
+    assert output.count("Key") == 1 and all(f"k{i}" in output for i in range(5))
+
+
+def test_writers_must_implement_write():
+    class Incomplete(RowWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(io.StringIO(), ["Key"])
+
+
+def test_export_format_from_file_name(tmp_path):
+    assert export_format(tmp_path / "keys.ndjson.gz") == ("ndjson", True)
+    assert export_format(tmp_path / "keys.CSV") == ("csv", False)
+    with pytest.raises(COSError):
+        export_format(tmp_path / "keys.parquet")
+
+
+@patch("cos.commands.ls.ConfigManager")
+@patch("cos.commands.ls.COSAuthenticator")
+@patch("cos.commands.ls.COSClient")
+def test_ls_export_writes_gzipped_ndjson(mock_client_class, mock_auth_class, mock_config_class, tmp_path):
+    mock_config_class.return_value.get_output_format.return_value = "table"
+    mock_client_class.return_value = PagedClient(KEYS)
+    export = tmp_path / "keys.ndjson.gz"
+    result = CliRunner().invoke(ls, ["cos://bucket/", "-r", "--export", str(export)], obj={"profile": "default"})
+    assert result.exit_code == 0, result.output
+    assert f"Exported {len(KEYS)} entries" in result.output
+    with gzip.open(export, "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["Key"] for row in rows] == sorted(KEYS)
+    assert rows[0] == {"Key": rows[0]["Key"], "Size": len(rows[0]["Key"]), "LastModified": "",
+                       "ETag": "", "StorageClass": "", "Type": "FILE"}
+
+
+@patch("cos.commands.ls.ConfigManager")
+@patch("cos.commands.ls.COSAuthenticator")
+@patch("cos.commands.ls.COSClient")
+def test_ls_streams_rows_before_the_listing_ends(mock_client_class, mock_auth_class, mock_config_class):
+    class FailsOnSecondPage(PagedClient):
+        def list_objects(self, marker="", **kwargs):
+            if marker:
+                raise COSError("listing failed")
+            return super().list_objects(marker=marker, **kwargs)
+
+    mock_config_class.return_value.get_output_format.return_value = "ndjson"
+    keys = [f"logs/{i:05d}" for i in range(1500)]
+    mock_client_class.return_value = FailsOnSecondPage(keys)
+    result = CliRunner().invoke(ls, ["cos://bucket/logs/", "-r"], obj={"profile": "default"})
+    assert result.exit_code == 1 and "listing failed" in result.output
+    lines = [line for line in result.output.splitlines() if line.startswith("{")]
+    assert [json.loads(line)["Key"] for line in lines] == keys[:1000]
@@ -107,6 +107,7 @@ class WebCOSClient:
                 prefix=prefix,
                 delimiter=delimiter,
                 max_keys=max_keys,
+                marker=marker,
             )
             return response
         except BucketNotFoundError:
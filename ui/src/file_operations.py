@@ -3,9 +3,13 @@
 from typing import List, Dict
 import streamlit as st
 
+from cos.scheduler import CallableJob, TransferScheduler
 from ui.src.utils import get_cos_client
 from ui.components.progress import BatchProgress
 
+# Uploads from one batch run in parallel on a single bounded pool
+UPLOAD_CONCURRENCY = 4
+
 
 def filter_files(files: List[Dict], search_query: str = "", filter_type: str = "all") -> List[Dict]:
     """Apply search and filter to files.
@@ -146,27 +150,37 @@ def upload_files_batch(bucket: str, prefix: str, uploaded_files: List) -> tuple[
         operation_name="Uploading Files"
     )
     
-    success_count = 0
-    failure_count = 0
-    
+    results = {"success": 0, "failure": 0}
+
+    def make_upload(uploaded_file):
+        return lambda: cos_client.upload_file(
+            bucket=bucket,
+            key=prefix + uploaded_file.name,
+            file_obj=uploaded_file,
+        )
+
+    # Largest files first on one bounded pool; results are marked here, in
+    # the Streamlit script thread, as each upload ends
+    scheduler = TransferScheduler(concurrency=UPLOAD_CONCURRENCY)
     for uploaded_file in uploaded_files:
-        progress.update_current(uploaded_file.name)
-        
-        try:
-            key = prefix + uploaded_file.name
-            cos_client.upload_file(
-                bucket=bucket,
-                key=key,
-                file_obj=uploaded_file,
-            )
-            progress.mark_success(uploaded_file.name)
-            success_count += 1
-        except Exception as e:
-            progress.mark_failure(uploaded_file.name, str(e))
-            failure_count += 1
+        scheduler.add(CallableJob(
+            make_upload(uploaded_file),
+            size=getattr(uploaded_file, "size", 0) or 0,
+            label=uploaded_file.name,
+        ))
+
+    def on_done(job, exc):
+        if exc is None:
+            progress.mark_success(job.label)
+            results["success"] += 1
+        else:
+            progress.mark_failure(job.label, str(exc))
+            results["failure"] += 1
+
+    scheduler.run(fail_fast=False, on_done=on_done)
     
     progress.complete()
-    return success_count, failure_count
+    return results["success"], results["failure"]
 
 
 def download_file(bucket: str, file: Dict) -> bytes: